@@ -0,0 +1,37 @@
+"""Arsipkan transaksi lama ke file SQLite per tahun.
+
+Contoh: ``python archive_cli.py --before 2024-01-01 [--db data/inventori.db]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import List, Optional
+
+from models import Database, TransactionArchive
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default="data/inventori.db")
+    parser.add_argument("--before", required=True, help="arsipkan transaksi sebelum tanggal ini (YYYY-MM-DD)")
+    parser.add_argument("--archive-dir", help="folder arsip (bawaan: <folder db>/arsip)")
+    args = parser.parse_args(argv)
+
+    database = Database(args.db)
+    database.initialize()
+    try:
+        result = TransactionArchive(database, args.archive_dir).archive_before(args.before)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    finally:
+        database.close()
+    print(f"{result['archived']} transaksi diarsipkan ({', '.join(map(str, result['years'])) or '-'})")
+    print(f"Saldo awal per barang disimpan sebagai snapshot {result['opening_date']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
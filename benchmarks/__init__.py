@@ -0,0 +1 @@
+"""Skrip benchmark performa (dijalankan manual, bukan bagian aplikasi)."""
@@ -0,0 +1,59 @@
+"""Bandingkan posting transaksi satu per satu vs ``add_transactions`` (satu commit).
+
+Contoh: ``python -m benchmarks.bench_bulk_posting --lines 300``
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from controllers import ItemController
+from models import ItemModel, TransactionModel
+
+from .common import temporary_database
+
+
+def make_lines(count: int, max_item_id: int, seed: int) -> list:
+    rng = random.Random(seed)
+    return [
+        {
+            "transaction_date": "2025-12-01",
+            "item_id": rng.randint(1, max_item_id),
+            "quantity": rng.randint(1, 20),
+            "transaction_type": "IN",
+            "notes": "Penerimaan benchmark",
+        }
+        for _ in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=300)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    with temporary_database(args.items, 10_000) as database:
+        controller = ItemController(ItemModel(database), TransactionModel(database))
+        single = bulk = 0.0
+        for round_no in range(args.rounds):
+            lines = make_lines(args.lines, args.items, round_no)
+            started = time.perf_counter()
+            for line in lines:
+                controller.record_transaction(dict(line))
+            single += time.perf_counter() - started
+
+            started = time.perf_counter()
+            controller.record_transactions([dict(line) for line in lines])
+            bulk += time.perf_counter() - started
+
+    print(f"Posting {args.lines} baris, rata-rata {args.rounds} putaran")
+    print(f"  satu per satu (record_transaction)   {single / args.rounds * 1000:9.1f} ms")
+    print(f"  satu batch (record_transactions)     {bulk / args.rounds * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
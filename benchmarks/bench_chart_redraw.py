@@ -0,0 +1,68 @@
+"""Ukur latensi redraw grafik dashboard: bangun ulang figure vs update di tempat.
+
+Contoh: ``python -m benchmarks.bench_chart_redraw --iterations 50``
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from utils.charts import ChartBuilder
+
+
+def rebuild_chart(figure: Figure, items: list) -> None:
+    """Cara lama: bersihkan figure, buat axes baru, dan tight_layout setiap kali."""
+
+    figure.clear()
+    ax = figure.add_subplot(111)
+    ax.bar([item["item_name"] for item in items], [item["stock"] for item in items], color="#3f72af")
+    ax.set_title("Grafik Stok Barang")
+    ax.set_ylabel("Jumlah Stok")
+    ax.set_xlabel("Barang")
+    ax.tick_params(axis="x", rotation=45, labelsize=8)
+    ax.grid(axis="y", linestyle="--", linewidth=0.5, alpha=0.7)
+    figure.tight_layout()
+
+
+def sample_items(rng: random.Random, count: int) -> list:
+    return [{"item_name": f"Barang {rng.randint(1, 999):03d}", "stock": rng.randint(0, 500)} for _ in range(count)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--bars", type=int, default=8)
+    args = parser.parse_args()
+    rng = random.Random(7)
+    datasets = [sample_items(rng, args.bars) for _ in range(args.iterations)]
+
+    old_figure = Figure(figsize=(5, 3), dpi=100)
+    old_canvas = FigureCanvasAgg(old_figure)
+    started = time.perf_counter()
+    for items in datasets:
+        rebuild_chart(old_figure, items)
+        old_canvas.draw()
+    old_ms = (time.perf_counter() - started) * 1000 / args.iterations
+
+    builder = ChartBuilder()
+    new_canvas = FigureCanvasAgg(builder.figure)
+    builder.build_stock_chart(datasets[0])
+    new_canvas.draw()
+    started = time.perf_counter()
+    for items in datasets:
+        builder.build_stock_chart(items)
+        new_canvas.draw()
+    new_ms = (time.perf_counter() - started) * 1000 / args.iterations
+
+    print(f"Redraw grafik {args.bars} batang, rata-rata {args.iterations} iterasi")
+    print(f"  bangun ulang + tight_layout   {old_ms:8.1f} ms")
+    print(f"  update di tempat              {new_ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
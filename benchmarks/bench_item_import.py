@@ -0,0 +1,71 @@
+"""Ukur impor katalog barang massal dari CSV dan XLSX.
+
+Contoh: ``python -m benchmarks.bench_item_import --rows 100000``
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from openpyxl import Workbook
+
+from models import ItemImporter
+
+from .common import temporary_database
+
+HEADER = ["Kode", "Nama", "Kategori", "Stok", "Harga Beli", "Harga Jual", "Pemasok"]
+
+
+def make_rows(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    for i in range(count):
+        row = [f"IMP-{i:07d}", f"Barang Impor {i:07d}", f"Kategori {rng.randint(1, 40)}",
+               rng.randint(0, 500), 1000 + i % 300, 1500 + i % 300, f"Pemasok {rng.randint(1, 200)}"]
+        if i % 997 == 0:
+            row[3] = "banyak"  # baris rusak untuk file penolakan
+        yield row
+
+
+def write_csv(path: Path, count: int) -> None:
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(HEADER)
+        writer.writerows(make_rows(count))
+
+
+def write_xlsx(path: Path, count: int) -> None:
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Barang")
+    ws.append(HEADER)
+    for row in make_rows(count):
+        ws.append(row)
+    wb.save(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for kind, writer in (("csv", write_csv), ("xlsx", write_xlsx)):
+            source = Path(tmp) / f"katalog.{kind}"
+            writer(source, args.rows)
+            with temporary_database(0, 0) as database:
+                importer = ItemImporter(database)
+                for label in ("baru", "upsert ulang"):
+                    started = time.perf_counter()
+                    summary = importer.import_file(source)
+                    elapsed = time.perf_counter() - started
+                    print(
+                        f"{kind:<5} {label:<13} {elapsed:>7.2f} s  "
+                        f"baru {summary['inserted']}, diperbarui {summary['updated']}, ditolak {summary['rejected']}"
+                    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Bandingkan ekspor laporan dari list (lama) vs generator fetchmany (streaming).
+
+Contoh: ``python -m benchmarks.bench_report_streaming --transactions 1000000``
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from models import TransactionModel
+from reports import ReportService
+
+from .common import measure, print_results, temporary_database
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--transactions", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=("excel", "pdf"), default="excel")
+    args = parser.parse_args()
+
+    service = ReportService()
+    render = service.generate_transaction_excel if args.format == "excel" else service.generate_transaction_pdf
+    suffix = ".xlsx" if args.format == "excel" else ".pdf"
+
+    with temporary_database(args.items, args.transactions) as database, tempfile.TemporaryDirectory() as out:
+        transaction_model = TransactionModel(database)
+        destination = Path(out) / f"laporan{suffix}"
+        results = {
+            "list (get_all)": measure(lambda: render(transaction_model.get_all(), destination)),
+            "stream (iter_all)": measure(lambda: render(transaction_model.iter_all(), destination)),
+        }
+    print_results(f"Ekspor transaksi {args.format}, {args.transactions} baris", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""Ukur setiap operasi model/controller/laporan pada beberapa skala data.
+
+Untuk setiap skala (jumlah transaksi) database sintetis dibuat oleh
+``benchmarks.datagen`` dengan jumlah barang ``skala / --rows-per-item``.
+Hasil ditulis sebagai JSON agar bisa dibandingkan antar commit; dengan
+``--compare`` skrip keluar dengan kode 1 bila ada operasi yang melambat
+melebihi ``--tolerance``.
+
+Contoh::
+
+    python -m benchmarks.bench_scale --scales 1000 100000 --output hasil.json
+    python -m benchmarks.bench_scale --scales 1000 100000 --compare hasil.json
+    python -m benchmarks.bench_scale --scales 1000000 --only "get_|export_excel"
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import re
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from controllers import DashboardController, ItemController
+from models import Database, ItemModel, StockSnapshotModel, SupplierModel, TransactionModel
+from reports import ReportService
+
+from . import datagen
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# (nama, jumlah pengulangan, fungsi yang diukur). Operasi tulis
+# dijalankan lebih sedikit agar ukuran data tidak ikut berubah berarti.
+Case = Tuple[str, int, Callable[[], object]]
+
+
+def _drain(iterator) -> int:
+    count = 0
+    for count, _ in enumerate(iterator, 1):
+        pass
+    return count
+
+
+def build_cases(database: Database, out_dir: Path, max_item_id: int) -> List[Case]:
+    item_model = ItemModel(database)
+    transaction_model = TransactionModel(database)
+    supplier_model = SupplierModel(database)
+    snapshot_model = StockSnapshotModel(database)
+    items = ItemController(item_model, transaction_model, snapshot_model=snapshot_model)
+    dashboard = DashboardController(item_model, transaction_model)
+    service = ReportService()
+    posted = iter(range(10**9))
+
+    def post_one() -> None:
+        item_id = next(posted) % max_item_id + 1
+        transaction_model.add_transaction(
+            {"transaction_date": "2025-12-01", "item_id": item_id, "quantity": 1,
+             "transaction_type": "IN", "notes": "Benchmark"}
+        )
+
+    def post_batch() -> None:
+        transaction_model.add_transactions(
+            {"transaction_date": "2025-12-01", "item_id": next(posted) % max_item_id + 1, "quantity": 1,
+             "transaction_type": "IN", "notes": "Benchmark"}
+            for _ in range(100)
+        )
+
+    def _export_movement(render, destination: Path) -> None:
+        movements = dashboard.get_movement_report()
+        render(movements["months"], movements["categories"], movements["items"], destination)
+
+    return [
+        ("item.get_all", 3, lambda: item_model.get_all()),
+        ("item.get_all_keyword", 5, lambda: item_model.get_all("Beras")),
+        ("item.iter_all", 3, lambda: _drain(item_model.iter_all())),
+        ("item.get_page_first", 10, lambda: item_model.get_page()),
+        ("item.get_page_keyword", 10, lambda: item_model.get_page("Kopi")),
+        ("item.count", 10, lambda: item_model.count()),
+        ("item.get_stock_summary", 10, lambda: item_model.get_stock_summary()),
+        ("item.get_category_summary", 10, lambda: item_model.get_category_summary()),
+        ("item.get_ranked_movement", 5, lambda: item_model.get_ranked("movement", descending=True)),
+        ("item.get_categories", 10, lambda: item_model.get_categories()),
+        ("supplier.get_all", 10, lambda: supplier_model.get_all()),
+        ("transaction.get_recent", 10, lambda: transaction_model.get_recent()),
+        ("transaction.get_all", 1, lambda: transaction_model.get_all()),
+        ("transaction.iter_all", 1, lambda: _drain(transaction_model.iter_all())),
+        ("transaction.add_transaction", 50, post_one),
+        ("transaction.add_transactions_100", 10, post_batch),
+        ("snapshot.iter_stock_as_of", 3, lambda: _drain(snapshot_model.iter_stock_as_of("2023-06-30"))),
+        ("dashboard.get_dashboard_data", 10, dashboard.get_dashboard_data),
+        ("dashboard.get_chart_items", 10, lambda: dashboard.get_chart_items("Nilai Persediaan Tertinggi")),
+        ("dashboard.get_movement_trend", 10, lambda: dashboard.get_movement_trend()),
+        ("movement.get_by_category", 5, lambda: dashboard.movement_model.get_by_category()),
+        ("controller.list_items_page", 10, lambda: items.list_items_page()),
+        ("controller.item_options", 5, lambda: items.item_options()),
+        ("controller.item_options_unchanged", 50, lambda: items.item_options(database.item_catalog.version)),
+        ("catalog.id_for_code", 1000, lambda: database.item_catalog.id_for_code("SY-0000042")),
+        ("export_pdf.items", 1, lambda: service.generate_pdf(items.iter_items(), out_dir / "barang.pdf")),
+        ("export_excel.items", 1, lambda: service.generate_excel(items.iter_items(), out_dir / "barang.xlsx")),
+        ("export_pdf.transactions", 1,
+         lambda: service.generate_transaction_pdf(items.iter_transactions(), out_dir / "transaksi.pdf")),
+        ("export_excel.transactions", 1,
+         lambda: service.generate_transaction_excel(items.iter_transactions(), out_dir / "transaksi.xlsx")),
+        ("export_pdf.complete", 1,
+         lambda: service.generate_complete_pdf(items.iter_items(), items.iter_transactions(), out_dir / "lengkap.pdf")),
+        ("export_excel.complete", 1,
+         lambda: service.generate_complete_excel(items.iter_items(), items.iter_transactions(), out_dir / "lengkap.xlsx")),
+        ("export_pdf.movement", 1, lambda: _export_movement(service.generate_movement_pdf, out_dir / "pergerakan.pdf")),
+        ("export_excel.movement", 1,
+         lambda: _export_movement(service.generate_movement_excel, out_dir / "pergerakan.xlsx")),
+    ]
+
+
+def run_case(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return {"median_s": statistics.median(timings), "min_s": min(timings), "repeat": repeat}
+
+
+def run_scale(rows: int, rows_per_item: int, seed: int, only: re.Pattern | None, data_dir: Path | None) -> List[dict]:
+    spec = datagen.DatasetSpec(items=max(50, rows // rows_per_item), transactions=rows, seed=seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        started = time.perf_counter()
+        if data_dir is None:
+            database = datagen.build(tmp_dir / "scale.db", spec)
+        else:
+            # Database per skala disimpan di ``data_dir`` dan dipakai ulang;
+            # operasi tulis dijalankan pada salinannya.
+            cached = data_dir / f"scale_{rows}_seed{seed}_per{rows_per_item}.db"
+            if not cached.exists():
+                datagen.build(cached, spec).close()
+            working = tmp_dir / cached.name
+            source = sqlite3.connect(cached.as_posix())
+            target = sqlite3.connect(working.as_posix())
+            source.backup(target)
+            source.close()
+            target.close()
+            database = Database(working.as_posix())
+            database.initialize()
+        setup_s = time.perf_counter() - started
+        print(f"Skala {rows} transaksi / {spec.items} barang (persiapan {setup_s:.1f} s)")
+
+        results = []
+        try:
+            with database.connection() as conn:
+                max_item_id = conn.execute("SELECT MAX(id) FROM items").fetchone()[0]
+            for name, repeat, func in build_cases(database, tmp_dir, max_item_id):
+                if only is not None and not only.search(name):
+                    continue
+                timing = run_case(func, repeat)
+                print(f"  {name:<36} {timing['median_s'] * 1000:>11.2f} ms")
+                results.append({"scale": rows, "items": spec.items, "case": name, **timing})
+        finally:
+            database.close()
+    return results
+
+
+def environment() -> Dict[str, str]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = ""
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+    }
+
+
+def compare(results: List[dict], baseline_path: Path, tolerance: float) -> List[str]:
+    """Daftar operasi yang median-nya lebih lambat dari baseline melebihi toleransi."""
+
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    previous = {(row["scale"], row["case"]): row["median_s"] for row in baseline["results"]}
+    regressions = []
+    for row in results:
+        before = previous.get((row["scale"], row["case"]))
+        # Operasi di bawah 1 ms terlalu bising untuk dinilai dengan rasio.
+        if before is None or max(before, row["median_s"]) < 0.001:
+            continue
+        if row["median_s"] > before * (1 + tolerance):
+            regressions.append(
+                f"{row['case']} @ {row['scale']}: {before * 1000:.2f} ms -> {row['median_s'] * 1000:.2f} ms"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1000, 100_000, 1_000_000])
+    parser.add_argument("--rows-per-item", type=int, default=20, help="rasio transaksi per barang")
+    parser.add_argument("--seed", type=int, default=datagen.DatasetSpec.seed)
+    parser.add_argument("--only", type=re.compile, help="regex nama operasi yang dijalankan")
+    parser.add_argument("--data-dir", type=Path, help="simpan dan pakai ulang database per skala di folder ini")
+    parser.add_argument("--output", type=Path, help="file JSON hasil")
+    parser.add_argument("--compare", type=Path, help="file JSON baseline untuk deteksi regresi")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="batas perlambatan relatif (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    if args.data_dir is not None:
+        args.data_dir.mkdir(parents=True, exist_ok=True)
+    results: List[dict] = []
+    for rows in args.scales:
+        results.extend(run_scale(rows, args.rows_per_item, args.seed, args.only, args.data_dir))
+
+    report = {"environment": environment(), "seed": args.seed, "rows_per_item": args.rows_per_item, "results": results}
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Hasil ditulis ke {args.output}")
+    if args.compare is not None:
+        regressions = compare(results, args.compare, args.tolerance)
+        if regressions:
+            print("REGRESI:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("Tidak ada regresi")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Ukur waktu mulai aplikasi dan gagalkan bila melewati anggaran.
+
+Dua ukuran, masing-masing median dari beberapa proses baru:
+
+* waktu impor ``main`` menurut ``python -X importtime``;
+* waktu dinding sampai jendela login tampil (``mainloop`` dicegat setelah
+  jendela digambar). Tanpa display, yang diukur adalah waktu sampai tepat
+  sebelum ``tk.Tk()`` dibuat (impor + inisialisasi database).
+
+Database disalin ke folder sementara agar file asli tidak tersentuh.
+Contoh: ``python -m benchmarks.bench_startup --runs 5 --budget-ms 1500``
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PROBE = r"""
+import time
+started = time.perf_counter()
+import tkinter
+
+original_init = tkinter.Tk.__init__
+
+def probe_init(self, *args, **kwargs):
+    before_window = time.perf_counter() - started
+    try:
+        original_init(self, *args, **kwargs)
+    except tkinter.TclError:
+        print(f"PREWINDOW {before_window * 1000:.1f}")
+        raise SystemExit(0)
+
+def probe_mainloop(self, n=0):
+    self.update()
+    print(f"WINDOW {(time.perf_counter() - started) * 1000:.1f}")
+    self.destroy()
+
+tkinter.Tk.__init__ = probe_init
+tkinter.Tk.mainloop = probe_mainloop
+import main
+main.main()
+"""
+
+
+def import_time_ms(env: dict) -> float:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    # Baris terakhir adalah modul tingkat atas: "import time: self | cumulative | main"
+    cumulative_us = int(result.stderr.strip().splitlines()[-1].split("|")[1])
+    return cumulative_us / 1000
+
+
+def window_time_ms(workdir: Path, env: dict) -> tuple:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=workdir, env=env, capture_output=True, text=True, check=True,
+    )
+    label, value = result.stdout.strip().splitlines()[-1].split()
+    return label, float(value)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1500.0, help="anggaran sampai jendela login")
+    parser.add_argument("--import-budget-ms", type=float, default=300.0, help="anggaran impor modul main")
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=str(ROOT), PYTHONDONTWRITEBYTECODE="1")
+    imports = [import_time_ms(env) for _ in range(args.runs)]
+
+    windows = []
+    label = "WINDOW"
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        (workdir / "data").mkdir()
+        shutil.copy(ROOT / "data" / "inventori.db", workdir / "data" / "inventori.db")
+        for _ in range(args.runs):
+            label, value = window_time_ms(workdir, env)
+            windows.append(value)
+
+    import_ms = statistics.median(imports)
+    window_ms = statistics.median(windows)
+    what = "sampai jendela login" if label == "WINDOW" else "sampai sebelum tk.Tk() (tanpa display)"
+    print(f"Impor main          {import_ms:8.1f} ms  (anggaran {args.import_budget_ms:.0f} ms)")
+    print(f"Mulai {what:<28} {window_ms:8.1f} ms  (anggaran {args.budget_ms:.0f} ms)")
+
+    failed = []
+    if import_ms > args.import_budget_ms:
+        failed.append("impor")
+    if window_ms > args.budget_ms:
+        failed.append("waktu mulai")
+    if failed:
+        print(f"MELEBIHI ANGGARAN: {', '.join(failed)}")
+        raise SystemExit(1)
+    print("Dalam anggaran")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Bandingkan laporan "stok per tanggal" tanpa dan dengan snapshot akhir bulan.
+
+Contoh: ``python -m benchmarks.bench_stock_as_of --items 5000 --transactions 500000``
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date
+
+from models import StockSnapshotModel
+
+from .common import temporary_database
+
+AS_OF_DATES = ("2020-03-31", "2021-06-30", "2022-12-31", "2024-06-30")
+
+
+def run_report(model: StockSnapshotModel, as_of: str) -> float:
+    started = time.perf_counter()
+    for _ in model.iter_stock_as_of(as_of):
+        pass
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--transactions", type=int, default=500_000)
+    args = parser.parse_args()
+
+    with temporary_database(args.items, args.transactions) as database:
+        model = StockSnapshotModel(database)
+        before = {as_of: run_report(model, as_of) for as_of in AS_OF_DATES}
+
+        started = time.perf_counter()
+        created = model.ensure_month_end_snapshots(date(2025, 7, 1))
+        backfill = time.perf_counter() - started
+
+        after = {as_of: run_report(model, as_of) for as_of in AS_OF_DATES}
+
+    print(f"{args.items} barang, {args.transactions} transaksi")
+    print(f"  isi {len(created)} snapshot akhir bulan: {backfill:.2f} s")
+    for as_of in AS_OF_DATES:
+        print(f"  {as_of}  tanpa snapshot {before[as_of] * 1000:8.1f} ms   dengan snapshot {after[as_of] * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
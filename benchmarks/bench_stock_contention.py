@@ -0,0 +1,97 @@
+"""Uji beban penjualan serentak untuk satu SKU dari banyak "workstation".
+
+Setiap thread membuka ``Database`` sendiri (koneksi terpisah, seperti
+komputer kasir lain yang memakai file yang sama) lalu menjual barang yang
+sama berulang kali. Di akhir, stok tidak boleh negatif dan harus sama
+dengan stok awal dikurangi jumlah penjualan yang berhasil.
+
+Contoh: ``python -m benchmarks.bench_stock_contention --threads 16 --sales 50``
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from controllers import ItemController
+from models import Database, ItemModel, TransactionModel
+
+from .common import build_database
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--sales", type=int, default=50, help="percobaan penjualan per thread")
+    parser.add_argument("--stock", type=int, default=500)
+    parser.add_argument("--busy-timeout-ms", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "contention.db"
+        setup = build_database(path, items=10, transactions=0)
+        with setup.transaction() as conn:
+            conn.execute("UPDATE items SET stock = ? WHERE id = 1", (args.stock,))
+        setup.close()
+
+        outcomes = {"ok": 0, "short": 0, "error": 0}
+        errors: list = []
+        lock = threading.Lock()
+        start_gate = threading.Barrier(args.threads)
+
+        def seller() -> None:
+            database = Database(path.as_posix(), busy_timeout_ms=args.busy_timeout_ms)
+            controller = ItemController(ItemModel(database), TransactionModel(database))
+            start_gate.wait()
+            for _ in range(args.sales):
+                ok, message = controller.record_transaction(
+                    {"transaction_date": "2025-12-01", "item_id": 1, "quantity": 1,
+                     "transaction_type": "OUT", "notes": "Uji beban"}
+                )
+                with lock:
+                    if ok:
+                        outcomes["ok"] += 1
+                    elif message == "Stok tidak mencukupi":
+                        outcomes["short"] += 1
+                    else:
+                        outcomes["error"] += 1
+                        errors.append(message)
+            database.close()
+
+        threads = [threading.Thread(target=seller) for _ in range(args.threads)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        check = Database(path.as_posix())
+        with check.connection() as conn:
+            final_stock = conn.execute("SELECT stock FROM items WHERE id = 1").fetchone()[0]
+            posted = conn.execute(
+                "SELECT COALESCE(SUM(quantity), 0) FROM transactions WHERE item_id = 1 AND transaction_type = 'OUT'"
+            ).fetchone()[0]
+        check.close()
+
+    attempts = args.threads * args.sales
+    print(f"{args.threads} thread x {args.sales} penjualan, stok awal {args.stock}")
+    print(f"  berhasil {outcomes['ok']}, stok kurang {outcomes['short']}, error {outcomes['error']}")
+    print(f"  stok akhir {final_stock}, total keluar tercatat {posted}")
+    print(f"  {elapsed:.2f} s ({attempts / elapsed:.0f} percobaan/detik)")
+    if errors:
+        print(f"  contoh error: {errors[0]}")
+
+    assert final_stock >= 0, "stok negatif"
+    assert final_stock == args.stock - outcomes["ok"], "stok tidak konsisten"
+    if not outcomes["error"]:
+        assert outcomes["ok"] == min(args.stock, attempts), "penjualan ditolak padahal stok masih ada"
+    assert posted == outcomes["ok"], "jumlah transaksi tidak sama dengan penjualan berhasil"
+    print("  konsisten: ya")
+
+
+if __name__ == "__main__":
+    main()
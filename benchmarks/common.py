@@ -0,0 +1,54 @@
+"""Utilitas bersama untuk skrip benchmark."""
+
+from __future__ import annotations
+
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Tuple
+
+from models import Database
+
+from . import datagen
+
+
+def build_database(path: Path, items: int, transactions: int, seed: int = 42) -> Database:
+    """Buat database benchmark berisi ``items`` barang dan ``transactions`` transaksi.
+
+    Data dibuat oleh :mod:`benchmarks.datagen` sehingga saldo stok konsisten
+    dengan riwayat transaksi.
+    """
+
+    return datagen.build(path, datagen.DatasetSpec(items=items, transactions=transactions, seed=seed))
+
+
+@contextmanager
+def temporary_database(items: int, transactions: int) -> Iterator[Database]:
+    with tempfile.TemporaryDirectory() as tmp:
+        database = build_database(Path(tmp) / "bench.db", items, transactions)
+        try:
+            yield database
+        finally:
+            database.close()
+
+
+def measure(func: Callable[[], object]) -> Tuple[float, int]:
+    """Jalankan ``func`` dan kembalikan (detik, puncak memori Python dalam byte)."""
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        func()
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def print_results(title: str, results: Dict[str, Tuple[float, int]]) -> None:
+    print(title)
+    for name, (elapsed, peak) in results.items():
+        print(f"  {name:<24} {elapsed:>9.2f} s  {peak / 1024 / 1024:>9.1f} MiB")
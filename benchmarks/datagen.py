@@ -0,0 +1,221 @@
+"""Generator data sintetis untuk benchmark skala besar.
+
+Menghasilkan kategori, pemasok, barang dan riwayat transaksi yang konsisten:
+saldo ``items.stock`` sama dengan stok awal ditambah seluruh transaksi, dan
+tidak ada transaksi keluar yang membuat stok negatif. Dengan seed yang sama
+hasilnya selalu identik.
+
+Contoh: ``python -m benchmarks.datagen data/uji_1m.db --items 50000 --transactions 1000000``
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import itertools
+import random
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+from models import Database
+
+CATEGORY_NAMES = (
+    "Sembako", "Minuman", "Perlengkapan", "Elektronik", "Makanan Ringan", "Kebersihan",
+    "Alat Tulis", "Kesehatan", "Bumbu Dapur", "Perawatan Diri", "Rumah Tangga", "Bayi",
+)
+SUPPLIER_PREFIXES = ("PT", "CV", "UD", "Toko")
+SUPPLIER_WORDS = ("Nusantara", "Sejahtera", "Makmur", "Jaya", "Abadi", "Sentosa", "Mandiri", "Berkah", "Utama", "Lestari")
+STREETS = ("Jl. Raya", "Jl. Mawar", "Jl. Anggrek", "Jl. Melati", "Jl. Merdeka", "Jl. Sudirman", "Jl. Diponegoro")
+PRODUCT_WORDS = ("Beras", "Gula", "Minyak", "Teh", "Kopi", "Sabun", "Sampo", "Pensil", "Buku", "Kabel",
+                 "Lampu", "Baterai", "Susu", "Mi", "Kecap", "Garam", "Tisu", "Deterjen", "Air", "Biskuit")
+PRODUCT_VARIANTS = ("Premium", "Ekonomis", "Kecil", "Besar", "Isi Ulang", "Botol", "Sachet", "Pak", "Dus")
+
+# Porsi transaksi per hari dalam seminggu (Senin..Minggu): Minggu sepi.
+WEEKDAY_WEIGHTS = (1.0, 1.0, 1.0, 1.0, 1.1, 0.8, 0.3)
+NOTES = {"IN": ("Restok", "Pembelian", "Penerimaan barang"), "OUT": ("Penjualan", "Pemakaian", "Penjualan grosir")}
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Ukuran dan bentuk data sintetis.
+
+    Popularitas barang mengikuti distribusi Pareto (sedikit barang laris,
+    banyak barang jarang bergerak), volume harian tumbuh ``growth`` kali dari
+    awal sampai akhir periode, dan barang keluar dalam jumlah kecil serta
+    masuk lewat restok besar saat stok menipis.
+    """
+
+    items: int = 1000
+    transactions: int = 10_000
+    suppliers: int = 20
+    categories: int = 8
+    start: date = date(2020, 1, 1)
+    days: int = 2000
+    growth: float = 3.0
+    restock_ratio: float = 0.15
+    seed: int = 42
+
+
+def _supplier_names(rng: random.Random, count: int) -> List[str]:
+    combos = [f"{prefix} {word}" for prefix, word in itertools.product(SUPPLIER_PREFIXES, SUPPLIER_WORDS)]
+    rng.shuffle(combos)
+    return [combos[i] if i < len(combos) else f"{combos[i % len(combos)]} {i // len(combos) + 1}" for i in range(count)]
+
+
+def _day_weights(spec: DatasetSpec) -> List[float]:
+    weights = []
+    for offset in range(spec.days):
+        day = spec.start + timedelta(days=offset)
+        trend = 1.0 + (spec.growth - 1.0) * offset / max(spec.days - 1, 1)
+        weights.append(trend * WEEKDAY_WEIGHTS[day.weekday()])
+    return list(itertools.accumulate(weights))
+
+
+def generate(database: Database, spec: DatasetSpec, progress: bool = False) -> Dict[str, int]:
+    """Isi ``database`` (yang sudah di-``initialize``) sesuai ``spec``.
+
+    Data awal bawaan aplikasi dibiarkan; kategori dan pemasok baru
+    ditambahkan sampai jumlahnya sesuai ``spec``. Barang dan transaksi
+    ditampung di tabel sementara lalu dipindahkan dengan satu ``INSERT ...
+    SELECT`` agar trigger FTS dan ringkasan tidak dijalankan per pernyataan.
+    Mengembalikan jumlah baris yang dibuat per tabel.
+    """
+
+    rng = random.Random(spec.seed)
+    created = {"categories": 0, "suppliers": 0, "items": 0, "transactions": 0}
+
+    with database.transaction(immediate=True) as conn:
+        existing = {row[0] for row in conn.execute("SELECT name FROM categories")}
+        extra = [name for name in CATEGORY_NAMES if name not in existing]
+        extra += [f"Kategori {i:03d}" for i in range(spec.categories)]
+        missing = max(spec.categories - len(existing), 0)
+        conn.executemany("INSERT INTO categories (name) VALUES (?)", ((name,) for name in extra[:missing]))
+        created["categories"] = missing
+
+        supplier_count = conn.execute("SELECT COUNT(*) FROM suppliers").fetchone()[0]
+        missing = max(spec.suppliers - supplier_count, 0)
+        conn.executemany(
+            "INSERT INTO suppliers (supplier_name, address) VALUES (?, ?)",
+            (
+                (name, f"{rng.choice(STREETS)} {rng.randint(1, 200)}")
+                for name in _supplier_names(rng, supplier_count + missing)[supplier_count:]
+            ),
+        )
+        created["suppliers"] = missing
+        category_ids = [row[0] for row in conn.execute("SELECT id FROM categories ORDER BY id")]
+        supplier_ids = [row[0] for row in conn.execute("SELECT id FROM suppliers ORDER BY id")]
+        first_id = (conn.execute("SELECT MAX(id) FROM items").fetchone()[0] or 0) + 1
+
+    # Barang: harga log-normal, stok awal acak, popularitas Pareto.
+    items = []
+    for i in range(spec.items):
+        purchase = round(rng.lognormvariate(9.5, 1.0), -2) or 100.0
+        items.append([
+            first_id + i,
+            f"SY-{i:07d}",
+            f"{rng.choice(PRODUCT_WORDS)} {rng.choice(PRODUCT_VARIANTS)} {i:07d}",
+            rng.choice(category_ids),
+            rng.randint(0, 200),
+            purchase,
+            round(purchase * rng.uniform(1.1, 1.6), -2),
+            rng.choice(supplier_ids),
+        ])
+    popularity = list(itertools.accumulate(rng.paretovariate(1.2) for _ in items))
+
+    # Transaksi disimulasikan berurutan waktu agar saldo tidak pernah negatif.
+    day_weights = _day_weights(spec)
+    offsets = sorted(bisect.bisect(day_weights, rng.random() * day_weights[-1]) for _ in range(spec.transactions))
+    balances = [item[4] for item in items]
+    transactions = []
+    for offset in offsets:
+        idx = bisect.bisect(popularity, rng.random() * popularity[-1]) if items else None
+        if idx is None:
+            break
+        quantity = max(1, int(rng.expovariate(1 / 4)))
+        if rng.random() < spec.restock_ratio or balances[idx] < quantity:
+            kind = "IN"
+            quantity = rng.randint(20, 200)
+            balances[idx] += quantity
+        else:
+            kind = "OUT"
+            balances[idx] -= quantity
+        moment = spec.start + timedelta(days=offset)
+        transactions.append((moment.isoformat(), items[idx][0], quantity, kind, rng.choice(NOTES[kind])))
+    for item, balance in zip(items, balances):
+        item[4] = balance
+
+    with database.transaction(immediate=True) as conn:
+        seq_before = conn.execute("SELECT IFNULL(MAX(seq), 0) FROM change_log").fetchone()[0]
+        conn.execute(
+            "CREATE TEMP TABLE datagen_items (id INTEGER PRIMARY KEY, item_code TEXT, item_name TEXT, "
+            "category_id INTEGER, stock INTEGER, purchase_price REAL, selling_price REAL, supplier_id INTEGER)"
+        )
+        conn.executemany("INSERT INTO temp.datagen_items VALUES (?, ?, ?, ?, ?, ?, ?, ?)", items)
+        conn.execute(
+            "INSERT INTO items (id, item_code, item_name, category_id, stock, purchase_price, selling_price, supplier_id) "
+            "SELECT * FROM temp.datagen_items ORDER BY id"
+        )
+        conn.execute("DROP TABLE temp.datagen_items")
+        created["items"] = len(items)
+        if progress:
+            print(f"  {len(items)} barang ditulis")
+
+        conn.execute(
+            "CREATE TEMP TABLE datagen_transactions (transaction_date TEXT, item_id INTEGER, "
+            "quantity INTEGER, transaction_type TEXT, notes TEXT)"
+        )
+        conn.executemany("INSERT INTO temp.datagen_transactions VALUES (?, ?, ?, ?, ?)", transactions)
+        conn.execute(
+            "INSERT INTO transactions (transaction_date, item_id, quantity, transaction_type, notes) "
+            "SELECT * FROM temp.datagen_transactions"
+        )
+        conn.execute("DROP TABLE temp.datagen_transactions")
+        created["transactions"] = len(transactions)
+        # Pemuatan massal bukan perubahan yang perlu disiarkan ke stasiun lain.
+        conn.execute("DELETE FROM change_log WHERE seq > ?", (seq_before,))
+    if progress:
+        print(f"  {len(transactions)} transaksi ditulis")
+    with database.transaction() as conn:
+        conn.execute("ANALYZE")
+    return created
+
+
+def build(path: Path, spec: DatasetSpec, progress: bool = False) -> Database:
+    """Buat database baru di ``path`` yang berisi data sintetis sesuai ``spec``."""
+
+    database = Database(path.as_posix())
+    database.initialize()
+    generate(database, spec, progress=progress)
+    return database
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output", type=Path, help="file database tujuan (tidak boleh sudah ada)")
+    defaults = DatasetSpec()
+    parser.add_argument("--items", type=int, default=defaults.items)
+    parser.add_argument("--transactions", type=int, default=defaults.transactions)
+    parser.add_argument("--suppliers", type=int, default=defaults.suppliers)
+    parser.add_argument("--categories", type=int, default=defaults.categories)
+    parser.add_argument("--start", type=date.fromisoformat, default=defaults.start, help="tanggal transaksi pertama")
+    parser.add_argument("--days", type=int, default=defaults.days)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    args = parser.parse_args()
+
+    if args.output.exists():
+        parser.error(f"{args.output} sudah ada")
+    spec = DatasetSpec(
+        items=args.items, transactions=args.transactions, suppliers=args.suppliers,
+        categories=args.categories, start=args.start, days=args.days, seed=args.seed,
+    )
+    started = time.perf_counter()
+    database = build(args.output, spec, progress=True)
+    database.close()
+    print(f"Selesai dalam {time.perf_counter() - started:.1f} s: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
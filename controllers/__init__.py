@@ -5,6 +5,8 @@ from .item_controller import ItemController
 from .supplier_controller import SupplierController
 from .dashboard_controller import DashboardController
 from .report_controller import ReportController
+from .data_loader import DataLoader
+from .change_watcher import ChangeWatcher
 
 __all__ = [
     "AuthController",
@@ -12,5 +14,7 @@ __all__ = [
     "SupplierController",
     "DashboardController",
     "ReportController",
+    "DataLoader",
+    "ChangeWatcher",
 ]
 
@@ -0,0 +1,33 @@
+"""Pemantau perubahan dari stasiun lain untuk penyegaran selektif."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+
+class ChangeWatcher:
+    """Mengingat ``seq`` terakhir yang sudah ditampilkan dan melaporkan perubahan baru.
+
+    ``poll()`` dipanggil berkala dari thread UI (lewat ``after()``); tanpa
+    commit baru biayanya hanya satu ``PRAGMA data_version``.
+    """
+
+    def __init__(self, change_feed: "ChangeFeed", interval_ms: int = 2000) -> None:
+        self.change_feed = change_feed
+        self.interval_ms = interval_ms
+        self.seq: Optional[int] = None
+
+    def start(self) -> None:
+        """Mulai dari posisi terbaru; tampilan dianggap baru saja dimuat penuh."""
+
+        self.seq = self.change_feed.latest_seq()
+
+    def poll(self) -> Optional[dict]:
+        if self.seq is None:
+            self.start()
+            return None
+        result = self.change_feed.poll(self.seq)
+        if result is None:
+            return None
+        self.seq = result["seq"]
+        return result
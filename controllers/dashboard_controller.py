@@ -2,12 +2,37 @@
 
 from __future__ import annotations
 
-from typing import Dict
+from typing import Callable, Dict, Iterator, List, Optional
+
+from models.movement_model import MovementModel
+
+# Label -> (peringkat, urutan menurun, jendela hari untuk "movement").
+CHART_RANKINGS = {
+    "Stok Terendah": ("stock", False, None),
+    "Stok Tertinggi": ("stock", True, None),
+    "Nilai Persediaan Tertinggi": ("value", True, None),
+    "Paling Banyak Bergerak (30 hari)": ("movement", True, 30),
+    "Paling Lambat Bergerak (30 hari)": ("movement", False, 30),
+    "Paling Banyak Bergerak (90 hari)": ("movement", True, 90),
+}
+
+
+def _deferred(fetch: Callable[[], List[dict]]) -> Iterator[dict]:
+    """Jalankan ``fetch`` saat baris pertama diminta, bukan saat dipanggil."""
+
+    yield from fetch()
+
 
 class DashboardController:
-    def __init__(self, item_model: "ItemModel", transaction_model: "TransactionModel") -> None:
+    def __init__(
+        self,
+        item_model: "ItemModel",
+        transaction_model: "TransactionModel",
+        movement_model: "MovementModel | None" = None,
+    ) -> None:
         self.item_model = item_model
         self.transaction_model = transaction_model
+        self.movement_model = movement_model or MovementModel(item_model.database)
 
     def get_dashboard_data(self) -> Dict[str, object]:
         summary = self.item_model.get_stock_summary()
@@ -17,3 +42,35 @@ class DashboardController:
             "recent_transactions": recent,
         }
 
+    def chart_rankings(self) -> List[str]:
+        return list(CHART_RANKINGS)
+
+    def get_chart_items(
+        self, ranking: str = "Stok Terendah", limit: int = 8, days: Optional[int] = None
+    ) -> List[dict]:
+        """Barang untuk grafik dashboard; ``days`` menggantikan jendela bawaan peringkat pergerakan."""
+
+        key, descending, window = CHART_RANKINGS.get(ranking, CHART_RANKINGS["Stok Terendah"])
+        options = {"days": days or window} if key == "movement" else {}
+        return self.item_model.get_ranked(key, limit=limit, descending=descending, **options)
+
+    def get_movement_trend(self, months: int = 12) -> List[dict]:
+        return self.movement_model.get_trend(months)
+
+    def get_movement_report(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, object]:
+        """Data laporan pergerakan untuk ``ReportController.export_movement``.
+
+        Query belum dijalankan saat fungsi ini kembali; tabel dibaca ketika
+        laporan mulai ditulis (di thread ekspor).
+        """
+
+        if start or end:
+            period = f"{start[:7] if start else 'awal'} s.d. {end[:7] if end else 'akhir'}"
+        else:
+            period = "Semua periode"
+        return {
+            "months": _deferred(lambda: self.movement_model.get_monthly(start, end)),
+            "categories": _deferred(lambda: self.movement_model.get_by_category(start, end)),
+            "items": self.movement_model.iter_by_item(start, end),
+            "period": period,
+        }
@@ -0,0 +1,40 @@
+"""Pemuat data paralel untuk mengisi banyak tampilan sekaligus."""
+
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict
+
+
+class LoadBatch:
+    """Sekumpulan query yang dikirim bersama dan dikembalikan bersama."""
+
+    def __init__(self, futures: Dict[str, "Future[object]"]) -> None:
+        self.futures = futures
+
+    def done(self) -> bool:
+        return all(future.done() for future in self.futures.values())
+
+    def results(self) -> Dict[str, object]:
+        """Hasil per nama tugas; exception pertama dari pekerja dilempar ulang."""
+
+        return {name: future.result() for name, future in self.futures.items()}
+
+
+class DataLoader:
+    """Menjalankan fungsi baca (controller/model) di thread pool.
+
+    Setiap thread pekerja memakai koneksi pembaca miliknya sendiri dari
+    ``Database`` (``query_only``), sehingga query berjalan bersamaan tanpa
+    saling menunggu. Hasil tidak pernah menyentuh widget Tk dari thread
+    pekerja; view mengambilnya lewat polling ``after()`` di thread UI.
+    """
+
+    def __init__(self, max_workers: int = 6) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="loader")
+
+    def submit(self, tasks: Dict[str, Callable[[], object]]) -> LoadBatch:
+        return LoadBatch({name: self._executor.submit(task) for name, task in tasks.items()})
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
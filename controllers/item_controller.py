@@ -3,21 +3,66 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
+from models.item_importer import ItemImporter
+from models.stock_snapshot_model import StockSnapshotModel
 from utils.validators import validate_required_fields
 
 class ItemController:
-    def __init__(self, item_model: "ItemModel", transaction_model: "TransactionModel") -> None:
+    def __init__(
+        self,
+        item_model: "ItemModel",
+        transaction_model: "TransactionModel",
+        importer: "ItemImporter | None" = None,
+        snapshot_model: "StockSnapshotModel | None" = None,
+    ) -> None:
         self.item_model = item_model
         self.transaction_model = transaction_model
+        self.importer = importer or ItemImporter(item_model.database)
+        self.snapshot_model = snapshot_model or StockSnapshotModel(item_model.database)
 
     def list_items(self, keyword: str = "") -> List[dict]:
         return self.item_model.get_all(keyword)
 
+    def list_items_page(
+        self,
+        keyword: str = "",
+        after: Optional[Tuple[str, int]] = None,
+        limit: int = 100,
+        with_total: bool = True,
+    ) -> dict:
+        return self.item_model.get_page(keyword, after, limit, with_total)
+
+    def item_key_at(self, offset: int, keyword: str = "") -> Optional[Tuple[str, int]]:
+        return self.item_model.get_key_at(offset, keyword)
+
+    def item_options(self, known_version: Optional[int] = None) -> Tuple[int, Optional[List[str]]]:
+        """``(versi, label "kode - nama")`` dari katalog barang yang sudah disegarkan.
+
+        Label bernilai ``None`` bila versi katalog masih ``known_version``.
+        """
+
+        catalog = self.item_model.database.item_catalog
+        catalog.refresh()
+        version = catalog.version
+        return version, (None if version == known_version else catalog.options())
+
+    def item_id_for_code(self, item_code: str) -> Optional[int]:
+        catalog = self.item_model.database.item_catalog
+        catalog.refresh()
+        return catalog.id_for_code(item_code)
+
     def get_categories(self) -> List[dict]:
         return self.item_model.get_categories()
 
+    def category_id(self, name: str) -> Optional[int]:
+        return self.item_model.get_category_id(name)
+
+    def category_name(self, category_id: Optional[int]) -> str:
+        category = self.item_model.get_category(category_id)
+        return category["name"] if category else ""
+
     def add_item(self, data: Dict[str, object]) -> Tuple[bool, str]:
         required = {
             "Kode Barang": data.get("item_code"),
@@ -68,18 +113,82 @@ class ItemController:
             data["transaction_date"] = data["transaction_date"].strftime("%Y-%m-%d")
 
         try:
-            if data["transaction_type"] == "OUT":
-                item = self.item_model.get_by_id(int(data["item_id"]))
-                if item and item["stock"] < int(data["quantity"]):
-                    return False, "Stok tidak mencukupi"
             self.transaction_model.add_transaction(data)
             return True, "Transaksi berhasil disimpan"
+        except ValueError as exc:
+            return False, str(exc)
         except Exception as exc:  # noqa: BLE001
             return False, f"Gagal menyimpan transaksi: {exc}"
 
+    def record_transactions(self, batch: List[Dict[str, object]]) -> Tuple[bool, str]:
+        """Posting banyak baris transaksi sekaligus (mis. penerimaan barang)."""
+
+        if not batch:
+            return False, "Belum ada baris transaksi"
+        for index, data in enumerate(batch, start=1):
+            valid, message = validate_required_fields(
+                {
+                    "Tanggal": data.get("transaction_date"),
+                    "Barang": data.get("item_id"),
+                    "Jumlah": data.get("quantity"),
+                    "Jenis": data.get("transaction_type"),
+                }
+            )
+            if not valid:
+                return False, f"Baris {index}: {message}"
+            if isinstance(data.get("transaction_date"), datetime):
+                data["transaction_date"] = data["transaction_date"].strftime("%Y-%m-%d")
+
+        try:
+            count = self.transaction_model.add_transactions(batch)
+            return True, f"{count} transaksi berhasil disimpan"
+        except ValueError as exc:
+            return False, str(exc)
+        except Exception as exc:  # noqa: BLE001
+            return False, f"Gagal menyimpan transaksi: {exc}"
+
+    def import_items(self, source: str) -> Tuple[bool, str]:
+        """Impor barang dari CSV/XLSX (upsert berdasarkan kode barang)."""
+
+        try:
+            result = self.importer.import_file(source)
+        except ValueError as exc:
+            return False, str(exc)
+        except Exception as exc:  # noqa: BLE001
+            return False, f"Gagal mengimpor barang: {exc}"
+        message = "{} barang baru, {} barang diperbarui".format(result["inserted"], result["updated"])
+        if result["rejected"]:
+            message += "\n{} baris ditolak, lihat {}".format(result["rejected"], result["reject_file"])
+        return True, message
+
     def get_recent_transactions(self, limit: int = 10) -> List[dict]:
         return self.transaction_model.get_recent(limit)
 
     def get_all_transactions(self) -> List[dict]:
         return self.transaction_model.get_all()
 
+    def list_transactions_page(
+        self,
+        after: Optional[Tuple[str, int]] = None,
+        limit: int = 100,
+        with_total: bool = True,
+    ) -> dict:
+        return self.transaction_model.get_page(after, limit, with_total)
+
+    def transaction_key_at(self, offset: int) -> Optional[Tuple[str, int]]:
+        return self.transaction_model.get_key_at(offset)
+
+    def iter_items(self) -> Iterator[dict]:
+        return self.item_model.iter_all()
+
+    def iter_transactions(self, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[dict]:
+        return self.transaction_model.iter_all(start=start, end=end)
+
+    def iter_items_as_of(self, as_of: str) -> Iterator[dict]:
+        """Seluruh barang dengan saldo stok pada akhir hari ``as_of`` (YYYY-MM-DD)."""
+
+        return self.snapshot_model.iter_stock_as_of(as_of)
+
+    def stock_as_of(self, item_id: int, as_of: str) -> int:
+        return self.snapshot_model.stock_as_of(item_id, as_of)
+
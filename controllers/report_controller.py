@@ -2,29 +2,232 @@
 
 from __future__ import annotations
 
+import itertools
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class ExportCancelled(Exception):
+    """Dilempar dari callback progres ketika pengguna membatalkan ekspor."""
+
+
+@contextmanager
+def _rendered_to(destination: str) -> Iterator[Path]:
+    """Berikan file sementara di folder ``destination``; pindahkan ke sana bila berhasil.
+
+    Bila ekspor gagal atau dibatalkan, file sementara dihapus sehingga
+    laporan setengah jadi tidak pernah muncul di ``destination``.
+    """
+
+    path = Path(destination)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle, temp_name = tempfile.mkstemp(prefix=f".{path.stem}-", suffix=path.suffix, dir=path.parent)
+    os.close(handle)
+    temp = Path(temp_name)
+    try:
+        yield temp
+        os.replace(temp, path)
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+
+
+class ExportJob:
+    """Status satu pekerjaan ekspor yang berjalan di thread latar belakang.
+
+    Atribut ditulis oleh thread pekerja dan hanya dibaca oleh UI (polling),
+    sehingga tidak perlu lock tambahan.
+    """
+
+    PENDING = "Menunggu"
+    RUNNING = "Berjalan"
+    DONE = "Selesai"
+    FAILED = "Gagal"
+    CANCELLED = "Dibatalkan"
+
+    def __init__(self, job_id: int, label: str, destination: str) -> None:
+        self.id = job_id
+        self.label = label
+        self.destination = destination
+        self.status = self.PENDING
+        self.section = ""
+        self.sections_done = 0
+        self.rows = 0
+        self.message = ""
+        self.cancel_event = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (self.DONE, self.FAILED, self.CANCELLED)
+
+    def progress_text(self) -> str:
+        if self.status != self.RUNNING:
+            return self.message or self.status
+        return f"[{self.sections_done + 1}] {self.section}: {self.rows:,} baris".replace(",", ".")
+
+    def _on_progress(self, section: str, rows: int) -> None:
+        if self.cancel_event.is_set():
+            raise ExportCancelled()
+        if section != self.section:
+            if self.section:
+                self.sections_done += 1
+            self.section = section
+        self.rows = rows
+
 
 class ReportController:
-    def __init__(self, report_service: "ReportService") -> None:
+    def __init__(self, report_service: "ReportService", max_workers: int = 2) -> None:
         self.report_service = report_service
+        # Thread (bukan proses) karena data dialirkan dari generator SQLite
+        # yang tidak bisa di-pickle; dua pekerja cukup untuk PDF + Excel paralel.
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export")
+        self._job_ids = itertools.count(1)
+        self.jobs: Dict[int, ExportJob] = {}
 
-    def export_pdf(self, items: List[dict], transactions: List[dict], destination: str) -> Tuple[bool, str]:
+    def export_pdf(
+        self,
+        items: Iterable[dict],
+        transactions: Iterable[dict],
+        destination: str,
+        progress: Optional[Callable[[str, int], None]] = None,
+    ) -> Tuple[bool, str]:
+        path = Path(destination)
         try:
-            path = Path(destination)
-            path.parent.mkdir(parents=True, exist_ok=True)
-            self.report_service.generate_complete_pdf(items, transactions, path)
+            with _rendered_to(destination) as temp:
+                self.report_service.generate_complete_pdf(items, transactions, temp, progress=progress)
             return True, f"Laporan Lengkap PDF tersimpan di {path}"
+        except ExportCancelled:
+            raise
         except Exception as exc:  # noqa: BLE001
             return False, f"Gagal membuat laporan PDF: {exc}"
 
-    def export_excel(self, items: List[dict], transactions: List[dict], destination: str) -> Tuple[bool, str]:
+    def export_excel(
+        self,
+        items: Iterable[dict],
+        transactions: Iterable[dict],
+        destination: str,
+        progress: Optional[Callable[[str, int], None]] = None,
+    ) -> Tuple[bool, str]:
+        path = Path(destination)
         try:
-            path = Path(destination)
-            path.parent.mkdir(parents=True, exist_ok=True)
-            self.report_service.generate_complete_excel(items, transactions, path)
+            with _rendered_to(destination) as temp:
+                self.report_service.generate_complete_excel(items, transactions, temp, progress=progress)
             return True, f"Laporan Lengkap Excel tersimpan di {path}"
+        except ExportCancelled:
+            raise
         except Exception as exc:  # noqa: BLE001
             return False, f"Gagal membuat laporan Excel: {exc}"
 
+    def export_movement(
+        self,
+        kind: str,
+        movements: Dict[str, object],
+        destination: str,
+        progress: Optional[Callable[[str, int], None]] = None,
+    ) -> Tuple[bool, str]:
+        """Ekspor laporan pergerakan ``"pdf"``/``"excel"``.
+
+        ``movements`` berisi ``months``, ``categories``, ``items`` dan
+        ``period`` seperti hasil ``DashboardController.get_movement_report``.
+        """
+
+        label = "PDF" if kind == "pdf" else "Excel"
+        path = Path(destination)
+        try:
+            render = self.report_service.generate_movement_pdf if kind == "pdf" else self.report_service.generate_movement_excel
+            with _rendered_to(destination) as temp:
+                render(
+                    movements["months"],
+                    movements["categories"],
+                    movements["items"],
+                    temp,
+                    period=movements["period"],
+                    progress=progress,
+                )
+            return True, f"Laporan Pergerakan {label} tersimpan di {path}"
+        except ExportCancelled:
+            raise
+        except Exception as exc:  # noqa: BLE001
+            return False, f"Gagal membuat laporan pergerakan {label}: {exc}"
+
+    def submit_export(
+        self,
+        kind: str,
+        items: Iterable[dict],
+        transactions: Iterable[dict],
+        destination: str,
+    ) -> ExportJob:
+        """Jalankan ekspor ``"pdf"`` atau ``"excel"`` di latar belakang.
+
+        ``items`` dan ``transactions`` sebaiknya generator yang belum mulai
+        dibaca, agar query berjalan di thread pekerja, bukan di thread UI.
+        """
+
+        export = {"pdf": self.export_pdf, "excel": self.export_excel}[kind]
+        return self._submit(
+            f"Laporan Lengkap {kind.upper()}",
+            destination,
+            lambda progress: export(items, transactions, destination, progress=progress),
+        )
+
+    def submit_movement_export(self, kind: str, movements: Dict[str, object], destination: str) -> ExportJob:
+        """Seperti ``submit_export`` untuk laporan pergerakan; data rollup dibaca di thread pekerja."""
+
+        return self._submit(
+            f"Laporan Pergerakan {kind.upper()}",
+            destination,
+            lambda progress: self.export_movement(kind, movements, destination, progress=progress),
+        )
+
+    def _submit(
+        self,
+        label: str,
+        destination: str,
+        export: Callable[[Callable[[str, int], None]], Tuple[bool, str]],
+    ) -> ExportJob:
+        job = ExportJob(next(self._job_ids), label, destination)
+        self.jobs[job.id] = job
+
+        def run() -> None:
+            if job.cancel_event.is_set():
+                job.status = ExportJob.CANCELLED
+                return
+            job.status = ExportJob.RUNNING
+            try:
+                success, message = export(job._on_progress)
+            except ExportCancelled:
+                job.status = ExportJob.CANCELLED
+                job.message = "Ekspor dibatalkan"
+                return
+            job.message = message
+            job.status = ExportJob.DONE if success else ExportJob.FAILED
+
+        self._executor.submit(run)
+        return job
+
+    def cancel(self, job_id: int) -> None:
+        job = self.jobs.get(job_id)
+        if job and not job.finished:
+            job.cancel_event.set()
+            if job.status == ExportJob.PENDING:
+                job.status = ExportJob.CANCELLED
+                job.message = "Ekspor dibatalkan"
+
+    def list_jobs(self) -> List[ExportJob]:
+        return list(self.jobs.values())
+
+    def clear_finished(self) -> None:
+        for job_id in [job.id for job in self.jobs.values() if job.finished]:
+            del self.jobs[job_id]
+
+    def shutdown(self) -> None:
+        """Batalkan semua ekspor yang belum selesai dan hentikan pool."""
 
+        for job in self.jobs.values():
+            job.cancel_event.set()
+        self._executor.shutdown(wait=True, cancel_futures=True)
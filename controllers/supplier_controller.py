@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from utils.validators import validate_required_fields
 
@@ -13,6 +13,13 @@ class SupplierController:
     def list_suppliers(self, keyword: str = "") -> List[dict]:
         return self.supplier_model.get_all(keyword)
 
+    def supplier_id(self, name: str) -> Optional[int]:
+        return self.supplier_model.get_id_by_name(name)
+
+    def supplier_name(self, supplier_id: Optional[int]) -> str:
+        supplier = self.supplier_model.get_by_id(supplier_id) if supplier_id is not None else None
+        return supplier["supplier_name"] if supplier else ""
+
     def add_supplier(self, data: Dict[str, str]) -> Tuple[bool, str]:
         valid, message = validate_required_fields({"Nama Pemasok": data.get("supplier_name")})
         if not valid:
@@ -4,20 +4,39 @@ import tkinter as tk
 
 from controllers import (
     AuthController,
+    ChangeWatcher,
     DashboardController,
+    DataLoader,
     ItemController,
     ReportController,
     SupplierController,
 )
-from models import Database, ItemModel, SupplierModel, TransactionModel, UserModel
+from models import (
+    ChangeFeed,
+    Database,
+    ItemModel,
+    QueryMetrics,
+    StockSnapshotModel,
+    SupplierModel,
+    TransactionModel,
+    UserModel,
+)
 from reports import ReportService
-from utils import ChartBuilder
 from views import LoginView, MainView
 
 
 def main() -> None:
-    database = Database()
+    # Statistik SQL dikumpulkan di memori dan ditulis ke data/sql_metrics.json
+    # saat aplikasi ditutup; query > 200 ms dicatat di data/slow_queries.log.
+    metrics = QueryMetrics(slow_ms=200, slow_log="data/slow_queries.log")
+    database = Database(metrics=metrics)
     database.initialize()
+    # Saat mulai hanya bulan lalu yang ditutup (cepat); riwayat snapshot
+    # yang masih kosong diisi di latar belakang setelah jendela tampil.
+    snapshot_model = StockSnapshotModel(database)
+    snapshot_model.ensure_month_end_snapshots(months=1)
+    change_feed = ChangeFeed(database)
+    change_feed.prune()
 
     user_model = UserModel(database)
     item_model = ItemModel(database)
@@ -29,7 +48,8 @@ def main() -> None:
     supplier_controller = SupplierController(supplier_model)
     dashboard_controller = DashboardController(item_model, transaction_model)
     report_controller = ReportController(ReportService())
-    chart_builder = ChartBuilder()
+    data_loader = DataLoader()
+    change_watcher = ChangeWatcher(change_feed)
 
     root = tk.Tk()
 
@@ -44,11 +64,19 @@ def main() -> None:
             supplier_controller=supplier_controller,
             dashboard_controller=dashboard_controller,
             report_controller=report_controller,
-            chart_builder=chart_builder,
+            data_loader=data_loader,
+            change_watcher=change_watcher,
         )
 
     login_frame = LoginView(root, auth_controller, handle_login_success)
+    root.after(1000, lambda: data_loader.submit({"snapshots": snapshot_model.ensure_month_end_snapshots}))
     root.mainloop()
+    report_controller.shutdown()
+    data_loader.shutdown()
+    change_feed.close()
+    database.close()
+    metrics.dump("data/sql_metrics.json")
+    metrics.close()
 
 
 if __name__ == "__main__":
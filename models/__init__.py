@@ -5,6 +5,13 @@ from .user_model import UserModel
 from .item_model import ItemModel
 from .supplier_model import SupplierModel
 from .transaction_model import TransactionModel
+from .item_importer import ItemImporter
+from .stock_snapshot_model import StockSnapshotModel
+from .change_feed import ChangeFeed
+from .query_metrics import QueryMetrics
+from .transaction_archive import TransactionArchive
+from .movement_model import MovementModel
+from .item_catalog import ItemCatalog
 
 __all__ = [
     "Database",
@@ -12,4 +19,11 @@ __all__ = [
     "ItemModel",
     "SupplierModel",
     "TransactionModel",
+    "ItemImporter",
+    "StockSnapshotModel",
+    "ChangeFeed",
+    "QueryMetrics",
+    "TransactionArchive",
+    "MovementModel",
+    "ItemCatalog",
 ]
\ No newline at end of file
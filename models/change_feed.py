@@ -0,0 +1,103 @@
+"""Umpan perubahan (``change_log``) untuk menyegarkan tampilan antar-stasiun."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from collections import defaultdict
+from typing import Dict, Optional, Set
+
+
+class ChangeFeed:
+    """Membaca ``change_log`` yang diisi trigger, dimulai dari ``seq`` tertentu.
+
+    Seperti ``ReferenceCache``, pemeriksaan memakai koneksi sendiri dan
+    ``PRAGMA data_version`` sehingga polling tanpa commit baru tidak
+    menjalankan query tabel sama sekali.
+    """
+
+    def __init__(self, database: "Database") -> None:
+        self.database = database
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._data_version: Optional[int] = None
+
+    def latest_seq(self) -> int:
+        with self._lock:
+            return self._latest(self._connection())
+
+    def poll(self, after_seq: int, limit: int = 2000) -> Optional[dict]:
+        """Ambil perubahan setelah ``after_seq``; ``None`` bila tidak ada commit baru.
+
+        Hasil: ``seq`` (posisi terbaru yang sudah dibaca), ``changes``
+        berbentuk ``{tabel: {operasi: {id, ...}}}`` dan ``overflow`` yang
+        bernilai ``True`` bila perubahan melebihi ``limit`` atau sebagian
+        sudah dipangkas. Saat itu ``changes`` hanya memuat nama tabel dan
+        pemanggil sebaiknya memuat ulang tabel tersebut seluruhnya.
+        """
+
+        with self._lock:
+            conn = self._connection()
+            data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version == self._data_version:
+                return None
+            self._data_version = data_version
+            rows = conn.execute(
+                "SELECT seq, table_name, row_id, op FROM change_log WHERE seq > ? ORDER BY seq LIMIT ?",
+                (after_seq, limit + 1),
+            ).fetchall()
+            if not rows:
+                return None
+            overflow = len(rows) > limit or (rows[0]["seq"] > after_seq + 1 and self._pruned_past(conn, after_seq))
+            changes: Dict[str, Dict[str, Set[int]]] = defaultdict(lambda: defaultdict(set))
+            if overflow:
+                for row in conn.execute("SELECT DISTINCT table_name FROM change_log WHERE seq > ?", (after_seq,)):
+                    changes[row["table_name"]]
+                seq = self._latest(conn)
+            else:
+                for row in rows:
+                    changes[row["table_name"]][row["op"]].add(row["row_id"])
+                seq = rows[-1]["seq"]
+        return {
+            "seq": seq,
+            "changes": {table: dict(ops) for table, ops in changes.items()},
+            "overflow": overflow,
+        }
+
+    def prune(self, keep: int = 50_000) -> int:
+        """Hapus entri lama dan sisakan ``keep`` entri terakhir."""
+
+        with self.database.connection() as conn:
+            oldest, latest = conn.execute("SELECT MIN(seq), MAX(seq) FROM change_log").fetchone()
+        if oldest is None or oldest > latest - keep:
+            return 0
+
+        def work(conn: sqlite3.Connection) -> int:
+            latest = self._latest(conn)
+            return conn.execute("DELETE FROM change_log WHERE seq <= ?", (latest - keep,)).rowcount
+
+        return self.database.write(work)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._data_version = None
+
+    @staticmethod
+    def _latest(conn: sqlite3.Connection) -> int:
+        return conn.execute("SELECT IFNULL(MAX(seq), 0) FROM change_log").fetchone()[0]
+
+    @staticmethod
+    def _pruned_past(conn: sqlite3.Connection, after_seq: int) -> bool:
+        """Apakah entri setelah ``after_seq`` sudah ikut terhapus oleh ``prune``."""
+
+        oldest = conn.execute("SELECT MIN(seq) FROM change_log").fetchone()[0]
+        return oldest is not None and oldest > after_seq + 1
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = self.database.get_connection()
+            self._conn.execute("PRAGMA query_only = ON")
+        return self._conn
@@ -3,81 +3,226 @@
 from __future__ import annotations
 
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable, Iterator, List, TypeVar
 
 from utils.security import hash_password
 
+from .migrations import SCHEMA_VERSION, apply_migrations, get_schema_version
+from .query_metrics import InstrumentedConnection, QueryMetrics
+from .item_catalog import ItemCatalog
+from .reference_cache import ReferenceCache
+
+T = TypeVar("T")
+
 
 class Database:
-    """Kelas helper untuk koneksi dan inisialisasi database."""
+    """Kelas helper untuk koneksi dan inisialisasi database.
 
-    def __init__(self, db_path: str = "data/inventori.db") -> None:
+    Koneksi tidak lagi dibuka per pemanggilan. ``Database`` memegang satu
+    koneksi penulis yang dipakai bersama (dijaga lock) dan satu koneksi
+    pembaca per thread. PRAGMA diterapkan sekali ketika koneksi dibuat.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "data/inventori.db",
+        journal_mode: str = "WAL",
+        cache_size_kib: int = 8192,
+        mmap_size: int = 64 * 1024 * 1024,
+        busy_timeout_ms: int = 5000,
+        metrics: QueryMetrics | None = None,
+    ) -> None:
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Gunakan journal_mode="DELETE" bila file database berada di network
+        # share, karena WAL membutuhkan shared memory lokal.
+        self.journal_mode = journal_mode
+        self.cache_size_kib = cache_size_kib
+        self.mmap_size = mmap_size
+        self.busy_timeout_ms = busy_timeout_ms
+        # Bila diisi, setiap koneksi mencatat latensi pernyataan ke ``metrics``.
+        self.metrics = metrics
+
+        self._writer: sqlite3.Connection | None = None
+        self._writer_lock = threading.RLock()
+        self._writer_depth = 0
+        self._local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self.reference_cache = ReferenceCache(self)
+        self.item_catalog = ItemCatalog(self)
 
     def get_connection(self) -> sqlite3.Connection:
-        """Membuat koneksi baru ke database."""
+        """Membuat koneksi baru yang sudah dikonfigurasi (di luar pool)."""
 
-        conn = sqlite3.connect(self.db_path.as_posix())
+        conn = sqlite3.connect(
+            self.db_path.as_posix(),
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False,
+            factory=InstrumentedConnection if self.metrics is not None else sqlite3.Connection,
+        )
+        if self.metrics is not None:
+            conn.metrics = self.metrics
         conn.row_factory = sqlite3.Row
+        self._configure(conn)
         return conn
 
+    def _configure(self, conn: sqlite3.Connection) -> None:
+        conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA cache_size = -{int(self.cache_size_kib)}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        conn.execute("PRAGMA foreign_keys = ON")
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Pinjam koneksi pembaca milik thread saat ini (hanya baca)."""
+
+        conn = getattr(self._local, "reader", None)
+        if conn is None:
+            conn = self.get_connection()
+            conn.execute("PRAGMA query_only = ON")
+            self._local.reader = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        yield conn
+
+    @contextmanager
+    def transaction(self, immediate: bool = False) -> Iterator[sqlite3.Connection]:
+        """Pinjam koneksi penulis; commit saat selesai, rollback bila gagal.
+
+        Pemanggilan bersarang pada thread yang sama memakai transaksi terluar.
+        Dengan ``immediate=True`` transaksi terluar dibuka dengan
+        ``BEGIN IMMEDIATE`` sehingga kunci tulis diambil di awal, bukan saat
+        pernyataan tulis pertama.
+        """
+
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = self.get_connection()
+            conn = self._writer
+            self._writer_depth += 1
+            try:
+                if immediate and self._writer_depth == 1 and not conn.in_transaction:
+                    conn.execute("BEGIN IMMEDIATE")
+                yield conn
+            except BaseException:
+                if self._writer_depth == 1:
+                    conn.rollback()
+                raise
+            else:
+                if self._writer_depth == 1:
+                    conn.commit()
+            finally:
+                self._writer_depth -= 1
+
+    def write(self, work: Callable[[sqlite3.Connection], T], attempts: int = 3, backoff_s: float = 0.05) -> T:
+        """Jalankan ``work(conn)`` dalam ``BEGIN IMMEDIATE`` dan ulangi bila database sibuk.
+
+        Setiap percobaan menunggu paling lama ``busy_timeout_ms``; setelah
+        ``attempts`` kali gagal karena terkunci, error terakhir diteruskan.
+        Bila dipanggil di dalam transaksi yang sedang berjalan, ``work``
+        langsung dijalankan tanpa pengulangan.
+        """
+
+        with self._writer_lock:
+            if self._writer_depth:
+                with self.transaction() as conn:
+                    return work(conn)
+            attempt = 1
+            while True:
+                try:
+                    with self.transaction(immediate=True) as conn:
+                        return work(conn)
+                except sqlite3.OperationalError as exc:
+                    message = str(exc).lower()
+                    if attempt >= attempts or ("locked" not in message and "busy" not in message):
+                        raise
+                time.sleep(backoff_s * attempt)
+                attempt += 1
+
+    def close(self) -> None:
+        """Tutup seluruh koneksi di dalam pool."""
+
+        self.reference_cache.close()
+        self.item_catalog.close()
+        with self._writer_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+        self._local = threading.local()
+
     def initialize(self) -> None:
-        """Membuat tabel dan data awal jika belum tersedia."""
-
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.executescript(
-            """
-            PRAGMA foreign_keys = ON;
-
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                password TEXT NOT NULL,
-                level TEXT NOT NULL CHECK(level IN ('admin', 'user'))
-            );
-
-            CREATE TABLE IF NOT EXISTS categories (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL
-            );
-
-            CREATE TABLE IF NOT EXISTS suppliers (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                supplier_name TEXT NOT NULL,
-                address TEXT
-            );
-
-            CREATE TABLE IF NOT EXISTS items (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                item_code TEXT UNIQUE NOT NULL,
-                item_name TEXT NOT NULL,
-                category_id INTEGER,
-                stock INTEGER NOT NULL DEFAULT 0,
-                purchase_price REAL DEFAULT 0,
-                selling_price REAL DEFAULT 0,
-                supplier_id INTEGER,
-                FOREIGN KEY(category_id) REFERENCES categories(id) ON DELETE SET NULL,
-                FOREIGN KEY(supplier_id) REFERENCES suppliers(id) ON DELETE SET NULL
-            );
-
-            CREATE TABLE IF NOT EXISTS transactions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                transaction_date TEXT NOT NULL,
-                item_id INTEGER NOT NULL,
-                quantity INTEGER NOT NULL,
-                transaction_type TEXT NOT NULL CHECK(transaction_type IN ('IN', 'OUT')),
-                notes TEXT,
-                FOREIGN KEY(item_id) REFERENCES items(id) ON DELETE CASCADE
-            );
-            """
-        )
+        """Membuat tabel dan data awal jika belum tersedia.
+
+        Bila ``PRAGMA user_version`` sudah sama dengan versi skema terbaru,
+        pembuatan skema, pengecekan data awal, dan migrasi dilewati seluruhnya.
+        """
+
+        with self.connection() as conn:
+            if get_schema_version(conn) == SCHEMA_VERSION:
+                return
+
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.executescript(
+                """
+                PRAGMA foreign_keys = ON;
+
+                CREATE TABLE IF NOT EXISTS users (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username TEXT UNIQUE NOT NULL,
+                    password TEXT NOT NULL,
+                    level TEXT NOT NULL CHECK(level IN ('admin', 'user'))
+                );
+
+                CREATE TABLE IF NOT EXISTS categories (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT UNIQUE NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS suppliers (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    supplier_name TEXT NOT NULL,
+                    address TEXT
+                );
+
+                CREATE TABLE IF NOT EXISTS items (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    item_code TEXT UNIQUE NOT NULL,
+                    item_name TEXT NOT NULL,
+                    category_id INTEGER,
+                    stock INTEGER NOT NULL DEFAULT 0,
+                    purchase_price REAL DEFAULT 0,
+                    selling_price REAL DEFAULT 0,
+                    supplier_id INTEGER,
+                    FOREIGN KEY(category_id) REFERENCES categories(id) ON DELETE SET NULL,
+                    FOREIGN KEY(supplier_id) REFERENCES suppliers(id) ON DELETE SET NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS transactions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    transaction_date TEXT NOT NULL,
+                    item_id INTEGER NOT NULL,
+                    quantity INTEGER NOT NULL,
+                    transaction_type TEXT NOT NULL CHECK(transaction_type IN ('IN', 'OUT')),
+                    notes TEXT,
+                    FOREIGN KEY(item_id) REFERENCES items(id) ON DELETE CASCADE
+                );
+                """
+            )
 
-        self._ensure_default_records(cursor)
-        conn.commit()
-        conn.close()
+            self._ensure_default_records(cursor)
+            apply_migrations(conn)
 
     def _ensure_default_records(self, cursor: sqlite3.Cursor) -> None:
         """Menambahkan data awal seperti user admin dan kategori default."""
@@ -0,0 +1,194 @@
+"""Katalog barang ringkas di memori untuk pilihan barang dan pencarian kode."""
+
+from __future__ import annotations
+
+import bisect
+import threading
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .change_feed import ChangeFeed
+
+CATALOG_QUERY = "SELECT id, item_code, item_name FROM items"
+# Batas parameter per ``IN (...)`` saat memuat ulang barang yang berubah.
+FETCH_CHUNK = 500
+
+
+class ItemCatalog:
+    """Menyimpan id, kode dan nama setiap barang secara kolumnar.
+
+    Setiap barang menempati satu posisi pada kolom ``array``/list (bukan
+    dict per baris). Indeks hash ``id -> posisi`` dan ``kode -> posisi``
+    membuat pencarian O(1), sedangkan ``_order`` menyimpan posisi terurut
+    (nama, id) untuk daftar pilihan dan pencarian awalan nama. Posisi
+    barang yang dihapus dipakai ulang.
+
+    ``refresh()`` membaca ``change_log`` lewat ``ChangeFeed`` sendiri: tanpa
+    commit baru biayanya satu ``PRAGMA data_version``, dan hanya barang yang
+    berubah yang dibaca ulang. Katalog dimuat penuh saat pertama dipakai
+    atau bila ``change_log`` sudah terpangkas melewati posisi terakhir.
+    """
+
+    def __init__(self, database: "Database") -> None:
+        self.database = database
+        self._feed = ChangeFeed(database)
+        self._lock = threading.RLock()
+        self._seq: Optional[int] = None
+        # Naik setiap kali isi katalog berubah.
+        self.version = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        self._ids = array("q")
+        self._codes: List[Optional[str]] = []
+        self._names: List[Optional[str]] = []
+        self._free: List[int] = []
+        self._by_id: Dict[int, int] = {}
+        self._by_code: Dict[str, int] = {}
+        self._order = array("q")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._by_id)
+
+    def __contains__(self, item_id: object) -> bool:
+        with self._lock:
+            return item_id in self._by_id
+
+    def get(self, item_id: int) -> Optional[Tuple[int, str, str]]:
+        """``(id, kode, nama)`` barang atau ``None``."""
+
+        with self._lock:
+            pos = self._by_id.get(item_id)
+            return None if pos is None else (item_id, self._codes[pos], self._names[pos])
+
+    def id_for_code(self, item_code: str) -> Optional[int]:
+        with self._lock:
+            pos = self._by_code.get(item_code)
+            return None if pos is None else self._ids[pos]
+
+    def iter_sorted(self) -> Iterator[Tuple[int, str, str]]:
+        """``(id, kode, nama)`` seluruh barang, urut nama."""
+
+        with self._lock:
+            rows = [(self._ids[pos], self._codes[pos], self._names[pos]) for pos in self._order]
+        return iter(rows)
+
+    def search_name(self, prefix: str, limit: int = 20) -> List[Tuple[int, str, str]]:
+        """Barang yang namanya diawali ``prefix`` (peka huruf besar/kecil), urut nama."""
+
+        with self._lock:
+            start = bisect.bisect_left(self._order, (prefix,), key=self._sort_key)
+            rows = []
+            for pos in self._order[start:start + limit]:
+                if not self._names[pos].startswith(prefix):
+                    break
+                rows.append((self._ids[pos], self._codes[pos], self._names[pos]))
+        return rows
+
+    def options(self) -> List[str]:
+        """Label ``"kode - nama"`` urut nama untuk combo barang.
+
+        Label dibuat setiap kali dipanggil dan tidak disimpan; bandingkan
+        ``version`` untuk melewati pembaruan widget bila katalog tidak berubah.
+        """
+
+        with self._lock:
+            return [f"{self._codes[pos]} - {self._names[pos]}" for pos in self._order]
+
+    def refresh(self) -> bool:
+        """Sinkronkan dengan database; kembalikan ``True`` bila isi katalog berubah."""
+
+        with self._lock:
+            if self._seq is None:
+                self._reload()
+                return True
+            result = self._feed.poll(self._seq)
+            if result is None:
+                return False
+            self._seq = result["seq"]
+            items = result["changes"].get("items")
+            if items is None:
+                return False
+            if result["overflow"]:
+                self._reload()
+                return True
+            return self._apply(set().union(*items.values()))
+
+    def close(self) -> None:
+        with self._lock:
+            self._feed.close()
+            self._seq = None
+            self._reset()
+
+    def _reload(self) -> None:
+        # Posisi change_log dibaca sebelum barang: perubahan di antaranya
+        # akan diputar ulang pada refresh berikutnya (aman karena idempoten).
+        self._seq = self._feed.latest_seq()
+        self._reset()
+        with self.database.connection() as conn:
+            for pos, (item_id, code, name) in enumerate(
+                conn.execute(CATALOG_QUERY + " ORDER BY item_name, id")
+            ):
+                self._ids.append(item_id)
+                self._codes.append(code)
+                self._names.append(name)
+                self._by_id[item_id] = pos
+                self._by_code[code] = pos
+                self._order.append(pos)
+        self.version += 1
+
+    def _apply(self, item_ids: Iterable[int]) -> bool:
+        item_ids = list(item_ids)
+        current: Dict[int, Tuple[str, str]] = {}
+        with self.database.connection() as conn:
+            for offset in range(0, len(item_ids), FETCH_CHUNK):
+                chunk = item_ids[offset:offset + FETCH_CHUNK]
+                placeholders = ", ".join("?" * len(chunk))
+                for item_id, code, name in conn.execute(f"{CATALOG_QUERY} WHERE id IN ({placeholders})", chunk):
+                    current[item_id] = (code, name)
+
+        changed = False
+        for item_id in item_ids:
+            row = current.get(item_id)
+            pos = self._by_id.get(item_id)
+            if row is None:
+                if pos is not None:
+                    self._remove(pos)
+                    changed = True
+            elif pos is None or (self._codes[pos], self._names[pos]) != row:
+                if pos is not None:
+                    self._remove(pos)
+                self._insert(item_id, *row)
+                changed = True
+        if changed:
+            self.version += 1
+        return changed
+
+    def _sort_key(self, pos: int) -> Tuple[str, int]:
+        return self._names[pos], self._ids[pos]
+
+    def _insert(self, item_id: int, code: str, name: str) -> None:
+        if self._free:
+            pos = self._free.pop()
+            self._ids[pos] = item_id
+            self._codes[pos] = code
+            self._names[pos] = name
+        else:
+            pos = len(self._ids)
+            self._ids.append(item_id)
+            self._codes.append(code)
+            self._names.append(name)
+        self._by_id[item_id] = pos
+        self._by_code[code] = pos
+        bisect.insort(self._order, pos, key=self._sort_key)
+
+    def _remove(self, pos: int) -> None:
+        idx = bisect.bisect_left(self._order, self._sort_key(pos), key=self._sort_key)
+        del self._order[idx]
+        del self._by_id[self._ids[pos]]
+        if self._by_code.get(self._codes[pos]) == pos:
+            del self._by_code[self._codes[pos]]
+        self._codes[pos] = None
+        self._names[pos] = None
+        self._free.append(pos)
@@ -0,0 +1,310 @@
+"""Impor massal data barang dari CSV/XLSX dengan upsert pada ``item_code``."""
+
+from __future__ import annotations
+
+import csv
+import re
+import sqlite3
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Nama kolom yang dikenali (tanpa membedakan huruf besar/kecil). Header
+# hasil "Export Excel" (Kode, Nama, ...) juga diterima agar file ekspor bisa
+# diimpor kembali.
+COLUMN_ALIASES = {
+    "item_code": ("item_code", "kode", "kode barang"),
+    "item_name": ("item_name", "nama", "nama barang"),
+    "category": ("category", "kategori"),
+    "stock": ("stock", "stok"),
+    "purchase_price": ("purchase_price", "harga beli"),
+    "selling_price": ("selling_price", "harga jual"),
+    "supplier": ("supplier", "pemasok", "supplier_name"),
+}
+REJECT_REASON = "Alasan Ditolak"
+
+# Angka teks mengikuti format Indonesia (titik ribuan, koma desimal):
+# "15.000" dan "15.000,50". Ribuan berkoma hanya diterima bila tidak
+# mungkin dibaca sebagai desimal ("1,234,567" atau "1,234.50").
+_GROUPED_DOT = re.compile(r"\d{1,3}(?:\.\d{3})+(?:,\d+)?")
+_GROUPED_COMMA = re.compile(r"\d{1,3}(?:,\d{3})+\.\d+|\d{1,3}(?:,\d{3}){2,}")
+# "15,000" bisa 15 (desimal) atau 15000 (ribuan gaya Inggris).
+_AMBIGUOUS_COMMA = re.compile(r"[1-9]\d{0,2},\d{3}")
+_PLAIN = re.compile(r"\d+(?:[.,]\d+)?")
+
+# Dipanggil dengan jumlah baris yang sudah diproses.
+ImportProgress = Callable[[int], None]
+
+# Baris satu chunk ditampung dulu di tabel sementara lalu di-upsert dengan
+# satu pernyataan INSERT ... SELECT. Trigger FTS5 pada ``items`` jauh lebih
+# murah dijalankan dalam satu pernyataan dibanding satu pernyataan per baris
+# (executemany), karena FTS5 menulis segmen baru pada setiap savepoint
+# pernyataan.
+STAGE_SQL = """
+    CREATE TEMP TABLE IF NOT EXISTS item_import_stage (
+        item_code TEXT PRIMARY KEY, item_name TEXT, category_id INTEGER, stock INTEGER,
+        purchase_price REAL, selling_price REAL, supplier_id INTEGER
+    )
+"""
+STAGE_INSERT_SQL = (
+    "INSERT OR REPLACE INTO temp.item_import_stage "
+    "VALUES (:item_code, :item_name, :category_id, :stock, :purchase_price, :selling_price, :supplier_id)"
+)
+# Baris yang isinya tidak berubah dilewati sehingga trigger FTS dan ringkasan
+# tidak ikut berjalan saat katalog yang sama diimpor ulang.
+UPSERT_SQL = """
+    INSERT INTO items (item_code, item_name, category_id, stock, purchase_price, selling_price, supplier_id)
+    SELECT item_code, item_name, category_id, IFNULL(stock, 0), purchase_price, selling_price, supplier_id
+    FROM temp.item_import_stage WHERE true
+    ON CONFLICT(item_code) DO UPDATE SET
+        item_name = excluded.item_name,
+        category_id = IFNULL(excluded.category_id, items.category_id),
+        stock = IFNULL((SELECT stock FROM temp.item_import_stage WHERE item_code = excluded.item_code), items.stock),
+        purchase_price = excluded.purchase_price,
+        selling_price = excluded.selling_price,
+        supplier_id = IFNULL(excluded.supplier_id, items.supplier_id)
+    WHERE items.item_name IS NOT excluded.item_name
+        OR items.category_id IS NOT IFNULL(excluded.category_id, items.category_id)
+        OR items.purchase_price IS NOT excluded.purchase_price
+        OR items.selling_price IS NOT excluded.selling_price
+        OR items.supplier_id IS NOT IFNULL(excluded.supplier_id, items.supplier_id)
+        OR items.stock IS NOT IFNULL((SELECT stock FROM temp.item_import_stage WHERE item_code = excluded.item_code), items.stock)
+"""
+
+
+def _read_csv(path: Path) -> Iterator[Sequence[object]]:
+    with path.open(newline="", encoding="utf-8-sig") as handle:
+        sample = handle.read(4096)
+        handle.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        yield from csv.reader(handle, dialect)
+
+
+def _read_xlsx(path: Path) -> Iterator[Sequence[object]]:
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield from wb.worksheets[0].iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+def read_rows(path: Path) -> Iterator[Sequence[object]]:
+    """Baca baris mentah (termasuk header) dari CSV atau XLSX secara streaming."""
+
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return _read_csv(path)
+    if suffix in (".xlsx", ".xlsm"):
+        return _read_xlsx(path)
+    raise ValueError(f"Format file tidak didukung: {path.suffix}")
+
+
+def _text(value: object) -> str:
+    return "" if value is None else str(value).strip()
+
+
+def _parse_decimal(text: str, label: str) -> float:
+    body = text.replace(" ", "")
+    if body[:2].lower() == "rp":
+        body = body[2:]
+    sign = ""
+    if body.startswith("-"):
+        sign, body = "-", body[1:]
+    if _GROUPED_DOT.fullmatch(body):
+        return float(sign + body.replace(".", "").replace(",", "."))
+    if _GROUPED_COMMA.fullmatch(body):
+        return float(sign + body.replace(",", ""))
+    if _AMBIGUOUS_COMMA.fullmatch(body):
+        raise ValueError(f"{label} ambigu: {text} (tulis ribuan dengan titik, misalnya 15.000)")
+    if _PLAIN.fullmatch(body):
+        return float(sign + body.replace(",", "."))
+    raise ValueError(f"{label} bukan angka: {text}")
+
+
+def _number(value: object, label: str, integer: bool = False) -> Optional[float]:
+    text = _text(value)
+    if not text:
+        return None
+    number = float(value) if isinstance(value, (int, float)) else _parse_decimal(text, label)
+    if number < 0:
+        raise ValueError(f"{label} tidak boleh negatif")
+    if integer:
+        if not number.is_integer():
+            raise ValueError(f"{label} harus bilangan bulat")
+        return int(number)
+    return number
+
+
+class ItemImporter:
+    """Impor barang (beserta kategori dan pemasok baru) dalam transaksi per chunk.
+
+    Nama kategori dan pemasok diselesaikan ke id lewat peta di memori yang
+    dimuat sekali; nama yang belum ada dibuat di chunk tempat ia pertama
+    muncul. Baris yang tidak valid ditulis ke file penolakan (CSV) bersama
+    alasannya, dan baris lain tetap diimpor.
+    """
+
+    def __init__(self, database: "Database", chunk_size: int = 5000) -> None:
+        self.database = database
+        self.chunk_size = chunk_size
+
+    def import_file(
+        self,
+        source: str | Path,
+        reject_path: str | Path | None = None,
+        progress: Optional[ImportProgress] = None,
+    ) -> Dict[str, object]:
+        """Impor ``source`` dan kembalikan ringkasan jumlah baris.
+
+        Hasil: ``inserted``, ``updated`` (hanya barang yang isinya berubah),
+        ``rejected`` dan ``reject_file``
+        (``None`` bila tidak ada baris yang ditolak). Secara bawaan file
+        penolakan ditulis di samping sumber sebagai ``<nama>_ditolak.csv``.
+        """
+
+        source = Path(source)
+        rows = iter(read_rows(source))
+        header = next(rows, None)
+        if header is None:
+            raise ValueError("File impor kosong")
+        columns = self._map_columns(header)
+        if reject_path is None:
+            reject_path = source.with_name(f"{source.stem}_ditolak.csv")
+        reject_path = Path(reject_path)
+
+        categories, suppliers = self._load_lookups()
+        result = {"inserted": 0, "updated": 0, "rejected": 0, "reject_file": None}
+        reject_writer = None
+        reject_handle = None
+        processed = 0
+        line_no = 1
+        try:
+            while True:
+                chunk = list(islice(rows, self.chunk_size))
+                if not chunk:
+                    break
+                valid: List[Dict[str, object]] = []
+                for raw in chunk:
+                    line_no += 1
+                    if not any(_text(value) for value in raw):
+                        continue
+                    try:
+                        valid.append(self._parse(raw, columns))
+                    except ValueError as exc:
+                        if reject_writer is None:
+                            reject_handle = reject_path.open("w", newline="", encoding="utf-8")
+                            reject_writer = csv.writer(reject_handle)
+                            reject_writer.writerow(["Baris", *[_text(value) for value in header], REJECT_REASON])
+                        reject_writer.writerow([line_no, *["" if value is None else value for value in raw], str(exc)])
+                        result["rejected"] += 1
+                if valid:
+                    inserted, updated, new_categories, new_suppliers = self.database.write(
+                        lambda conn: self._upsert_chunk(conn, valid, categories, suppliers)
+                    )
+                    categories.update(new_categories)
+                    suppliers.update(new_suppliers)
+                    result["inserted"] += inserted
+                    result["updated"] += updated
+                processed += len(chunk)
+                if progress is not None:
+                    progress(processed)
+        finally:
+            if reject_handle is not None:
+                reject_handle.close()
+        if result["rejected"]:
+            result["reject_file"] = reject_path.as_posix()
+        return result
+
+    def _map_columns(self, header: Sequence[object]) -> Dict[str, int]:
+        names = [_text(value).lower() for value in header]
+        columns: Dict[str, int] = {}
+        for field, aliases in COLUMN_ALIASES.items():
+            for idx, name in enumerate(names):
+                if name in aliases:
+                    columns[field] = idx
+                    break
+        missing = [field for field in ("item_code", "item_name") if field not in columns]
+        if missing:
+            raise ValueError(f"Kolom wajib tidak ditemukan: {', '.join(missing)}")
+        return columns
+
+    def _parse(self, raw: Sequence[object], columns: Dict[str, int]) -> Dict[str, object]:
+        def cell(field: str) -> object:
+            idx = columns.get(field)
+            return raw[idx] if idx is not None and idx < len(raw) else None
+
+        code = _text(cell("item_code"))
+        name = _text(cell("item_name"))
+        if not code or not name:
+            raise ValueError("Kode dan nama barang wajib diisi")
+        category = _text(cell("category"))
+        supplier = _text(cell("supplier"))
+        return {
+            "item_code": code,
+            "item_name": name,
+            "category": "" if category == "-" else category,
+            "supplier": "" if supplier == "-" else supplier,
+            "stock": _number(cell("stock"), "Stok", integer=True),
+            "purchase_price": _number(cell("purchase_price"), "Harga beli") or 0.0,
+            "selling_price": _number(cell("selling_price"), "Harga jual") or 0.0,
+        }
+
+    def _load_lookups(self) -> Tuple[Dict[str, int], Dict[str, int]]:
+        cache = self.database.reference_cache
+        categories = {row["name"].casefold(): row["id"] for row in cache.categories()}
+        suppliers: Dict[str, int] = {}
+        for row in sorted(cache.suppliers(), key=lambda row: row["id"]):
+            suppliers.setdefault(row["supplier_name"].casefold(), row["id"])
+        return categories, suppliers
+
+    def _upsert_chunk(
+        self,
+        conn: sqlite3.Connection,
+        rows: List[Dict[str, object]],
+        categories: Dict[str, int],
+        suppliers: Dict[str, int],
+    ) -> Tuple[int, int, Dict[str, int], Dict[str, int]]:
+        """Tulis satu chunk dan kembalikan jumlah baris baru/diubah serta id baru.
+
+        Peta ``categories``/``suppliers`` tidak diubah di sini agar tetap
+        benar bila transaksi dibatalkan atau diulang.
+        """
+
+        new_categories: Dict[str, int] = {}
+        new_suppliers: Dict[str, int] = {}
+        for row in rows:
+            category = row["category"]
+            key = category.casefold()
+            if category and key not in categories and key not in new_categories:
+                conn.execute("INSERT OR IGNORE INTO categories (name) VALUES (?)", (category,))
+                new_categories[key] = conn.execute(
+                    "SELECT id FROM categories WHERE name = ?", (category,)
+                ).fetchone()[0]
+            row["category_id"] = categories.get(key) or new_categories.get(key)
+
+            supplier = row["supplier"]
+            key = supplier.casefold()
+            if supplier and key not in suppliers and key not in new_suppliers:
+                new_suppliers[key] = conn.execute(
+                    "INSERT INTO suppliers (supplier_name) VALUES (?)", (supplier,)
+                ).lastrowid
+            row["supplier_id"] = suppliers.get(key) or new_suppliers.get(key)
+
+        conn.execute(STAGE_SQL)
+        conn.execute("DELETE FROM temp.item_import_stage")
+        conn.executemany(STAGE_INSERT_SQL, rows)
+        staged, existing = conn.execute(
+            "SELECT COUNT(*), COUNT(items.id) FROM temp.item_import_stage "
+            "LEFT JOIN items USING (item_code)"
+        ).fetchone()
+        # rowcount upsert tidak menghitung baris yang dilewati karena tidak
+        # berubah (dan tidak menghitung perubahan oleh trigger).
+        changed = conn.execute(UPSERT_SQL).rowcount
+        conn.execute("DELETE FROM temp.item_import_stage")
+        inserted = staged - existing
+        return inserted, changed - inserted, new_categories, new_suppliers
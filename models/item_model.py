@@ -2,7 +2,48 @@
 
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+import re
+import sqlite3
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+ItemKey = Tuple[str, int]
+
+ITEM_COLUMNS = (
+    "SELECT items.id, item_code, item_name, stock, purchase_price, selling_price, "
+    "IFNULL(categories.name, '-') AS category, IFNULL(suppliers.supplier_name, '-') AS supplier "
+)
+ITEM_JOINS = (
+    "LEFT JOIN categories ON categories.id = items.category_id "
+    "LEFT JOIN suppliers ON suppliers.id = items.supplier_id "
+)
+
+# Peringkat grafik dashboard -> ekspresi ORDER BY (None: dihitung dari transaksi).
+RANKINGS = {"stock": "stock", "value": "stock * purchase_price", "movement": None}
+# Barang yang bergerak sejak tanggal tertentu, n teratas/terbawah.
+MOVED_SQL = """
+    SELECT items.id, item_name, stock, stock * purchase_price AS value, movement.moved
+    FROM (
+        SELECT item_id, SUM(quantity) AS moved
+        FROM transactions INDEXED BY idx_transactions_date_item
+        WHERE transaction_date >= ?
+        GROUP BY item_id
+        ORDER BY moved {direction}, item_id
+        LIMIT ?
+    ) AS movement
+    JOIN items ON items.id = movement.item_id
+    ORDER BY movement.moved {direction}, item_name
+"""
+# Barang tanpa transaksi sejak tanggal tertentu (pergerakan 0).
+UNMOVED_SQL = """
+    SELECT id, item_name, stock, stock * purchase_price AS value, 0 AS moved
+    FROM items
+    WHERE id NOT IN (
+        SELECT item_id FROM transactions INDEXED BY idx_transactions_date_item WHERE transaction_date >= ?
+    )
+    ORDER BY item_name
+    LIMIT ?
+"""
 
 
 class ItemModel:
@@ -10,19 +51,23 @@ class ItemModel:
 
     def __init__(self, database: "Database") -> None:
         self.database = database
+        self._fts_available: Optional[bool] = None
 
     def get_all(self, keyword: str = "") -> List[dict]:
-        """Ambil semua barang dengan opsi pencarian."""
+        """Ambil semua barang dengan opsi pencarian.
 
-        conn = self.database.get_connection()
-        cursor = conn.cursor()
-        query = (
-            "SELECT items.id, item_code, item_name, stock, purchase_price, selling_price, "
-            "IFNULL(categories.name, '-') AS category, IFNULL(suppliers.supplier_name, '-') AS supplier "
-            "FROM items "
-            "LEFT JOIN categories ON categories.id = items.category_id "
-            "LEFT JOIN suppliers ON suppliers.id = items.supplier_id "
-        )
+        Bila indeks FTS5 tersedia, hasil pencarian diurutkan berdasarkan
+        relevansi; jika tidak (atau kata kunci kurang dari 3 karakter, yang
+        tidak bisa dilayani trigram), pencarian memakai LIKE seperti semula.
+        """
+
+        if len(keyword.strip()) >= 3 and self._has_fts():
+            try:
+                return self._search_fts(keyword)
+            except sqlite3.OperationalError:
+                self._fts_available = False
+
+        query = ITEM_COLUMNS + "FROM items " + ITEM_JOINS
         params = []
         if keyword:
             query += (
@@ -31,106 +76,297 @@ class ItemModel:
             like = f"%{keyword}%"
             params = [like, like, like]
         query += "ORDER BY item_name"
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        conn.close()
+        with self.database.connection() as conn:
+            rows = conn.execute(query, params).fetchall()
         return [dict(row) for row in rows]
 
-    def get_by_id(self, item_id: int) -> Optional[dict]:
-        conn = self.database.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT * FROM items WHERE id = ?",
-            (item_id,),
+    def iter_all(self, batch_size: int = 1000) -> Iterator[dict]:
+        """Alirkan seluruh barang (urut nama) per batch ``fetchmany``."""
+
+        with self.database.connection() as conn:
+            cursor = conn.execute(ITEM_COLUMNS + "FROM items " + ITEM_JOINS + "ORDER BY item_name")
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield dict(row)
+            finally:
+                cursor.close()
+
+    def _has_fts(self) -> bool:
+        if self._fts_available is None:
+            with self.database.connection() as conn:
+                row = conn.execute(
+                    "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' "
+                    "AND name IN ('items_fts', 'items_fts_trigram')"
+                ).fetchone()
+            self._fts_available = row[0] == 2
+        return self._fts_available
+
+    def _search_fts(self, keyword: str) -> List[dict]:
+        """Cari barang via FTS5: cocok awal kata dulu, lalu substring (trigram)."""
+
+        tokens = re.findall(r"\w+", keyword)
+        branches = []
+        params: List[str] = []
+        if tokens:
+            branches.append(
+                "SELECT rowid AS id, rank AS score FROM items_fts WHERE items_fts MATCH ?"
+            )
+            params.append(" ".join(f'"{token}"*' for token in tokens))
+        # Trigram mencocokkan substring, setara LIKE '%kw%'; diberi penalti
+        # agar selalu berada di bawah hasil prefix.
+        branches.append(
+            "SELECT rowid AS id, 1000000.0 + rank AS score "
+            "FROM items_fts_trigram WHERE items_fts_trigram MATCH ?"
+        )
+        params.append('"{}"'.format(keyword.strip().replace('"', '""')))
+
+        query = (
+            "WITH hits AS (" + " UNION ALL ".join(branches) + "), "
+            "ranked AS (SELECT id, MIN(score) AS score FROM hits GROUP BY id) "
+            + ITEM_COLUMNS
+            + "FROM ranked JOIN items ON items.id = ranked.id "
+            + ITEM_JOINS
+            + "ORDER BY ranked.score, item_name"
+        )
+        with self.database.connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def _keyword_filter(self, keyword: str) -> Tuple[str, List[str]]:
+        """Bangun klausa WHERE pencarian (FTS5 bila ada, LIKE bila tidak)."""
+
+        keyword = keyword.strip()
+        if not keyword:
+            return "", []
+        if len(keyword) >= 3 and self._has_fts():
+            tokens = re.findall(r"\w+", keyword)
+            subqueries = ["SELECT rowid FROM items_fts_trigram WHERE items_fts_trigram MATCH ?"]
+            params = ['"{}"'.format(keyword.replace('"', '""'))]
+            if tokens:
+                subqueries.append("SELECT rowid FROM items_fts WHERE items_fts MATCH ?")
+                params.append(" ".join(f'"{token}"*' for token in tokens))
+            return "items.id IN (" + " UNION ".join(subqueries) + ")", params
+        like = f"%{keyword}%"
+        return (
+            "(item_code LIKE ? OR item_name LIKE ? OR IFNULL(categories.name, '') LIKE ?)",
+            [like, like, like],
         )
-        row = cursor.fetchone()
-        conn.close()
+
+    def get_page(
+        self,
+        keyword: str = "",
+        after: Optional[ItemKey] = None,
+        limit: int = 100,
+        with_total: bool = True,
+    ) -> dict:
+        """Ambil satu halaman barang dengan keyset pagination atas (item_name, id).
+
+        ``after`` adalah kunci baris terakhir halaman sebelumnya; ``None``
+        berarti halaman pertama. Hasil berisi ``items``, ``next_key`` (kunci
+        untuk halaman berikutnya atau ``None`` bila habis) dan ``total``
+        (jumlah seluruh baris yang cocok, hanya bila ``with_total``).
+        """
+
+        where, params = self._keyword_filter(keyword)
+        conditions = [where] if where else []
+        page_params: List[object] = list(params)
+        if after is not None:
+            conditions.append("(item_name, items.id) > (?, ?)")
+            page_params.extend(after)
+        query = ITEM_COLUMNS + "FROM items " + ITEM_JOINS
+        if conditions:
+            query += "WHERE " + " AND ".join(conditions) + " "
+        query += "ORDER BY item_name, items.id LIMIT ?"
+        page_params.append(limit)
+
+        with self.database.connection() as conn:
+            rows = conn.execute(query, page_params).fetchall()
+            total = None
+            if with_total:
+                total = self._count(conn, where, params)
+        items = [dict(row) for row in rows]
+        next_key = None
+        if len(items) == limit:
+            next_key = (items[-1]["item_name"], items[-1]["id"])
+        return {"items": items, "next_key": next_key, "total": total}
+
+    def get_key_at(self, offset: int, keyword: str = "") -> Optional[ItemKey]:
+        """Kunci (item_name, id) pada posisi ``offset`` untuk melompat ke tengah daftar.
+
+        Tanpa kata kunci query ini hanya membaca covering index idx_items_name.
+        """
+
+        where, params = self._keyword_filter(keyword)
+        query = "SELECT item_name, items.id FROM items "
+        if where:
+            query += ITEM_JOINS + "WHERE " + where + " "
+        query += "ORDER BY item_name, items.id LIMIT 1 OFFSET ?"
+        with self.database.connection() as conn:
+            row = conn.execute(query, [*params, offset]).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def count(self, keyword: str = "") -> int:
+        where, params = self._keyword_filter(keyword)
+        with self.database.connection() as conn:
+            return self._count(conn, where, params)
+
+    def _count(self, conn: sqlite3.Connection, where: str, params: List[str]) -> int:
+        if not where:
+            return conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+        return conn.execute(
+            "SELECT COUNT(*) FROM items "
+            "LEFT JOIN categories ON categories.id = items.category_id "
+            "WHERE " + where,
+            params,
+        ).fetchone()[0]
+
+    def get_by_id(self, item_id: int) -> Optional[dict]:
+        with self.database.connection() as conn:
+            row = conn.execute(
+                "SELECT * FROM items WHERE id = ?",
+                (item_id,),
+            ).fetchone()
         return dict(row) if row else None
 
     def create(self, data: Dict[str, object]) -> None:
-        conn = self.database.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO items (item_code, item_name, category_id, stock, purchase_price, selling_price, supplier_id)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                data["item_code"],
-                data["item_name"],
-                data.get("category_id"),
-                data.get("stock", 0),
-                data.get("purchase_price", 0.0),
-                data.get("selling_price", 0.0),
-                data.get("supplier_id"),
-            ),
-        )
-        conn.commit()
-        conn.close()
+        with self.database.transaction() as conn:
+            conn.execute(
+                """
+                INSERT INTO items (item_code, item_name, category_id, stock, purchase_price, selling_price, supplier_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    data["item_code"],
+                    data["item_name"],
+                    data.get("category_id"),
+                    data.get("stock", 0),
+                    data.get("purchase_price", 0.0),
+                    data.get("selling_price", 0.0),
+                    data.get("supplier_id"),
+                ),
+            )
 
     def update(self, item_id: int, data: Dict[str, object]) -> None:
-        conn = self.database.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            UPDATE items
-            SET item_code = ?, item_name = ?, category_id = ?, stock = ?, purchase_price = ?, selling_price = ?, supplier_id = ?
-            WHERE id = ?
-            """,
-            (
-                data["item_code"],
-                data["item_name"],
-                data.get("category_id"),
-                data.get("stock", 0),
-                data.get("purchase_price", 0.0),
-                data.get("selling_price", 0.0),
-                data.get("supplier_id"),
-                item_id,
-            ),
-        )
-        conn.commit()
-        conn.close()
+        with self.database.transaction() as conn:
+            conn.execute(
+                """
+                UPDATE items
+                SET item_code = ?, item_name = ?, category_id = ?, stock = ?, purchase_price = ?, selling_price = ?, supplier_id = ?
+                WHERE id = ?
+                """,
+                (
+                    data["item_code"],
+                    data["item_name"],
+                    data.get("category_id"),
+                    data.get("stock", 0),
+                    data.get("purchase_price", 0.0),
+                    data.get("selling_price", 0.0),
+                    data.get("supplier_id"),
+                    item_id,
+                ),
+            )
 
     def delete(self, item_id: int) -> None:
-        conn = self.database.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM items WHERE id = ?", (item_id,))
-        conn.commit()
-        conn.close()
+        with self.database.transaction() as conn:
+            conn.execute("DELETE FROM items WHERE id = ?", (item_id,))
 
     def adjust_stock(self, item_id: int, quantity: int, transaction_type: str) -> None:
-        conn = self.database.get_connection()
-        cursor = conn.cursor()
-        if transaction_type == "IN":
-            cursor.execute("UPDATE items SET stock = stock + ? WHERE id = ?", (quantity, item_id))
-        else:
-            cursor.execute("UPDATE items SET stock = stock - ? WHERE id = ?", (quantity, item_id))
-        conn.commit()
-        conn.close()
+        with self.database.transaction() as conn:
+            if transaction_type == "IN":
+                conn.execute("UPDATE items SET stock = stock + ? WHERE id = ?", (quantity, item_id))
+            else:
+                conn.execute("UPDATE items SET stock = stock - ? WHERE id = ?", (quantity, item_id))
 
     def get_stock_summary(self) -> dict:
-        """Ringkasan stok untuk dashboard."""
-
-        conn = self.database.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) AS total_barang, SUM(stock) AS total_stok FROM items")
-        summary = cursor.fetchone()
-        cursor.execute(
-            "SELECT item_name, stock FROM items ORDER BY stock ASC LIMIT 5"
-        )
-        low_stock = cursor.fetchall()
-        conn.close()
+        """Ringkasan stok untuk dashboard.
+
+        Total dibaca dari ``inventory_summary`` (satu baris, dipelihara
+        trigger) dan daftar stok rendah dari indeks ``idx_items_stock``.
+        """
+
+        with self.database.connection() as conn:
+            summary = conn.execute(
+                "SELECT total_items, total_stock, inventory_value FROM inventory_summary WHERE id = 1"
+            ).fetchone()
+            low_stock = conn.execute(
+                "SELECT id, item_name, stock FROM items ORDER BY stock ASC LIMIT 5"
+            ).fetchall()
         return {
-            "total_items": summary["total_barang"] if summary else 0,
-            "total_stock": summary["total_stok"] if summary else 0,
+            "total_items": summary["total_items"] if summary else 0,
+            "total_stock": summary["total_stock"] if summary else 0,
+            "inventory_value": summary["inventory_value"] if summary else 0,
             "low_stock_items": [dict(row) for row in low_stock],
         }
 
-    def get_categories(self) -> List[dict]:
-        conn = self.database.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, name FROM categories ORDER BY name")
-        rows = cursor.fetchall()
-        conn.close()
+    def get_category_summary(self) -> List[dict]:
+        """Total barang, stok, dan nilai persediaan per kategori (dari ``category_summary``)."""
+
+        with self.database.connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT category_summary.category_id, IFNULL(categories.name, '-') AS category,
+                       total_items, total_stock, inventory_value
+                FROM category_summary
+                LEFT JOIN categories ON categories.id = category_summary.category_id
+                WHERE total_items > 0
+                ORDER BY category
+                """
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_ranked(
+        self,
+        ranking: str = "stock",
+        limit: int = 8,
+        descending: bool = False,
+        days: int = 30,
+    ) -> List[dict]:
+        """Top-N/bottom-N barang untuk grafik dashboard.
+
+        ``ranking``: ``"stock"`` (indeks idx_items_stock), ``"value"`` (stok x
+        harga beli, indeks ekspresi idx_items_value) atau ``"movement"``
+        (jumlah qty transaksi ``days`` hari terakhir; barang tanpa transaksi
+        bernilai 0 sehingga ikut muncul di bottom-N). Nilai lain memicu
+        ``ValueError``.
+        """
+
+        if ranking not in RANKINGS:
+            raise ValueError(f"Peringkat tidak dikenal: {ranking!r} (pilihan: {', '.join(RANKINGS)})")
+        direction = "DESC" if descending else "ASC"
+        with self.database.connection() as conn:
+            if ranking == "movement":
+                since = (date.today() - timedelta(days=days)).isoformat()
+                # Barang yang bergerak diperingkat dari sisi transaksi (rentang
+                # idx_transactions_date_item, LIMIT sebelum JOIN); barang tanpa
+                # transaksi (moved = 0) dibaca urut nama lewat idx_items_name
+                # hanya sebanyak yang dibutuhkan.
+                rows = self._movement_rows(conn, since, direction, limit, moved=descending)
+                if len(rows) < limit:
+                    rows += self._movement_rows(conn, since, direction, limit - len(rows), moved=not descending)
+            else:
+                order = RANKINGS[ranking]
+                rows = conn.execute(
+                    f"SELECT id, item_name, stock, stock * purchase_price AS value FROM items "
+                    f"ORDER BY {order} {direction} LIMIT ?",
+                    (limit,),
+                ).fetchall()
         return [dict(row) for row in rows]
 
+    @staticmethod
+    def _movement_rows(conn: sqlite3.Connection, since: str, direction: str, limit: int, moved: bool) -> list:
+        if moved:
+            return conn.execute(MOVED_SQL.format(direction=direction), (since, limit)).fetchall()
+        return conn.execute(UNMOVED_SQL, (since, limit)).fetchall()
+
+    def get_categories(self) -> List[dict]:
+        return self.database.reference_cache.categories()
+
+    def get_category_id(self, name: str) -> Optional[int]:
+        return self.database.reference_cache.category_id(name)
+
+    def get_category(self, category_id: Optional[int]) -> Optional[dict]:
+        return self.database.reference_cache.category(category_id)
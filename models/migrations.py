@@ -0,0 +1,435 @@
+"""Migrasi skema bertahap berbasis ``PRAGMA user_version``."""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import Callable, List, Sequence, Tuple, Union
+
+MigrationStep = Union[str, Callable[[sqlite3.Connection], None]]
+
+
+def _create_item_search(conn: sqlite3.Connection) -> None:
+    """Buat indeks FTS5 untuk pencarian barang beserta trigger sinkronisasi.
+
+    ``items_fts`` memakai tokenizer unicode61 dengan indeks prefix untuk
+    pencocokan awal kata (mis. kode parsial "BRG-00"), sedangkan
+    ``items_fts_trigram`` melayani pencarian substring seperti LIKE.
+    Bila SQLite tidak dikompilasi dengan FTS5, langkah ini dilewati dan
+    ``ItemModel`` kembali memakai LIKE.
+    """
+
+    try:
+        conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5("
+            "item_code, item_name, category, "
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        )
+        conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS items_fts_trigram USING fts5("
+            "item_code, item_name, category, tokenize = 'trigram')"
+        )
+    except sqlite3.OperationalError:
+        return
+
+    for table in ("items_fts", "items_fts_trigram"):
+        conn.execute(
+            f"""
+            INSERT INTO {table} (rowid, item_code, item_name, category)
+            SELECT items.id, item_code, item_name, IFNULL(categories.name, '')
+            FROM items
+            LEFT JOIN categories ON categories.id = items.category_id
+            """
+        )
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON items BEGIN
+                INSERT INTO {table} (rowid, item_code, item_name, category)
+                VALUES (
+                    new.id, new.item_code, new.item_name,
+                    IFNULL((SELECT name FROM categories WHERE id = new.category_id), '')
+                );
+            END
+            """
+        )
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_au
+            AFTER UPDATE OF item_code, item_name, category_id ON items BEGIN
+                DELETE FROM {table} WHERE rowid = old.id;
+                INSERT INTO {table} (rowid, item_code, item_name, category)
+                VALUES (
+                    new.id, new.item_code, new.item_name,
+                    IFNULL((SELECT name FROM categories WHERE id = new.category_id), '')
+                );
+            END
+            """
+        )
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON items BEGIN
+                DELETE FROM {table} WHERE rowid = old.id;
+            END
+            """
+        )
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_category_au
+            AFTER UPDATE OF name ON categories BEGIN
+                UPDATE {table} SET category = new.name
+                WHERE rowid IN (SELECT id FROM items WHERE category_id = new.id);
+            END
+            """
+        )
+
+
+def _create_inventory_summary(conn: sqlite3.Connection) -> None:
+    """Buat tabel ringkasan dashboard yang diperbarui trigger pada ``items``.
+
+    Perubahan stok dari transaksi juga berjalan lewat ``UPDATE items``,
+    sehingga trigger pada ``items`` sudah mencakup posting transaksi.
+    Kategori kosong disimpan dengan ``category_id = 0``.
+    """
+
+    # Impor lokal agar ``python -m models.summary`` tidak mengimpor modul itu dua kali.
+    from .summary import rebuild_summary
+
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS inventory_summary (
+            id INTEGER PRIMARY KEY CHECK(id = 1),
+            total_items INTEGER NOT NULL DEFAULT 0,
+            total_stock INTEGER NOT NULL DEFAULT 0,
+            inventory_value REAL NOT NULL DEFAULT 0
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS category_summary (
+            category_id INTEGER PRIMARY KEY,
+            total_items INTEGER NOT NULL DEFAULT 0,
+            total_stock INTEGER NOT NULL DEFAULT 0,
+            inventory_value REAL NOT NULL DEFAULT 0
+        )
+        """
+    )
+    rebuild_summary(conn)
+
+    add_new = """
+        UPDATE inventory_summary
+        SET total_items = total_items + 1,
+            total_stock = total_stock + new.stock,
+            inventory_value = inventory_value + new.stock * IFNULL(new.purchase_price, 0)
+        WHERE id = 1;
+        INSERT INTO category_summary (category_id, total_items, total_stock, inventory_value)
+        VALUES (IFNULL(new.category_id, 0), 1, new.stock, new.stock * IFNULL(new.purchase_price, 0))
+        ON CONFLICT(category_id) DO UPDATE SET
+            total_items = total_items + excluded.total_items,
+            total_stock = total_stock + excluded.total_stock,
+            inventory_value = inventory_value + excluded.inventory_value;
+    """
+    remove_old = """
+        UPDATE inventory_summary
+        SET total_items = total_items - 1,
+            total_stock = total_stock - old.stock,
+            inventory_value = inventory_value - old.stock * IFNULL(old.purchase_price, 0)
+        WHERE id = 1;
+        UPDATE category_summary
+        SET total_items = total_items - 1,
+            total_stock = total_stock - old.stock,
+            inventory_value = inventory_value - old.stock * IFNULL(old.purchase_price, 0)
+        WHERE category_id = IFNULL(old.category_id, 0);
+    """
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS items_summary_ai AFTER INSERT ON items BEGIN {add_new} END")
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS items_summary_ad AFTER DELETE ON items BEGIN {remove_old} END")
+    conn.execute(
+        "CREATE TRIGGER IF NOT EXISTS items_summary_au "
+        f"AFTER UPDATE OF stock, purchase_price, category_id ON items BEGIN {remove_old} {add_new} END"
+    )
+
+
+def _create_stock_snapshots(conn: sqlite3.Connection) -> None:
+    """Buat tabel snapshot saldo stok per barang per tanggal.
+
+    ``stock_snapshot_dates`` mencatat snapshot yang sudah lengkap, sedangkan
+    ``stock_snapshots`` menyimpan saldo akhir hari setiap barang (saldo nol
+    tidak disimpan). Transaksi
+    yang diposting mundur (tanggal <= snapshot) langsung mengoreksi saldo
+    snapshot lewat trigger sehingga snapshot tidak pernah basi.
+    """
+
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS stock_snapshot_dates (
+            snapshot_date TEXT PRIMARY KEY,
+            created_at TEXT NOT NULL DEFAULT (datetime('now'))
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS stock_snapshots (
+            item_id INTEGER NOT NULL REFERENCES items(id) ON DELETE CASCADE,
+            snapshot_date TEXT NOT NULL REFERENCES stock_snapshot_dates(snapshot_date) ON DELETE CASCADE,
+            stock INTEGER NOT NULL,
+            PRIMARY KEY (item_id, snapshot_date)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_stock_snapshots_date ON stock_snapshots(snapshot_date)")
+    _create_snapshot_triggers(conn)
+
+
+def _create_snapshot_triggers(conn: sqlite3.Connection) -> None:
+    """Trigger koreksi snapshot saat transaksi diposting, dihapus atau diubah.
+
+    Tanggal transaksi dipotong ke ``YYYY-MM-DD`` sebelum dibandingkan:
+    transaksi ``"2025-11-30 14:00"`` termasuk snapshot 2025-11-30.
+    """
+
+    # Saldo nol tidak disimpan, jadi koreksi memakai upsert: barang yang belum
+    # punya baris di snapshot mendapat baris baru.
+    apply = """
+        INSERT INTO stock_snapshots (item_id, snapshot_date, stock)
+        SELECT {row}.item_id, snapshot_date,
+               {sign}CASE {row}.transaction_type WHEN 'IN' THEN {row}.quantity ELSE -{row}.quantity END
+        FROM stock_snapshot_dates WHERE snapshot_date >= substr({row}.transaction_date, 1, 10)
+        ON CONFLICT(item_id, snapshot_date) DO UPDATE SET stock = stock + excluded.stock;
+    """
+    add_new = apply.format(sign="", row="new")
+    remove_old = apply.format(sign="-", row="old")
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS transactions_snapshot_ai AFTER INSERT ON transactions BEGIN {add_new} END")
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS transactions_snapshot_ad AFTER DELETE ON transactions BEGIN {remove_old} END")
+    conn.execute(
+        "CREATE TRIGGER IF NOT EXISTS transactions_snapshot_au "
+        "AFTER UPDATE OF transaction_date, item_id, quantity, transaction_type ON transactions "
+        f"BEGIN {remove_old} {add_new} END"
+    )
+
+
+def _create_reference_versions(conn: sqlite3.Connection) -> None:
+    """Penghitung perubahan per tabel referensi untuk ``ReferenceCache``."""
+
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS reference_versions ("
+        "name TEXT PRIMARY KEY, version INTEGER NOT NULL DEFAULT 0)"
+    )
+    for table in ("categories", "suppliers"):
+        conn.execute("INSERT OR IGNORE INTO reference_versions (name, version) VALUES (?, 0)", (table,))
+        for event, suffix in (("INSERT", "ai"), ("UPDATE", "au"), ("DELETE", "ad")):
+            conn.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {table}_version_{suffix} AFTER {event} ON {table} BEGIN "
+                f"UPDATE reference_versions SET version = version + 1 WHERE name = '{table}'; END"
+            )
+
+
+def _create_change_log(conn: sqlite3.Connection) -> None:
+    """Buat ``change_log``: umpan perubahan berurutan untuk sinkronisasi antar-stasiun.
+
+    Setiap insert/update/delete pada tabel yang ditampilkan mencatat satu
+    baris (tabel, id baris, operasi). ``seq`` AUTOINCREMENT tidak pernah
+    dipakai ulang walau baris lama dipangkas. Update barang yang mengubah
+    nama dicatat sebagai ``M`` karena urutan daftar barang ikut berubah.
+    """
+
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            op TEXT NOT NULL CHECK(op IN ('I', 'U', 'D', 'M'))
+        )
+        """
+    )
+    log = "INSERT INTO change_log (table_name, row_id, op) VALUES ('{table}', {row}.id, '{op}');"
+    for table in ("items", "transactions", "categories", "suppliers"):
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_changes_ai AFTER INSERT ON {table} BEGIN "
+            + log.format(table=table, row="new", op="I") + " END"
+        )
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_changes_ad AFTER DELETE ON {table} BEGIN "
+            + log.format(table=table, row="old", op="D") + " END"
+        )
+        if table == "items":
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS items_changes_au AFTER UPDATE ON items "
+                "WHEN old.item_name IS new.item_name BEGIN "
+                + log.format(table=table, row="new", op="U") + " END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS items_changes_am AFTER UPDATE ON items "
+                "WHEN old.item_name IS NOT new.item_name BEGIN "
+                + log.format(table=table, row="new", op="M") + " END"
+            )
+        else:
+            conn.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {table}_changes_au AFTER UPDATE ON {table} BEGIN "
+                + log.format(table=table, row="new", op="U") + " END"
+            )
+
+
+def _create_transaction_archives(conn: sqlite3.Connection) -> None:
+    """Daftar file arsip transaksi per tahun (lihat ``TransactionArchive``).
+
+    ``archived_before`` adalah tanggal batas pengarsipan saat tahun itu
+    terakhir diarsipkan; batas yang berlaku adalah nilai terbesarnya.
+    """
+
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS transaction_archives (
+            year INTEGER PRIMARY KEY,
+            file_name TEXT NOT NULL,
+            row_count INTEGER NOT NULL,
+            first_date TEXT,
+            last_date TEXT,
+            archived_before TEXT NOT NULL,
+            archived_at TEXT NOT NULL DEFAULT (datetime('now'))
+        )
+        """
+    )
+
+
+def _create_monthly_movements(conn: sqlite3.Connection) -> None:
+    """Buat rollup pergerakan barang per bulan yang diperbarui trigger pada ``transactions``.
+
+    Nilai masuk memakai harga beli dan nilai keluar memakai harga jual
+    barang saat transaksi diposting. Saat transaksi dihapus/diubah, nilai
+    dikurangi secara proporsional terhadap jumlah di bulan itu sehingga
+    perubahan harga di antaranya tidak membuat nilai negatif. Pengarsipan
+    melepas trigger ini, jadi rollup tetap memuat bulan yang sudah
+    diarsipkan. Database yang sudah punya arsip sebelum migrasi ini perlu
+    ``python -m models.movement_summary --repair`` untuk mengisi bulan arsip.
+    """
+
+    from .movement_summary import rebuild_movements
+
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS monthly_movements (
+            month TEXT NOT NULL,
+            item_id INTEGER NOT NULL REFERENCES items(id) ON DELETE CASCADE,
+            in_qty INTEGER NOT NULL DEFAULT 0,
+            out_qty INTEGER NOT NULL DEFAULT 0,
+            in_value REAL NOT NULL DEFAULT 0,
+            out_value REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (month, item_id)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_monthly_movements_item ON monthly_movements(item_id)")
+    rebuild_movements(conn)
+
+    add_new = """
+        INSERT INTO monthly_movements (month, item_id, in_qty, out_qty, in_value, out_value)
+        SELECT substr(new.transaction_date, 1, 7), new.item_id,
+               CASE new.transaction_type WHEN 'IN' THEN new.quantity ELSE 0 END,
+               CASE new.transaction_type WHEN 'OUT' THEN new.quantity ELSE 0 END,
+               CASE new.transaction_type WHEN 'IN' THEN new.quantity * IFNULL(purchase_price, 0) ELSE 0 END,
+               CASE new.transaction_type WHEN 'OUT' THEN new.quantity * IFNULL(selling_price, 0) ELSE 0 END
+        FROM items WHERE id = new.item_id
+        ON CONFLICT(month, item_id) DO UPDATE SET
+            in_qty = in_qty + excluded.in_qty,
+            out_qty = out_qty + excluded.out_qty,
+            in_value = in_value + excluded.in_value,
+            out_value = out_value + excluded.out_value;
+    """
+    remove_old = """
+        UPDATE monthly_movements SET
+            in_qty = in_qty - CASE old.transaction_type WHEN 'IN' THEN old.quantity ELSE 0 END,
+            out_qty = out_qty - CASE old.transaction_type WHEN 'OUT' THEN old.quantity ELSE 0 END,
+            in_value = CASE WHEN old.transaction_type = 'IN' AND in_qty > 0
+                THEN in_value - in_value * MIN(old.quantity, in_qty) / in_qty ELSE in_value END,
+            out_value = CASE WHEN old.transaction_type = 'OUT' AND out_qty > 0
+                THEN out_value - out_value * MIN(old.quantity, out_qty) / out_qty ELSE out_value END
+        WHERE month = substr(old.transaction_date, 1, 7) AND item_id = old.item_id;
+    """
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS transactions_movement_ai AFTER INSERT ON transactions BEGIN {add_new} END")
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS transactions_movement_ad AFTER DELETE ON transactions BEGIN {remove_old} END")
+    conn.execute(
+        "CREATE TRIGGER IF NOT EXISTS transactions_movement_au "
+        "AFTER UPDATE OF transaction_date, item_id, quantity, transaction_type ON transactions "
+        f"BEGIN {remove_old} {add_new} END"
+    )
+
+
+# Setiap migrasi berisi nomor versi dan daftar langkah (pernyataan SQL atau
+# fungsi yang menerima koneksi). Versi harus naik berurutan; migrasi yang
+# sudah diterapkan tidak boleh diubah lagi.
+MIGRATIONS: List[Tuple[int, Sequence[MigrationStep]]] = [
+    (
+        1,
+        (
+            # Riwayat & transaksi terbaru: ORDER BY transaction_date DESC, id DESC
+            "CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions(transaction_date)",
+            # JOIN transactions -> items dan ON DELETE CASCADE
+            "CREATE INDEX IF NOT EXISTS idx_transactions_item ON transactions(item_id)",
+            # Daftar barang: ORDER BY item_name
+            "CREATE INDEX IF NOT EXISTS idx_items_name ON items(item_name)",
+            # Stok rendah di dashboard (covering: stock, item_name)
+            "CREATE INDEX IF NOT EXISTS idx_items_stock ON items(stock, item_name)",
+        ),
+    ),
+    (2, (_create_item_search,)),
+    (3, (_create_inventory_summary,)),
+    (
+        4,
+        (
+            # Peringkat nilai persediaan: ORDER BY stock * purchase_price
+            "CREATE INDEX IF NOT EXISTS idx_items_value ON items(stock * purchase_price)",
+            # Pergerakan barang per rentang tanggal (covering)
+            "CREATE INDEX IF NOT EXISTS idx_transactions_date_item "
+            "ON transactions(transaction_date, item_id, quantity)",
+        ),
+    ),
+    (5, (_create_stock_snapshots,)),
+    (6, (_create_reference_versions,)),
+    (7, (_create_change_log,)),
+    (8, (_create_transaction_archives,)),
+    (9, (_create_monthly_movements,)),
+    (
+        10,
+        (
+            # Trigger snapshot versi 5 membandingkan tanggal berjam sebagai string.
+            "DROP TRIGGER IF EXISTS transactions_snapshot_ai",
+            "DROP TRIGGER IF EXISTS transactions_snapshot_ad",
+            "DROP TRIGGER IF EXISTS transactions_snapshot_au",
+            _create_snapshot_triggers,
+        ),
+    ),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Baca versi skema yang tersimpan di header database."""
+
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def apply_migrations(conn: sqlite3.Connection) -> int:
+    """Terapkan migrasi yang belum berjalan dan kembalikan jumlahnya.
+
+    Semua migrasi dijalankan di dalam satu transaksi sehingga kegagalan di
+    tengah jalan tidak meninggalkan skema setengah jadi.
+    """
+
+    current = get_schema_version(conn)
+    pending = [(version, statements) for version, statements in MIGRATIONS if version > current]
+    if not pending:
+        return 0
+
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+    for version, statements in pending:
+        for step in statements:
+            if callable(step):
+                step(conn)
+            else:
+                conn.execute(step)
+        conn.execute(f"PRAGMA user_version = {int(version)}")
+    conn.execute("ANALYZE")
+    return len(pending)
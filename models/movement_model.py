@@ -0,0 +1,137 @@
+"""Query rollup pergerakan barang per bulan (tabel ``monthly_movements``)."""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Iterator, List, Optional, Tuple
+
+from .transaction_archive import TransactionArchive
+
+TOTALS = (
+    "SUM(in_qty) AS in_qty, SUM(in_value) AS in_value, "
+    "SUM(out_qty) AS out_qty, SUM(out_value) AS out_value"
+)
+
+
+def _month(value: Optional[str]) -> Optional[str]:
+    """Ambil bagian ``YYYY-MM`` dari bulan atau tanggal ISO."""
+
+    if not value:
+        return None
+    month = value[:7]
+    date.fromisoformat(f"{month}-01")
+    return month
+
+
+def _shift_month(month: str, delta: int) -> str:
+    index = int(month[:4]) * 12 + int(month[5:7]) - 1 + delta
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+class MovementModel:
+    """Laporan pergerakan masuk/keluar per bulan, kategori dan barang.
+
+    Semua query membaca ``monthly_movements`` (satu baris per bulan per
+    barang yang bergerak), bukan tabel ``transactions``. Bulan berformat
+    ``YYYY-MM``; tanggal lengkap juga diterima dan dipotong ke bulannya.
+    """
+
+    def __init__(self, database: "Database") -> None:
+        self.database = database
+
+    def _range(self, start: Optional[str], end: Optional[str]) -> Tuple[str, list]:
+        conditions, params = [], []
+        start, end = _month(start), _month(end)
+        if start:
+            conditions.append("month >= ?")
+            params.append(start)
+        if end:
+            conditions.append("month <= ?")
+            params.append(end)
+        return (" WHERE " + " AND ".join(conditions) if conditions else ""), params
+
+    def get_monthly(self, start: Optional[str] = None, end: Optional[str] = None) -> List[dict]:
+        where, params = self._range(start, end)
+        with self.database.connection() as conn:
+            rows = conn.execute(
+                f"SELECT month, {TOTALS} FROM monthly_movements{where} GROUP BY month ORDER BY month",
+                params,
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_trend(self, months: int = 12, today: Optional[date] = None) -> List[dict]:
+        """Total per bulan untuk ``months`` bulan terakhir; bulan tanpa transaksi bernilai nol."""
+
+        last = (today or date.today()).isoformat()[:7]
+        first = _shift_month(last, 1 - months)
+        totals = {row["month"]: row for row in self.get_monthly(first, last)}
+        empty = {"in_qty": 0, "in_value": 0.0, "out_qty": 0, "out_value": 0.0}
+        return [
+            totals.get(month, {"month": month, **empty})
+            for month in (_shift_month(first, offset) for offset in range(months))
+        ]
+
+    def get_by_category(self, start: Optional[str] = None, end: Optional[str] = None) -> List[dict]:
+        where, params = self._range(start, end)
+        with self.database.connection() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT month, IFNULL(categories.name, '-') AS category, {TOTALS}
+                FROM monthly_movements
+                JOIN items ON items.id = monthly_movements.item_id
+                LEFT JOIN categories ON categories.id = items.category_id
+                {where}
+                GROUP BY month, items.category_id
+                ORDER BY month, category
+                """,
+                params,
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def iter_by_item(
+        self, start: Optional[str] = None, end: Optional[str] = None, batch_size: int = 1000
+    ) -> Iterator[dict]:
+        """Alirkan total per barang selama rentang, dari nilai keluar terbesar."""
+
+        where, params = self._range(start, end)
+        with self.database.connection() as conn:
+            cursor = conn.execute(
+                f"""
+                SELECT items.item_code, items.item_name, IFNULL(categories.name, '-') AS category, {TOTALS}
+                FROM monthly_movements
+                JOIN items ON items.id = monthly_movements.item_id
+                LEFT JOIN categories ON categories.id = items.category_id
+                {where}
+                GROUP BY monthly_movements.item_id
+                ORDER BY out_value DESC, items.item_name
+                """,
+                params,
+            )
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield dict(row)
+            finally:
+                cursor.close()
+
+    def rebuild(self) -> int:
+        """Hitung ulang seluruh rollup dari transaksi aktif dan arsip; kembalikan jumlah baris."""
+
+        from .movement_summary import rebuild_movements
+
+        conn = self.database.get_connection()
+        try:
+            source = TransactionArchive(self.database).attach_history(conn)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                count = rebuild_movements(conn, source)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        finally:
+            conn.close()
+        return count
@@ -0,0 +1,111 @@
+"""Rollup pergerakan barang per bulan yang dipelihara trigger, beserta pemeriksanya.
+
+Jalankan ``python -m models.movement_summary [--db data/inventori.db] [--repair]``
+untuk menghitung ulang jumlah masuk/keluar dari transaksi (termasuk arsip)
+dan melaporkan selisihnya.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+from typing import List
+
+# Satu baris per (bulan, barang). Nilai dihitung dari harga barang saat
+# rollup ditulis: harga beli untuk barang masuk, harga jual untuk keluar.
+MOVEMENTS_SQL = """
+    SELECT substr(transactions.transaction_date, 1, 7) AS month, transactions.item_id,
+           SUM(CASE transactions.transaction_type WHEN 'IN' THEN quantity ELSE 0 END) AS in_qty,
+           SUM(CASE transactions.transaction_type WHEN 'OUT' THEN quantity ELSE 0 END) AS out_qty,
+           SUM(CASE transactions.transaction_type WHEN 'IN' THEN quantity ELSE 0 END)
+               * IFNULL(items.purchase_price, 0) AS in_value,
+           SUM(CASE transactions.transaction_type WHEN 'OUT' THEN quantity ELSE 0 END)
+               * IFNULL(items.selling_price, 0) AS out_value
+    FROM {source} AS transactions
+    JOIN items ON items.id = transactions.item_id
+    GROUP BY month, transactions.item_id
+"""
+
+
+def rebuild_movements(conn: sqlite3.Connection, source: str = "transactions") -> int:
+    """Hitung ulang ``monthly_movements`` dalam satu kali GROUP BY atas ``source``.
+
+    ``source`` adalah tabel/view transaksi, misalnya hasil
+    ``TransactionArchive.attach_history`` agar bulan yang sudah diarsipkan
+    ikut dihitung. Nilai dihitung ulang dengan harga barang saat ini.
+    """
+
+    conn.execute("DELETE FROM monthly_movements")
+    return conn.execute(
+        "INSERT INTO monthly_movements (month, item_id, in_qty, out_qty, in_value, out_value) "
+        + MOVEMENTS_SQL.format(source=source)
+    ).rowcount
+
+
+def check_movements(conn: sqlite3.Connection, source: str = "transactions") -> List[str]:
+    """Bandingkan jumlah masuk/keluar tersimpan dengan hasil hitung ulang.
+
+    Nilai tidak dibandingkan karena rollup menyimpan harga saat transaksi
+    diposting, sedangkan hitung ulang memakai harga saat ini.
+    """
+
+    expected = {
+        (row[0], row[1]): (row[2], row[3])
+        for row in conn.execute(f"SELECT month, item_id, in_qty, out_qty FROM ({MOVEMENTS_SQL.format(source=source)})")
+    }
+    stored = {
+        (row[0], row[1]): (row[2], row[3])
+        for row in conn.execute(
+            "SELECT month, item_id, in_qty, out_qty FROM monthly_movements WHERE in_qty != 0 OR out_qty != 0"
+        )
+    }
+    drift: List[str] = []
+    for key in sorted(set(expected) | set(stored)):
+        want = expected.get(key, (0, 0))
+        have = stored.get(key, (0, 0))
+        if want != have:
+            drift.append(
+                f"{key[0]} barang {key[1]}: masuk/keluar tersimpan={have[0]}/{have[1]} "
+                f"seharusnya={want[0]}/{want[1]}"
+            )
+    return drift
+
+
+def main() -> None:
+    from .database import Database
+    from .transaction_archive import TransactionArchive
+
+    parser = argparse.ArgumentParser(description="Periksa konsistensi rollup pergerakan bulanan.")
+    parser.add_argument("--db", default="data/inventori.db")
+    parser.add_argument("--repair", action="store_true", help="hitung ulang rollup bila ada selisih")
+    args = parser.parse_args()
+
+    database = Database(args.db)
+    database.initialize()
+    conn = database.get_connection()
+    try:
+        source = TransactionArchive(database).attach_history(conn)
+        drift = check_movements(conn, source)
+        if not drift:
+            print("Rollup pergerakan konsisten.")
+        else:
+            print(f"Ditemukan {len(drift)} selisih:")
+            for line in drift[:50]:
+                print(f"  - {line}")
+            if args.repair:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    rebuild_movements(conn, source)
+                    conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    raise
+                print("Rollup pergerakan telah dihitung ulang.")
+    finally:
+        conn.close()
+        database.close()
+    raise SystemExit(1 if drift and not args.repair else 0)
+
+
+if __name__ == "__main__":
+    main()
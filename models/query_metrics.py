@@ -0,0 +1,321 @@
+"""Instrumentasi SQL: latensi per pernyataan, histogram, dan log query lambat."""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+
+# Batas atas bucket histogram dalam milidetik; bucket terakhir tak terbatas.
+BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000)
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class StatementStats:
+    """Akumulasi satu pasangan (pemanggil, SQL)."""
+
+    __slots__ = ("calls", "total_s", "max_s", "rows", "buckets")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.rows = 0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, seconds: float, rows: int) -> None:
+        self.calls += 1
+        self.total_s += seconds
+        self.max_s = max(self.max_s, seconds)
+        self.rows += max(rows, 0)
+        ms = seconds * 1000
+        for idx, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[idx] += 1
+                return
+        self.buckets[-1] += 1
+
+    def percentile_ms(self, fraction: float) -> float:
+        """Perkiraan persentil: batas atas bucket tempat persentil jatuh."""
+
+        target = self.calls * fraction
+        seen = 0
+        for idx, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                return BUCKETS_MS[idx] if idx < len(BUCKETS_MS) else self.max_s * 1000
+        return 0.0
+
+
+class QueryMetrics:
+    """Kumpulkan statistik setiap pernyataan SQL yang lewat koneksi ``Database``.
+
+    Setiap eksekusi dicatat dengan pemanggilnya (fungsi pertama di luar modul
+    ini, misalnya ``models.item_model.ItemModel.get_all``), lama eksekusi
+    termasuk waktu mengambil baris, dan jumlah baris. Pernyataan yang lebih
+    lama dari ``slow_ms`` ditulis ke ``slow_log`` (berotasi) beserta
+    ``EXPLAIN QUERY PLAN``-nya. ``snapshot()``/``dump()`` mengurutkan hasil
+    dari total waktu terbesar.
+    """
+
+    def __init__(
+        self,
+        slow_ms: float = 200.0,
+        slow_log: str | Path | None = None,
+        max_bytes: int = 1024 * 1024,
+        backup_count: int = 3,
+    ) -> None:
+        self.slow_s = slow_ms / 1000
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], StatementStats] = {}
+        self._callers: Dict[object, str] = {}
+        # Pengamatan dari finalizer cursor; ditampung tanpa lock lalu
+        # digabung ke ``_stats`` pada pemanggilan berikutnya.
+        self._abandoned: Deque[Tuple[str, str, float, int]] = deque()
+        self._logger: Optional[logging.Logger] = None
+        self._handler: Optional[logging.Handler] = None
+        if slow_log is not None:
+            Path(slow_log).parent.mkdir(parents=True, exist_ok=True)
+            self._handler = RotatingFileHandler(
+                Path(slow_log), maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True
+            )
+            self._handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self._logger = logging.getLogger(f"{__name__}.slow.{id(self)}")
+            self._logger.propagate = False
+            self._logger.setLevel(logging.WARNING)
+            self._logger.addHandler(self._handler)
+
+    def caller(self) -> str:
+        """Nama fungsi pemanggil pertama di luar modul instrumentasi ini."""
+
+        frame = sys._getframe(1)
+        while frame is not None and frame.f_globals.get("__name__") == __name__:
+            frame = frame.f_back
+        if frame is None:
+            return "?"
+        code = frame.f_code
+        name = self._callers.get(code)
+        if name is None:
+            name = f"{frame.f_globals.get('__name__', '?')}.{getattr(code, 'co_qualname', code.co_name)}"
+            self._callers[code] = name
+        return name
+
+    def observe(
+        self,
+        conn: sqlite3.Connection,
+        sql: str,
+        params: object,
+        caller: str,
+        seconds: float,
+        rows: int,
+    ) -> None:
+        statement = _WHITESPACE.sub(" ", sql).strip()
+        with self._lock:
+            self._drain()
+            self._add(caller, statement, seconds, rows)
+        if self._logger is not None and seconds >= self.slow_s:
+            self._log_slow(conn, sql, statement, params, caller, seconds, rows)
+
+    def record(self, sql: str, caller: str, seconds: float, rows: int) -> None:
+        """Catat latensi saja, tanpa log lambat maupun ``EXPLAIN``.
+
+        Untuk finalizer cursor: GC bisa berjalan di thread mana pun, di
+        tengah pernyataan lain atau saat ``_lock`` sedang dipegang, jadi
+        pengamatan hanya ditaruh di antrean (``deque.append`` atomik).
+        """
+
+        self._abandoned.append((caller, sql, seconds, rows))
+
+    def snapshot(self) -> List[dict]:
+        with self._lock:
+            self._drain()
+            rows = [
+                {
+                    "caller": caller,
+                    "sql": statement,
+                    "calls": stats.calls,
+                    "total_ms": round(stats.total_s * 1000, 3),
+                    "mean_ms": round(stats.total_s * 1000 / stats.calls, 3),
+                    "p95_ms": stats.percentile_ms(0.95),
+                    "max_ms": round(stats.max_s * 1000, 3),
+                    "rows": stats.rows,
+                    "histogram": {
+                        (f"<={bound}ms" if idx < len(BUCKETS_MS) else f">{BUCKETS_MS[-1]}ms"): count
+                        for idx, (bound, count) in enumerate(zip((*BUCKETS_MS, None), stats.buckets))
+                        if count
+                    },
+                }
+                for (caller, statement), stats in self._stats.items()
+            ]
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows
+
+    def dump(self, destination: str | Path) -> None:
+        """Tulis ``snapshot()`` ke file JSON."""
+
+        destination = Path(destination)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"generated": time.strftime("%Y-%m-%d %H:%M:%S"), "buckets_ms": list(BUCKETS_MS),
+                   "statements": self.snapshot()}
+        destination.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._abandoned.clear()
+            self._stats.clear()
+
+    def close(self) -> None:
+        if self._handler is not None:
+            self._logger.removeHandler(self._handler)
+            self._handler.close()
+            self._handler = None
+            self._logger = None
+
+    def _add(self, caller: str, statement: str, seconds: float, rows: int) -> None:
+        stats = self._stats.get((caller, statement))
+        if stats is None:
+            stats = self._stats[(caller, statement)] = StatementStats()
+        stats.add(seconds, rows)
+
+    def _drain(self) -> None:
+        while self._abandoned:
+            caller, sql, seconds, rows = self._abandoned.popleft()
+            self._add(caller, _WHITESPACE.sub(" ", sql).strip(), seconds, rows)
+
+    def _log_slow(
+        self,
+        conn: sqlite3.Connection,
+        sql: str,
+        statement: str,
+        params: object,
+        caller: str,
+        seconds: float,
+        rows: int,
+    ) -> None:
+        lines = [f"{seconds * 1000:.1f} ms, {rows} baris, {caller}", f"  SQL: {statement}"]
+        if params:
+            lines.append(f"  Parameter: {params!r}"[:500])
+        if statement.split(" ", 1)[0].upper() in EXPLAINABLE:
+            try:
+                # Lewati instrumentasi agar EXPLAIN tidak ikut dicatat.
+                plan = sqlite3.Connection.execute(conn, "EXPLAIN QUERY PLAN " + sql, params or ()).fetchall()
+            except sqlite3.Error as exc:
+                lines.append(f"  Rencana: tidak tersedia ({exc})")
+            else:
+                lines.append("  Rencana:")
+                lines.extend(f"    {row[3]}" for row in plan)
+        self._logger.warning("\n".join(lines))
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor yang mengukur eksekusi ditambah pengambilan barisnya.
+
+    Untuk SELECT, satu pengamatan dicatat ketika baris habis dibaca, cursor
+    ditutup/dipakai ulang, atau dibuang; waktu di antara pengambilan baris
+    (misalnya saat pemanggil memproses baris) tidak dihitung. Cursor yang
+    dibuang sebelum habis dibaca hanya dicatat latensinya: log lambat dan
+    ``EXPLAIN`` tidak dijalankan dari finalizer.
+    """
+
+    _pending: Optional[list] = None
+
+    def execute(self, sql: str, parameters: object = ()) -> "InstrumentedCursor":
+        return self._run(super().execute, sql, parameters, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: object) -> "InstrumentedCursor":
+        return self._run(super().executemany, sql, seq_of_parameters, None)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(time.perf_counter() - started, 0 if row is None else 1, row is None)
+        return row
+
+    def fetchmany(self, size: Optional[int] = None):
+        size = self.arraysize if size is None else size
+        started = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._fetched(time.perf_counter() - started, len(rows), len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(time.perf_counter() - started, len(rows), True)
+        return rows
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(time.perf_counter() - started, 0, True)
+            raise
+        self._fetched(time.perf_counter() - started, 1, False)
+        return row
+
+    def close(self) -> None:
+        self._finish()
+        super().close()
+
+    def __del__(self) -> None:
+        pending = self._pending
+        if pending is None:
+            return
+        self._pending = None
+        sql, _, caller, elapsed, rows = pending
+        self.connection.metrics.record(sql, caller, elapsed, rows)
+
+    def _run(self, method, sql: str, parameters: object, logged_params: object) -> "InstrumentedCursor":
+        self._finish()
+        metrics = self.connection.metrics
+        caller = metrics.caller()
+        started = time.perf_counter()
+        method(sql, parameters)
+        elapsed = time.perf_counter() - started
+        if self.description is None:
+            metrics.observe(self.connection, sql, logged_params, caller, elapsed, self.rowcount)
+        else:
+            self._pending = [sql, logged_params, caller, elapsed, 0]
+        return self
+
+    def _fetched(self, elapsed: float, rows: int, exhausted: bool) -> None:
+        pending = self._pending
+        if pending is None:
+            return
+        pending[3] += elapsed
+        pending[4] += rows
+        if exhausted:
+            self._finish()
+
+    def _finish(self) -> None:
+        pending = self._pending
+        if pending is None:
+            return
+        self._pending = None
+        sql, params, caller, elapsed, rows = pending
+        self.connection.metrics.observe(self.connection, sql, params, caller, elapsed, rows)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Koneksi yang merutekan ``execute``/``executemany`` lewat ``InstrumentedCursor``."""
+
+    metrics: QueryMetrics
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters: object = ()) -> InstrumentedCursor:
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: object) -> InstrumentedCursor:
+        return self.cursor().executemany(sql, seq_of_parameters)
@@ -0,0 +1,98 @@
+"""Cache data referensi (kategori, pemasok) yang sadar versi."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+# Query pemuat per tabel referensi; urutan baris mengikuti tampilan combo.
+REFERENCE_QUERIES = {
+    "categories": "SELECT id, name FROM categories ORDER BY name",
+    "suppliers": "SELECT id, supplier_name, address FROM suppliers ORDER BY supplier_name",
+}
+NAME_FIELDS = {"categories": "name", "suppliers": "supplier_name"}
+
+
+class ReferenceCache:
+    """Menyimpan tabel referensi kecil di memori, diindeks per id dan per nama.
+
+    Validitas diperiksa dua lapis. ``PRAGMA data_version`` pada koneksi
+    khusus cache hanya berubah bila ada commit dari koneksi lain (termasuk
+    koneksi penulis aplikasi ini), jadi tanpa penulisan sama sekali tidak
+    ada query tabel yang dijalankan. Bila berubah, penghitung per tabel di
+    ``reference_versions`` (dinaikkan trigger) menentukan tabel mana yang
+    perlu dimuat ulang; posting transaksi tidak membuang cache kategori.
+    """
+
+    def __init__(self, database: "Database") -> None:
+        self.database = database
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._data_version: Optional[int] = None
+        self._versions: Dict[str, int] = {}
+        self._rows: Dict[str, List[dict]] = {}
+        self._by_id: Dict[str, Dict[int, dict]] = {}
+        self._by_name: Dict[str, Dict[str, dict]] = {}
+
+    def categories(self) -> List[dict]:
+        return list(self._table("categories")[0])
+
+    def suppliers(self) -> List[dict]:
+        return list(self._table("suppliers")[0])
+
+    def category(self, category_id: Optional[int]) -> Optional[dict]:
+        return self._table("categories")[1].get(category_id)
+
+    def supplier(self, supplier_id: Optional[int]) -> Optional[dict]:
+        return self._table("suppliers")[1].get(supplier_id)
+
+    def category_id(self, name: str) -> Optional[int]:
+        row = self._table("categories")[2].get(name)
+        return row["id"] if row else None
+
+    def supplier_id(self, name: str) -> Optional[int]:
+        row = self._table("suppliers")[2].get(name)
+        return row["id"] if row else None
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._data_version = None
+            self._versions.clear()
+            self._rows.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._data_version = None
+            self._versions.clear()
+            self._rows.clear()
+
+    def _table(self, table: str):
+        with self._lock:
+            conn = self._connection()
+            data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version != self._data_version:
+                self._data_version = data_version
+                current = dict(conn.execute("SELECT name, version FROM reference_versions").fetchall())
+                for name in list(self._rows):
+                    if current.get(name, 0) != self._versions.get(name):
+                        del self._rows[name]
+                self._versions = {name: current.get(name, 0) for name in REFERENCE_QUERIES}
+            if table not in self._rows:
+                rows = [dict(row) for row in conn.execute(REFERENCE_QUERIES[table])]
+                by_name: Dict[str, dict] = {}
+                for row in sorted(rows, key=lambda row: row["id"]):
+                    by_name.setdefault(row[NAME_FIELDS[table]], row)
+                self._rows[table] = rows
+                self._by_id[table] = {row["id"]: row for row in rows}
+                self._by_name[table] = by_name
+            return self._rows[table], self._by_id[table], self._by_name[table]
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = self.database.get_connection()
+            self._conn.execute("PRAGMA query_only = ON")
+        return self._conn
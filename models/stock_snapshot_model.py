@@ -0,0 +1,254 @@
+"""Snapshot saldo stok berkala dan query stok per tanggal (as-of)."""
+
+from __future__ import annotations
+
+import sqlite3
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .transaction_archive import TransactionArchive
+
+# Tanggal jangkar untuk saldo saat ini (``items.stock``): lebih besar dari
+# tanggal transaksi mana pun.
+CURRENT = "9999-12-31"
+DELTA_SQL = "CASE transaction_type WHEN 'IN' THEN quantity ELSE -quantity END"
+
+
+def _day_after(day: str) -> str:
+    """Batas eksklusif untuk akhir hari ``day``.
+
+    ``transaction_date`` boleh memuat jam (``"2025-11-30 14:00"``), yang
+    secara string lebih besar dari ``"2025-11-30"``; membandingkan dengan
+    ``< hari berikutnya`` tetap memasukkannya ke harinya sendiri.
+    """
+
+    if day == CURRENT:
+        return CURRENT
+    return (date.fromisoformat(day[:10]) + timedelta(days=1)).isoformat()
+
+
+def _month_end(day: date) -> date:
+    next_month = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return next_month - timedelta(days=1)
+
+
+class StockSnapshotModel:
+    """Menulis snapshot saldo stok dan menjawab "stok per tanggal".
+
+    Saldo pada tanggal D dihitung dari snapshot terdekat: snapshot terakhir
+    sebelum/pada D ditambah transaksi setelahnya sampai D, atau (bila belum
+    ada) snapshot berikutnya dikurangi transaksi di antaranya. Setelah
+    snapshot terbaru (atau tanpa snapshot sama sekali), stok saat ini
+    dikurangi transaksi setelah D.
+    Perubahan stok manual lewat form barang dianggap terjadi hari ini.
+    Bila rentang yang diputar ulang melewati tanggal batas arsip, transaksi
+    dibaca juga dari file arsip.
+    """
+
+    def __init__(self, database: "Database") -> None:
+        self.database = database
+
+    def list_snapshot_dates(self) -> List[str]:
+        with self.database.connection() as conn:
+            rows = conn.execute("SELECT snapshot_date FROM stock_snapshot_dates ORDER BY snapshot_date").fetchall()
+        return [row[0] for row in rows]
+
+    def stock_as_of(self, item_id: int, as_of: str) -> int:
+        """Saldo satu barang pada akhir hari ``as_of`` (YYYY-MM-DD)."""
+
+        with self._history(as_of) as (conn, source):
+            anchor = self._anchor(conn, as_of)
+            if anchor == CURRENT:
+                base = conn.execute("SELECT stock FROM items WHERE id = ?", (item_id,)).fetchone()
+            else:
+                base = conn.execute(
+                    "SELECT stock FROM stock_snapshots WHERE item_id = ? AND snapshot_date = ?",
+                    (item_id, anchor),
+                ).fetchone()
+            low, high, sign = self._replay_range(as_of, anchor)
+            net = conn.execute(
+                f"SELECT IFNULL(SUM({DELTA_SQL}), 0) FROM {source} AS transactions "
+                "WHERE item_id = ? AND transaction_date >= ? AND transaction_date < ?",
+                (item_id, _day_after(low), _day_after(high)),
+            ).fetchone()[0]
+        return (base[0] if base else 0) + sign * net
+
+    def iter_stock_as_of(self, as_of: str, batch_size: int = 1000) -> Iterator[dict]:
+        """Alirkan seluruh barang (urut nama) dengan kolom ``stock`` per ``as_of``.
+
+        Baris berbentuk sama dengan ``ItemModel.iter_all`` sehingga bisa
+        langsung dipakai untuk laporan PDF/Excel.
+        """
+
+        with self._history(as_of) as (conn, source):
+            cursor = self._as_of_cursor(conn, as_of, source)
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield dict(row)
+            finally:
+                cursor.close()
+
+    def take_snapshot(self, snapshot_date: str) -> int:
+        """Tulis (atau tulis ulang) snapshot akhir hari ``snapshot_date``."""
+
+        return self.database.write(lambda conn: self.store_snapshot(conn, snapshot_date))
+
+    def store_snapshot(self, conn: sqlite3.Connection, snapshot_date: str) -> int:
+        """Seperti ``take_snapshot`` tetapi memakai transaksi tulis milik pemanggil."""
+
+        balances = {row["id"]: row["stock"] for row in self._as_of_cursor(conn, snapshot_date)}
+        self._store(conn, snapshot_date, balances)
+        return len(balances)
+
+    def ensure_month_end_snapshots(
+        self,
+        today: Optional[date] = None,
+        months: Optional[int] = None,
+        chunk_months: int = 12,
+    ) -> List[str]:
+        """Lengkapi snapshot akhir bulan yang belum ada untuk bulan yang sudah lewat.
+
+        Bulan diisi dari yang terbaru. ``months`` membatasi jumlah bulan
+        yang dibuat: saat aplikasi mulai cukup ``months=1`` (menutup bulan
+        lalu), sedangkan sisa riwayat diisi di latar belakang tanpa batas.
+        Setiap ``chunk_months`` bulan ditulis dalam satu ``Database.write``
+        agar kunci tulis tidak tertahan lama. Saldo dihitung mundur dengan
+        satu query agregat per bulan-barang, dimulai dari snapshot/stok
+        yang sudah ada, sehingga mengisi riwayat bertahun-tahun hanya
+        membaca tabel transaksi sekali. Mengembalikan tanggal snapshot
+        yang dibuat.
+        """
+
+        today = today or date.today()
+        last_closed = today.replace(day=1) - timedelta(days=1)
+        with self.database.connection() as conn:
+            first_move = conn.execute("SELECT MIN(transaction_date) FROM transactions").fetchone()[0]
+            existing = {row[0] for row in conn.execute("SELECT snapshot_date FROM stock_snapshot_dates")}
+        first = _month_end(date.fromisoformat(first_move[:10])) if first_move else last_closed
+        missing: List[str] = []
+        current = last_closed
+        while current >= first and (months is None or len(missing) < months):
+            if current.isoformat() not in existing:
+                missing.append(current.isoformat())
+            current = current.replace(day=1) - timedelta(days=1)
+
+        created: List[str] = []
+        for offset in range(0, len(missing), max(chunk_months, 1)):
+            targets = sorted(missing[offset:offset + chunk_months])
+            created.extend(self.database.write(lambda conn: self._fill_month_ends(conn, targets)))
+        return sorted(created)
+
+    def _fill_month_ends(self, conn: sqlite3.Connection, targets: List[str]) -> List[str]:
+        """Tulis snapshot untuk ``targets`` (akhir bulan, urut naik) di transaksi pemanggil."""
+
+        existing = {row[0] for row in conn.execute("SELECT snapshot_date FROM stock_snapshot_dates")}
+        targets = [target for target in targets if target not in existing]
+        if not targets:
+            return []
+        balances = {row["id"]: row["stock"] for row in self._as_of_cursor(conn, targets[-1])}
+        monthly: Dict[str, Dict[int, int]] = defaultdict(dict)
+        for row in conn.execute(
+            f"SELECT substr(transaction_date, 1, 7) AS month, item_id, SUM({DELTA_SQL}) AS net "
+            "FROM transactions INDEXED BY idx_transactions_date_item WHERE transaction_date >= ? AND transaction_date < ? "
+            "GROUP BY month, item_id",
+            (_day_after(targets[0]), _day_after(targets[-1])),
+        ):
+            monthly[row["month"]][row["item_id"]] = row["net"]
+
+        wanted = set(targets)
+        current = date.fromisoformat(targets[-1])
+        while current.isoformat() >= targets[0]:
+            snapshot_date = current.isoformat()
+            if snapshot_date in wanted:
+                self._store(conn, snapshot_date, balances)
+            # Mundur satu bulan: kurangi pergerakan bulan ini.
+            for item_id, net in monthly.get(snapshot_date[:7], {}).items():
+                balances[item_id] = balances.get(item_id, 0) - net
+            current = current.replace(day=1) - timedelta(days=1)
+        return targets
+
+    @contextmanager
+    def _history(self, as_of: str) -> Iterator[Tuple[sqlite3.Connection, str]]:
+        """Koneksi baca yang mencakup arsip bila rentang putar ulang ``as_of`` memerlukannya."""
+
+        with self.database.connection() as conn:
+            low, high, _ = self._replay_range(as_of, self._anchor(conn, as_of))
+        with TransactionArchive(self.database).history(low, high) as (conn, source):
+            yield conn, source
+
+    def _as_of_cursor(self, conn: sqlite3.Connection, as_of: str, source: str = "transactions") -> sqlite3.Cursor:
+        anchor = self._anchor(conn, as_of)
+        low, high, sign = self._replay_range(as_of, anchor)
+        base = "items.stock" if anchor == CURRENT else "IFNULL(snap.stock, 0)"
+        if source == "transactions":
+            # Tanpa INDEXED BY planner memilih idx_transactions_item demi
+            # GROUP BY dan memindai seluruh tabel walau rentangnya sempit.
+            source = "transactions INDEXED BY idx_transactions_date_item"
+        else:
+            source = f"{source} AS transactions"
+        return conn.execute(
+            f"""
+            SELECT items.id, item_code, item_name,
+                   {base} + ? * IFNULL(moves.net, 0) AS stock,
+                   purchase_price, selling_price,
+                   IFNULL(categories.name, '-') AS category,
+                   IFNULL(suppliers.supplier_name, '-') AS supplier
+            FROM items
+            LEFT JOIN stock_snapshots AS snap
+                ON snap.item_id = items.id AND snap.snapshot_date = ?
+            LEFT JOIN (
+                SELECT item_id, SUM({DELTA_SQL}) AS net
+                FROM {source}
+                WHERE transaction_date >= ? AND transaction_date < ?
+                GROUP BY item_id
+            ) AS moves ON moves.item_id = items.id
+            LEFT JOIN categories ON categories.id = items.category_id
+            LEFT JOIN suppliers ON suppliers.id = items.supplier_id
+            ORDER BY item_name
+            """,
+            (sign, anchor, _day_after(low), _day_after(high)),
+        )
+
+    @staticmethod
+    def _store(conn: sqlite3.Connection, snapshot_date: str, balances: Dict[int, int]) -> None:
+        conn.execute("DELETE FROM stock_snapshot_dates WHERE snapshot_date = ?", (snapshot_date,))
+        conn.execute("INSERT INTO stock_snapshot_dates (snapshot_date) VALUES (?)", (snapshot_date,))
+        conn.executemany(
+            "INSERT INTO stock_snapshots (item_id, snapshot_date, stock) VALUES (?, ?, ?)",
+            ((item_id, snapshot_date, stock) for item_id, stock in balances.items() if stock),
+        )
+
+    @staticmethod
+    def _anchor(conn: sqlite3.Connection, as_of: str) -> str:
+        """Pilih snapshot terdekat untuk ``as_of``; ``CURRENT`` bila tidak ada.
+
+        Setelah snapshot terbaru, jangkarnya ``items.stock`` (diputar mundur)
+        agar perubahan stok manual sejak snapshot itu ikut terhitung.
+        """
+
+        before, after = conn.execute(
+            "SELECT (SELECT MAX(snapshot_date) FROM stock_snapshot_dates WHERE snapshot_date <= ?), "
+            "(SELECT MIN(snapshot_date) FROM stock_snapshot_dates WHERE snapshot_date > ?)",
+            (as_of, as_of),
+        ).fetchone()
+        if after is None and before != as_of:
+            return CURRENT
+        return before or after
+
+    @staticmethod
+    def _replay_range(as_of: str, anchor: str) -> Tuple[str, str, int]:
+        """Rentang hari (low, high] yang diputar ulang beserta tandanya.
+
+        Query memakai batas ``[hari setelah low, hari setelah high)`` agar
+        transaksi berjam tetap masuk ke harinya (lihat ``_day_after``).
+        """
+
+        if anchor <= as_of:
+            return anchor, as_of, 1
+        return as_of, anchor, -1
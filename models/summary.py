@@ -0,0 +1,98 @@
+"""Tabel ringkasan dashboard yang dipelihara trigger, beserta pemeriksa konsistensi.
+
+Jalankan ``python -m models.summary [--db data/inventori.db] [--repair]`` untuk
+menghitung ulang ringkasan dari tabel ``items`` dan melaporkan selisihnya.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+from typing import List
+
+TOTALS_SQL = (
+    "SELECT COUNT(*) AS total_items, IFNULL(SUM(stock), 0) AS total_stock, "
+    "IFNULL(SUM(stock * purchase_price), 0) AS inventory_value FROM items"
+)
+CATEGORY_TOTALS_SQL = (
+    "SELECT IFNULL(category_id, 0) AS category_id, COUNT(*) AS total_items, "
+    "IFNULL(SUM(stock), 0) AS total_stock, IFNULL(SUM(stock * purchase_price), 0) AS inventory_value "
+    "FROM items GROUP BY IFNULL(category_id, 0)"
+)
+FIELDS = ("total_items", "total_stock", "inventory_value")
+
+
+def rebuild_summary(conn: sqlite3.Connection) -> None:
+    """Hitung ulang seluruh tabel ringkasan dari tabel ``items``."""
+
+    conn.execute("DELETE FROM inventory_summary")
+    conn.execute(
+        "INSERT INTO inventory_summary (id, total_items, total_stock, inventory_value) "
+        f"SELECT 1, total_items, total_stock, inventory_value FROM ({TOTALS_SQL})"
+    )
+    conn.execute("DELETE FROM category_summary")
+    conn.execute(
+        "INSERT INTO category_summary (category_id, total_items, total_stock, inventory_value) "
+        f"SELECT category_id, total_items, total_stock, inventory_value FROM ({CATEGORY_TOTALS_SQL})"
+    )
+
+
+def check_summary(conn: sqlite3.Connection) -> List[str]:
+    """Bandingkan ringkasan tersimpan dengan hasil hitung ulang; kembalikan daftar selisih."""
+
+    drift: List[str] = []
+    expected = conn.execute(TOTALS_SQL).fetchone()
+    stored = conn.execute(
+        "SELECT total_items, total_stock, inventory_value FROM inventory_summary WHERE id = 1"
+    ).fetchone()
+    for idx, field in enumerate(FIELDS):
+        actual = stored[idx] if stored else None
+        if actual is None or abs(actual - expected[idx]) > 0.01:
+            drift.append(f"total: {field} tersimpan={actual} seharusnya={expected[idx]}")
+
+    expected_categories = {row[0]: row[1:] for row in conn.execute(CATEGORY_TOTALS_SQL)}
+    stored_categories = {
+        row[0]: row[1:]
+        for row in conn.execute(
+            "SELECT category_id, total_items, total_stock, inventory_value FROM category_summary"
+        )
+    }
+    for category_id in sorted(set(expected_categories) | set(stored_categories)):
+        want = expected_categories.get(category_id, (0, 0, 0))
+        have = stored_categories.get(category_id, (0, 0, 0))
+        for idx, field in enumerate(FIELDS):
+            if abs(have[idx] - want[idx]) > 0.01:
+                drift.append(
+                    f"kategori {category_id}: {field} tersimpan={have[idx]} seharusnya={want[idx]}"
+                )
+    return drift
+
+
+def main() -> None:
+    from .database import Database
+
+    parser = argparse.ArgumentParser(description="Periksa konsistensi tabel ringkasan dashboard.")
+    parser.add_argument("--db", default="data/inventori.db")
+    parser.add_argument("--repair", action="store_true", help="hitung ulang ringkasan bila ada selisih")
+    args = parser.parse_args()
+
+    database = Database(args.db)
+    database.initialize()
+    with database.connection() as conn:
+        drift = check_summary(conn)
+    if not drift:
+        print("Ringkasan konsisten.")
+    else:
+        print(f"Ditemukan {len(drift)} selisih:")
+        for line in drift:
+            print(f"  - {line}")
+        if args.repair:
+            with database.transaction() as conn:
+                rebuild_summary(conn)
+            print("Ringkasan telah dihitung ulang.")
+    database.close()
+    raise SystemExit(1 if drift and not args.repair else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""Pengarsipan transaksi lama ke file SQLite per tahun (lihat ``archive_cli.py``)."""
+
+from __future__ import annotations
+
+import sqlite3
+from array import array
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+TRANSACTION_COLUMNS = "id, transaction_date, item_id, quantity, transaction_type, notes"
+ARCHIVE_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS arsip.transactions (
+        id INTEGER PRIMARY KEY,
+        transaction_date TEXT NOT NULL,
+        item_id INTEGER NOT NULL,
+        quantity INTEGER NOT NULL,
+        transaction_type TEXT NOT NULL CHECK(transaction_type IN ('IN', 'OUT')),
+        notes TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS arsip.idx_transactions_date_item ON transactions(transaction_date, item_id, quantity)",
+)
+# Batas bawaan SQLITE_MAX_ATTACHED; satu slot dipakai untuk skema temp.
+DEFAULT_ATTACH_LIMIT = 10
+
+
+@contextmanager
+def _suspended_triggers(conn: sqlite3.Connection, table: str) -> Iterator[None]:
+    """Lepas sementara trigger pada ``table``; harus dipakai di dalam transaksi.
+
+    Daftar trigger dan SQL-nya dibaca dari ``sqlite_master`` saat itu juga,
+    sehingga trigger yang ditambahkan migrasi berikutnya ikut dipulihkan
+    apa adanya. Bila terjadi error, rollback transaksi ikut mengembalikan
+    trigger.
+    """
+
+    triggers = conn.execute(
+        "SELECT name, sql FROM main.sqlite_master WHERE type = 'trigger' AND tbl_name = ?", (table,)
+    ).fetchall()
+    for name, _ in triggers:
+        conn.execute(f'DROP TRIGGER main."{name}"')
+    yield
+    for _, sql in triggers:
+        conn.execute(sql)
+
+
+class TransactionArchive:
+    """Pindahkan transaksi lama ke ``<archive_dir>/<nama db>_<tahun>.db``.
+
+    Database aktif hanya menyimpan transaksi sejak tanggal batas, sehingga
+    daftar transaksi, dashboard dan laporan harian tetap kecil. Saldo awal
+    setiap barang pada tanggal batas disimpan sebagai snapshot stok hari
+    sebelumnya; ``items.stock`` sendiri tidak berubah. Query riwayat yang
+    rentangnya melewati batas memakai ``history()``, yang meng-attach file
+    arsip yang diperlukan saja.
+    """
+
+    def __init__(self, database: "Database", archive_dir: str | Path | None = None) -> None:
+        self.database = database
+        self.archive_dir = Path(archive_dir) if archive_dir is not None else database.db_path.parent / "arsip"
+
+    def archived_before(self) -> Optional[str]:
+        """Tanggal batas yang berlaku; ``None`` bila belum pernah mengarsipkan."""
+
+        with self.database.connection() as conn:
+            return conn.execute("SELECT MAX(archived_before) FROM transaction_archives").fetchone()[0]
+
+    def list_archives(self) -> List[dict]:
+        with self.database.connection() as conn:
+            rows = conn.execute("SELECT * FROM transaction_archives ORDER BY year").fetchall()
+        return [dict(row) for row in rows]
+
+    def archive_before(self, cutoff: str) -> Dict[str, object]:
+        """Arsipkan seluruh transaksi bertanggal sebelum ``cutoff`` (YYYY-MM-DD).
+
+        Tahap 1 menyalin baris ke file arsip per tahun lewat koneksi
+        tersendiri (ATTACH tidak bisa dilakukan di koneksi penulis bersama)
+        dan meng-commit-nya. Tahap 2, dalam satu ``Database.write``, menulis
+        snapshot saldo awal lalu menghapus hanya baris yang sudah ada di
+        arsip. Bila proses terhenti di antara keduanya, menjalankan ulang
+        aman karena penyalinan memakai ``INSERT OR IGNORE``. Trigger snapshot dan
+        ``change_log`` pada ``transactions`` dilepas selama penghapusan agar
+        riwayat tidak dianggap sebagai koreksi; stasiun lain menerima satu
+        entri ``change_log`` untuk memuat ulang daftar transaksi.
+        """
+
+        from .stock_snapshot_model import StockSnapshotModel
+
+        cutoff_date = date.fromisoformat(cutoff)
+        cutoff = cutoff_date.isoformat()
+        if cutoff_date > date.today():
+            raise ValueError("Tanggal batas arsip tidak boleh melewati hari ini")
+        current = self.archived_before()
+        if current is not None and cutoff < current:
+            raise ValueError(f"Transaksi sebelum {current} sudah diarsipkan")
+        opening_date = (cutoff_date - timedelta(days=1)).isoformat()
+        result: Dict[str, object] = {"archived": 0, "years": [], "opening_date": opening_date}
+
+        archived_ids = array("q")
+        conn = self.database.get_connection()
+        try:
+            first = conn.execute(
+                "SELECT MIN(transaction_date) FROM transactions WHERE transaction_date < ?", (cutoff,)
+            ).fetchone()[0]
+            if first is None:
+                return result
+            self.archive_dir.mkdir(parents=True, exist_ok=True)
+            years: Dict[int, Tuple[str, int, Optional[str], Optional[str]]] = {}
+            for year in range(int(first[:4]), cutoff_date.year + 1):
+                high = min(f"{year + 1:04d}-01-01", cutoff)
+                if f"{year:04d}-01-01" < high:
+                    years[year] = self._copy_year(conn, year, high, archived_ids)
+        finally:
+            conn.close()
+
+        def remove_archived(conn: sqlite3.Connection) -> int:
+            StockSnapshotModel(self.database).store_snapshot(conn, opening_date)
+            with _suspended_triggers(conn, "transactions"):
+                deleted = conn.executemany(
+                    "DELETE FROM main.transactions WHERE id = ?", ((row_id,) for row_id in archived_ids)
+                ).rowcount
+            conn.execute("INSERT INTO change_log (table_name, row_id, op) VALUES ('transactions', 0, 'D')")
+            conn.executemany(
+                """
+                INSERT INTO transaction_archives (year, file_name, row_count, first_date, last_date, archived_before)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(year) DO UPDATE SET
+                    file_name = excluded.file_name, row_count = excluded.row_count,
+                    first_date = excluded.first_date, last_date = excluded.last_date,
+                    archived_before = excluded.archived_before, archived_at = datetime('now')
+                """,
+                [(year, *stats, cutoff) for year, stats in years.items()],
+            )
+            return deleted
+
+        result["archived"] = self.database.write(remove_archived)
+        result["years"] = sorted(years)
+        return result
+
+    @contextmanager
+    def active(self) -> Iterator[Tuple[sqlite3.Connection, str]]:
+        """Pasangan ``(conn, sumber)`` untuk database aktif saja, seperti ``history()``."""
+
+        with self.database.connection() as conn:
+            yield conn, "transactions"
+
+    @contextmanager
+    def history(
+        self, start: Optional[str] = None, end: Optional[str] = None
+    ) -> Iterator[Tuple[sqlite3.Connection, str]]:
+        """Koneksi baca untuk transaksi rentang ``[start, end]`` termasuk arsip.
+
+        Menghasilkan ``(conn, sumber)``; ``sumber`` dipakai di klausa FROM
+        sebagai pengganti tabel ``transactions`` (``FROM {sumber} AS
+        transactions``). Bila rentang tidak menyentuh periode arsip, yang
+        dipinjam adalah koneksi pembaca biasa dan ``sumber`` adalah
+        ``transactions``. Selain itu koneksi sementara dibuat dengan file
+        arsip tahun yang diperlukan di-attach dan digabung dalam view temp.
+        """
+
+        with self.database.connection() as conn:
+            cutoff = conn.execute("SELECT MAX(archived_before) FROM transaction_archives").fetchone()[0]
+        if cutoff is None or (start is not None and start >= cutoff):
+            with self.active() as pair:
+                yield pair
+            return
+
+        conn = self.database.get_connection()
+        try:
+            source = self.attach_history(conn, start, end)
+            conn.execute("PRAGMA query_only = ON")
+            yield conn, source
+        finally:
+            conn.close()
+
+    def attach_history(self, conn: sqlite3.Connection, start: Optional[str] = None, end: Optional[str] = None) -> str:
+        """Attach arsip rentang ``[start, end]`` ke ``conn`` dan kembalikan nama sumbernya.
+
+        Dipakai ``history()``; ``conn`` harus koneksi baru di luar transaksi
+        dan hanya boleh dipakai oleh pemanggil ini karena view temp-nya
+        terikat pada koneksi tersebut.
+        """
+
+        archives = conn.execute(
+            "SELECT year, file_name, archived_before FROM transaction_archives ORDER BY year"
+        ).fetchall()
+        cutoff = max((row["archived_before"] for row in archives), default=None)
+        if cutoff is None:
+            return "transactions"
+        # Nilai tidak bisa di-bind sebagai parameter di definisi view, jadi
+        # pastikan benar-benar tanggal ISO sebelum masuk ke teks SQL.
+        cutoff = date.fromisoformat(cutoff).isoformat()
+        needed = [
+            row for row in archives
+            if (start is None or row["year"] >= int(start[:4])) and (end is None or row["year"] <= int(end[:4]))
+        ]
+        getlimit = getattr(conn, "getlimit", None)
+        limit = getlimit(sqlite3.SQLITE_LIMIT_ATTACHED) if getlimit else DEFAULT_ATTACH_LIMIT
+        if len(needed) > limit - 1:
+            raise ValueError(f"Rentang tanggal mencakup {len(needed)} file arsip; maksimal {limit - 1} sekaligus")
+        arms = [f"SELECT {TRANSACTION_COLUMNS} FROM main.transactions"]
+        for row in needed:
+            path = self.archive_dir / row["file_name"]
+            if not path.is_file():
+                raise ValueError(f"File arsip tidak ditemukan: {path}")
+            schema = f"arsip_{int(row['year'])}"
+            conn.execute(f"ATTACH DATABASE ? AS {schema}", (path.as_posix(),))
+            # Baris yang masih tersisa di database aktif (proses arsip
+            # terhenti) disaring agar tidak terhitung dua kali.
+            arms.append(
+                f"SELECT {TRANSACTION_COLUMNS} FROM {schema}.transactions WHERE transaction_date < '{cutoff}'"
+            )
+        conn.execute("CREATE TEMP VIEW transactions_history AS " + " UNION ALL ".join(arms))
+        return "temp.transactions_history"
+
+    def _copy_year(
+        self, conn: sqlite3.Connection, year: int, high: str, archived_ids: array
+    ) -> Tuple[str, int, Optional[str], Optional[str]]:
+        """Salin transaksi ``year`` (sebelum ``high``) ke file arsipnya dan tambahkan id-nya ke ``archived_ids``."""
+
+        file_name = f"{self.database.db_path.stem}_{year}.db"
+        conn.execute("ATTACH DATABASE ? AS arsip", ((self.archive_dir / file_name).as_posix(),))
+        try:
+            params = (f"{year:04d}-01-01", high)
+            try:
+                for statement in ARCHIVE_SCHEMA:
+                    conn.execute(statement)
+                conn.execute(
+                    f"INSERT OR IGNORE INTO arsip.transactions ({TRANSACTION_COLUMNS}) "
+                    f"SELECT {TRANSACTION_COLUMNS} FROM main.transactions "
+                    "WHERE transaction_date >= ? AND transaction_date < ?",
+                    params,
+                )
+                conn.commit()
+                archived_ids.extend(
+                    row[0]
+                    for row in conn.execute(
+                        "SELECT main.transactions.id FROM main.transactions "
+                        "JOIN arsip.transactions USING (id) "
+                        "WHERE main.transactions.transaction_date >= ? AND main.transactions.transaction_date < ?",
+                        params,
+                    )
+                )
+                count, first, last = conn.execute(
+                    "SELECT COUNT(*), MIN(transaction_date), MAX(transaction_date) FROM arsip.transactions"
+                ).fetchone()
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        finally:
+            conn.execute("DETACH DATABASE arsip")
+        return file_name, count, first, last
@@ -2,7 +2,18 @@
 
 from __future__ import annotations
 
-from typing import Dict, List
+import sqlite3
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .transaction_archive import TransactionArchive
+
+# Kunci keyset riwayat transaksi: (transaction_date, id).
+TransactionKey = Tuple[str, int]
+TRANSACTION_COLUMNS = (
+    "SELECT transactions.id, transaction_date, transaction_type, quantity, notes, items.item_name "
+)
 
 
 class TransactionModel:
@@ -10,64 +21,206 @@ class TransactionModel:
         self.database = database
 
     def add_transaction(self, data: Dict[str, object]) -> None:
-        conn = self.database.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO transactions (transaction_date, item_id, quantity, transaction_type, notes) "
-            "VALUES (?, ?, ?, ?, ?)",
-            (
-                data["transaction_date"],
-                data["item_id"],
-                data["quantity"],
-                data["transaction_type"],
-                data.get("notes"),
-            ),
-        )
-
-        if data["transaction_type"] == "IN":
-            cursor.execute(
-                "UPDATE items SET stock = stock + ? WHERE id = ?",
-                (data["quantity"], data["item_id"]),
+        """Posting satu transaksi secara atomik.
+
+        Stok keluar memakai ``UPDATE ... WHERE stock >= ?`` sehingga
+        pemeriksaan dan pengurangan stok terjadi dalam satu pernyataan di
+        transaksi ``BEGIN IMMEDIATE``; bila tidak ada baris yang berubah,
+        transaksi dibatalkan dengan ``ValueError``.
+        """
+
+        quantity = int(data["quantity"])
+        if quantity <= 0:
+            raise ValueError("Jumlah harus lebih dari 0")
+        if data["transaction_type"] not in ("IN", "OUT"):
+            raise ValueError("Jenis transaksi tidak dikenal")
+        item_id = int(data["item_id"])
+
+        def post(conn: sqlite3.Connection) -> None:
+            if data["transaction_type"] == "IN":
+                updated = conn.execute(
+                    "UPDATE items SET stock = stock + ? WHERE id = ?",
+                    (quantity, item_id),
+                ).rowcount
+            else:
+                updated = conn.execute(
+                    "UPDATE items SET stock = stock - ? WHERE id = ? AND stock >= ?",
+                    (quantity, item_id, quantity),
+                ).rowcount
+            if not updated:
+                exists = conn.execute("SELECT 1 FROM items WHERE id = ?", (item_id,)).fetchone()
+                raise ValueError("Stok tidak mencukupi" if exists else "Barang tidak ditemukan")
+
+            conn.execute(
+                "INSERT INTO transactions (transaction_date, item_id, quantity, transaction_type, notes) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    data["transaction_date"],
+                    item_id,
+                    quantity,
+                    data["transaction_type"],
+                    data.get("notes"),
+                ),
+            )
+
+        self.database.write(post)
+
+    def add_transactions(self, batch: Iterable[Dict[str, object]]) -> int:
+        """Posting banyak transaksi sekaligus dalam satu commit (semua atau tidak sama sekali).
+
+        Baris disisipkan dengan ``executemany`` dan perubahan stok digabung per
+        barang. Bila ada barang yang stoknya menjadi negatif, seluruh batch
+        dibatalkan dengan ``ValueError``. Mengembalikan jumlah baris yang diposting.
+        """
+
+        rows = []
+        deltas: Dict[int, int] = defaultdict(int)
+        for index, data in enumerate(batch, start=1):
+            quantity = int(data["quantity"])
+            if quantity <= 0:
+                raise ValueError(f"Baris {index}: jumlah harus lebih dari 0")
+            if data["transaction_type"] not in ("IN", "OUT"):
+                raise ValueError(f"Baris {index}: jenis transaksi tidak dikenal")
+            item_id = int(data["item_id"])
+            rows.append(
+                (data["transaction_date"], item_id, quantity, data["transaction_type"], data.get("notes"))
             )
-        else:
-            cursor.execute(
-                "UPDATE items SET stock = stock - ? WHERE id = ?",
-                (data["quantity"], data["item_id"]),
+            deltas[item_id] += quantity if data["transaction_type"] == "IN" else -quantity
+        if not rows:
+            return 0
+
+        def post(conn: sqlite3.Connection) -> None:
+            conn.executemany(
+                "INSERT INTO transactions (transaction_date, item_id, quantity, transaction_type, notes) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.executemany(
+                "UPDATE items SET stock = stock + ? WHERE id = ?",
+                [(delta, item_id) for item_id, delta in deltas.items() if delta],
             )
+            decreased = [item_id for item_id, delta in deltas.items() if delta < 0]
+            short: List[str] = []
+            for start in range(0, len(decreased), 500):
+                chunk = decreased[start:start + 500]
+                placeholders = ", ".join("?" for _ in chunk)
+                short.extend(
+                    row["item_name"]
+                    for row in conn.execute(
+                        f"SELECT item_name FROM items WHERE id IN ({placeholders}) AND stock < 0",
+                        chunk,
+                    )
+                )
+            if short:
+                raise ValueError(f"Stok tidak mencukupi untuk: {', '.join(short)}")
 
-        conn.commit()
-        conn.close()
+        self.database.write(post)
+        return len(rows)
 
     def get_recent(self, limit: int = 10) -> List[dict]:
-        conn = self.database.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT transactions.id, transaction_date, transaction_type, quantity, item_name
-            FROM transactions
-            JOIN items ON items.id = transactions.item_id
-            ORDER BY transaction_date DESC, transactions.id DESC
-            LIMIT ?
-            """,
-            (limit,),
-        )
-        rows = cursor.fetchall()
-        conn.close()
+        with self.database.connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT transactions.id, transaction_date, transaction_type, quantity, item_name
+                FROM transactions
+                JOIN items ON items.id = transactions.item_id
+                ORDER BY transaction_date DESC, transactions.id DESC
+                LIMIT ?
+                """,
+                (limit,),
+            ).fetchall()
         return [dict(row) for row in rows]
 
+    def get_page(
+        self,
+        after: Optional[TransactionKey] = None,
+        limit: int = 100,
+        with_total: bool = True,
+    ) -> dict:
+        """Ambil satu halaman riwayat (terbaru dulu) dengan keyset pagination.
+
+        Urutan dan kunci sama dengan ``iter_all``: (transaction_date, id)
+        menurun, dilayani idx_transactions_date. Bentuk hasil sama dengan
+        ``ItemModel.get_page``.
+        """
+
+        conditions = ""
+        params: List[object] = []
+        if after is not None:
+            conditions = "WHERE (transaction_date, transactions.id) < (?, ?) "
+            params.extend(after)
+        params.append(limit)
+        with self.database.connection() as conn:
+            rows = conn.execute(
+                TRANSACTION_COLUMNS
+                + "FROM transactions JOIN items ON items.id = transactions.item_id "
+                + conditions
+                + "ORDER BY transaction_date DESC, transactions.id DESC LIMIT ?",
+                params,
+            ).fetchall()
+            total = conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0] if with_total else None
+        items = [dict(row) for row in rows]
+        next_key = None
+        if len(items) == limit:
+            next_key = (items[-1]["transaction_date"], items[-1]["id"])
+        return {"items": items, "next_key": next_key, "total": total}
+
+    def get_key_at(self, offset: int) -> Optional[TransactionKey]:
+        """Kunci (transaction_date, id) pada posisi ``offset``; hanya membaca idx_transactions_date."""
+
+        with self.database.connection() as conn:
+            row = conn.execute(
+                "SELECT transaction_date, id FROM transactions "
+                "ORDER BY transaction_date DESC, id DESC LIMIT 1 OFFSET ?",
+                (offset,),
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
     def get_all(self) -> List[dict]:
-        conn = self.database.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT transactions.id, transaction_date, transaction_type, quantity, notes,
-                   items.item_name
-            FROM transactions
-            JOIN items ON items.id = transactions.item_id
-            ORDER BY transaction_date DESC
-            """
-        )
-        rows = cursor.fetchall()
-        conn.close()
-        return [dict(row) for row in rows]
+        return list(self.iter_all())
 
+    def iter_all(
+        self,
+        batch_size: int = 1000,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> Iterator[dict]:
+        """Alirkan transaksi per batch ``fetchmany`` tanpa memuat semuanya.
+
+        ``start``/``end`` (YYYY-MM-DD, inklusif) membatasi rentang tanggal.
+        Tanpa rentang hanya transaksi di database aktif yang dibaca; dengan
+        rentang yang melewati tanggal batas arsip, file arsip ikut dibaca.
+        """
+
+        conditions: List[str] = []
+        params: List[str] = []
+        if start:
+            conditions.append("transaction_date >= ?")
+            params.append(start)
+        if end:
+            # Batas atas eksklusif hari berikutnya agar tanggal berjam ikut.
+            conditions.append("transaction_date < ?")
+            params.append((date.fromisoformat(end) + timedelta(days=1)).isoformat())
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        archive = TransactionArchive(self.database)
+        with archive.history(start, end) if conditions else archive.active() as (conn, table):
+            cursor = conn.execute(
+                f"""
+                SELECT transactions.id, transaction_date, transaction_type, quantity, notes,
+                       items.item_name
+                FROM {table} AS transactions
+                JOIN items ON items.id = transactions.item_id
+                {where}
+                ORDER BY transaction_date DESC, transactions.id DESC
+                """,
+                params,
+            )
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield dict(row)
+            finally:
+                cursor.close()
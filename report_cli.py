@@ -0,0 +1,168 @@
+"""Ekspor laporan tanpa GUI, untuk dijadwalkan lewat cron/Task Scheduler.
+
+Modul ini tidak mengimpor Tkinter maupun matplotlib sehingga bisa berjalan
+di server tanpa display. Setiap kombinasi database x laporan x format
+dirender di proses terpisah (``--jobs``).
+
+Contoh::
+
+    python report_cli.py data/inventori.db
+    python report_cli.py "cabang/*.db" --report transaksi lengkap --format pdf \\
+        --from 2025-01-01 --to 2025-01-31 --out laporan/2025-01 --jobs 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from controllers.dashboard_controller import DashboardController
+from models import Database, ItemModel, StockSnapshotModel, TransactionModel
+from reports import ReportService
+
+# Diurutkan dari yang biasanya paling lama agar pekerjaan besar mulai lebih dulu.
+REPORTS = ("lengkap", "transaksi", "stok", "pergerakan")
+FORMATS = ("pdf", "xlsx")
+RENDERERS = {
+    ("stok", "pdf"): "generate_pdf",
+    ("stok", "xlsx"): "generate_excel",
+    ("transaksi", "pdf"): "generate_transaction_pdf",
+    ("transaksi", "xlsx"): "generate_transaction_excel",
+    ("lengkap", "pdf"): "generate_complete_pdf",
+    ("lengkap", "xlsx"): "generate_complete_excel",
+    ("pergerakan", "pdf"): "generate_movement_pdf",
+    ("pergerakan", "xlsx"): "generate_movement_excel",
+}
+
+
+def render_report(task: Dict[str, Optional[str]]) -> Tuple[bool, str]:
+    """Render satu laporan; dijalankan di proses pekerja."""
+
+    started = time.perf_counter()
+    database = Database(task["database"])
+    try:
+        render = getattr(ReportService(), RENDERERS[(task["report"], task["format"])])
+        destination = Path(task["destination"])
+        if task["report"] == "pergerakan":
+            # Dibaca dari rollup bulanan; rentang dibulatkan ke bulan penuh.
+            dashboard = DashboardController(ItemModel(database), TransactionModel(database))
+            movements = dashboard.get_movement_report(task["start"], task["end"])
+            render(
+                movements["months"], movements["categories"], movements["items"], destination,
+                period=movements["period"],
+            )
+        else:
+            if task["as_of"]:
+                items = StockSnapshotModel(database).iter_stock_as_of(task["as_of"])
+            else:
+                items = ItemModel(database).iter_all()
+            transactions = TransactionModel(database).iter_all(start=task["start"], end=task["end"])
+            if task["report"] == "stok":
+                render(items, destination)
+            elif task["report"] == "transaksi":
+                render(transactions, destination)
+            else:
+                render(items, transactions, destination)
+        return True, f"{destination} ({time.perf_counter() - started:.1f} s)"
+    except Exception as exc:  # noqa: BLE001
+        return False, f"Gagal membuat {task['destination']}: {exc}"
+    finally:
+        database.close()
+
+
+def _expand(patterns: List[str]) -> List[Path]:
+    paths: List[Path] = []
+    for pattern in patterns:
+        # Shell Windows tidak mengembangkan wildcard, jadi lakukan di sini.
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        paths.extend(Path(match) for match in matches)
+    return paths
+
+
+def _suffix(args: argparse.Namespace, report: str) -> str:
+    parts = []
+    if report != "stok" and (args.start or args.end):
+        parts.append(f"{args.start or 'awal'}_sd_{args.end or 'akhir'}")
+    if report in ("stok", "lengkap") and args.as_of:
+        parts.append(f"per_{args.as_of}")
+    return "".join(f"_{part}" for part in parts)
+
+
+def build_tasks(args: argparse.Namespace, databases: List[Path]) -> List[Dict[str, Optional[str]]]:
+    tasks = []
+    for report in REPORTS:
+        if report not in args.report:
+            continue
+        for database in databases:
+            for fmt in args.format:
+                name = f"{database.stem}_{report}{_suffix(args, report)}.{fmt}"
+                tasks.append({
+                    "database": database.as_posix(),
+                    "report": report,
+                    "format": fmt,
+                    "start": args.start,
+                    "end": args.end,
+                    "as_of": args.as_of,
+                    "destination": (args.out / name).as_posix(),
+                })
+    return tasks
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("databases", nargs="*", default=["data/inventori.db"], help="file database (boleh wildcard)")
+    parser.add_argument("--report", nargs="+", choices=REPORTS, default=list(REPORTS))
+    parser.add_argument("--format", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--from", dest="start", type=date.fromisoformat, help="tanggal transaksi awal (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end", type=date.fromisoformat, help="tanggal transaksi akhir (inklusif)")
+    parser.add_argument("--as-of", type=date.fromisoformat, help="stok barang per akhir tanggal ini")
+    parser.add_argument("--out", type=Path, default=Path("laporan") / date.today().isoformat())
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="jumlah proses paralel")
+    args = parser.parse_args(argv)
+
+    if args.start and args.end and args.start > args.end:
+        parser.error("--from harus sebelum --to")
+    for name in ("start", "end", "as_of"):
+        value = getattr(args, name)
+        setattr(args, name, value.isoformat() if value else None)
+
+    databases = _expand(args.databases)
+    missing = [path for path in databases if not path.is_file()]
+    if missing or not databases:
+        parser.error(f"database tidak ditemukan: {', '.join(map(str, missing)) or ' '.join(args.databases)}")
+
+    # Migrasi skema dijalankan sekali per database sebelum pekerja membaca.
+    for path in databases:
+        database = Database(path.as_posix())
+        database.initialize()
+        database.close()
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    tasks = build_tasks(args, databases)
+    started = time.perf_counter()
+    failures = 0
+    if args.jobs <= 1:
+        outcomes = (render_report(task) for task in tasks)
+    else:
+        executor = ProcessPoolExecutor(max_workers=min(args.jobs, len(tasks)))
+        outcomes = (future.result() for future in as_completed([executor.submit(render_report, task) for task in tasks]))
+    try:
+        for ok, message in outcomes:
+            failures += not ok
+            print(message, file=sys.stdout if ok else sys.stderr)
+    finally:
+        if args.jobs > 1:
+            executor.shutdown()
+    print(f"{len(tasks) - failures}/{len(tasks)} laporan selesai dalam {time.perf_counter() - started:.1f} s")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
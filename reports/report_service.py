@@ -2,21 +2,165 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
+from itertools import chain, islice
 from pathlib import Path
-from typing import Iterable, Mapping
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, TypeVar
 
-from openpyxl import Workbook
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import cm
-from reportlab.pdfgen import canvas
+if TYPE_CHECKING:
+    from openpyxl import Workbook
+
+
+ITEM_HEADERS = ["Kode", "Nama", "Kategori", "Stok", "Harga Beli", "Harga Jual", "Pemasok"]
+TRANSACTION_HEADERS = ["Tanggal", "Nama Barang", "Jenis Transaksi", "Quantity", "Catatan"]
+PRICE_FORMAT = "#,##0"
+DATE_FORMAT = "DD-MM-YYYY"
+ITEM_SECTION = "Stok Barang"
+TRANSACTION_SECTION = "Riwayat Transaksi"
+MOVEMENT_TOTAL_HEADERS = ["Qty Masuk", "Nilai Masuk", "Qty Keluar", "Nilai Keluar"]
+MONTH_MOVEMENT_SECTION = "Pergerakan Bulanan"
+CATEGORY_MOVEMENT_SECTION = "Pergerakan per Kategori"
+ITEM_MOVEMENT_SECTION = "Pergerakan per Barang"
+# (judul, kolom pembuka, judul kolom pembuka, lebar kolom PDF dalam cm)
+MOVEMENT_TABLES = (
+    (MONTH_MOVEMENT_SECTION, ("month",), ["Bulan"], (3, 3, 3.5, 3, 3.5)),
+    (CATEGORY_MOVEMENT_SECTION, ("month", "category"), ["Bulan", "Kategori"], (2, 4, 2.5, 3, 2.5, 3)),
+    (ITEM_MOVEMENT_SECTION, ("item_code", "item_name", "category"), ["Kode", "Nama", "Kategori"],
+     (2.3, 4, 2.4, 1.6, 2.6, 1.6, 2.5)),
+)
+
+# Dipanggil dengan (nama bagian, jumlah baris yang sudah ditulis). Callback
+# boleh melempar exception untuk membatalkan pembuatan laporan.
+ProgressCallback = Callable[[str, int], None]
+T = TypeVar("T")
+
+
+def _reportlab():
+    """Impor reportlab saat PDF pertama dibuat, bukan saat aplikasi dimulai."""
+
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import cm
+    from reportlab.pdfgen import canvas
+
+    return canvas, A4, cm, colors
+
+
+def _new_workbook() -> "Workbook":
+    """Impor openpyxl saat Excel pertama dibuat dan kembalikan workbook write-only."""
+
+    from openpyxl import Workbook
+
+    return Workbook(write_only=True)
+
+
+def _track(rows: Iterable[T], section: str, progress: Optional[ProgressCallback], every: int = 500) -> Iterator[T]:
+    """Teruskan ``rows`` sambil melaporkan progres per ``every`` baris."""
+
+    if progress is None:
+        yield from rows
+        return
+    progress(section, 0)
+    count = 0
+    for row in rows:
+        yield row
+        count += 1
+        if count % every == 0:
+            progress(section, count)
+    progress(section, count)
+
+
+def _as_date(value: object) -> object:
+    """Ubah tanggal ISO (teks) menjadi ``date`` agar tersimpan sebagai sel tanggal."""
+
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _item_row(item: Mapping[str, object]) -> list:
+    return [
+        item["item_code"],
+        item["item_name"],
+        item.get("category", "-"),
+        item["stock"],
+        item["purchase_price"],
+        item["selling_price"],
+        item.get("supplier", "-"),
+    ]
+
+
+def _transaction_row(transaction: Mapping[str, object]) -> list:
+    return [
+        _as_date(transaction["transaction_date"]),
+        transaction["item_name"],
+        transaction["transaction_type"],
+        transaction["quantity"],
+        transaction.get("notes", "-"),
+    ]
+
+
+def _movement_row(row: Mapping[str, object], keys: Sequence[str]) -> list:
+    return [row[key] for key in keys] + [row["in_qty"], row["in_value"], row["out_qty"], row["out_value"]]
+
+
+def _thousands(value: object) -> str:
+    return f"{value or 0:,.0f}".replace(",", ".")
 
 
 class ReportService:
     """Menyediakan utilitas untuk mengekspor laporan stok barang."""
 
-    def generate_pdf(self, items: Iterable[Mapping[str, object]], destination: Path) -> None:
+    # Jumlah baris awal yang dipakai untuk memperkirakan lebar kolom Excel.
+    width_sample_size = 500
+
+    def _write_sheet(
+        self,
+        wb: Workbook,
+        title: str,
+        headers: Sequence[str],
+        rows: Iterable[list],
+        max_width: Optional[int] = None,
+        number_formats: Optional[Dict[int, str]] = None,
+    ) -> None:
+        """Tulis satu sheet secara streaming pada workbook write-only.
+
+        Lebar kolom harus ditetapkan sebelum baris pertama ditulis, sehingga
+        lebar diperkirakan dari ``width_sample_size`` baris pertama saja.
+        """
+
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.utils import get_column_letter
+
+        ws = wb.create_sheet(title)
+        number_formats = number_formats or {}
+        rows = iter(rows)
+        sample: List[list] = list(islice(rows, self.width_sample_size))
+
+        widths = [len(str(header)) for header in headers]
+        for row in sample:
+            for idx, value in enumerate(row):
+                if value is not None:
+                    text = value.strftime("%d-%m-%Y") if isinstance(value, date) else str(value)
+                    widths[idx] = max(widths[idx], len(text))
+        for idx, width in enumerate(widths, start=1):
+            width += 2
+            ws.column_dimensions[get_column_letter(idx)].width = min(width, max_width) if max_width else width
+
+        ws.append(list(headers))
+        for row in chain(sample, rows):
+            for idx, number_format in number_formats.items():
+                cell = WriteOnlyCell(ws, value=row[idx])
+                cell.number_format = number_format
+                row[idx] = cell
+            ws.append(row)
+
+    def generate_pdf(self, items: Iterable[Mapping[str, object]], destination: Path, progress: Optional[ProgressCallback] = None) -> None:
+        items = _track(items, ITEM_SECTION, progress)
+        canvas, A4, cm, colors = _reportlab()
         pdf = canvas.Canvas(destination.as_posix(), pagesize=A4)
         width, height = A4
         pdf.setTitle("Laporan Stok Barang")
@@ -55,7 +199,10 @@ class ReportService:
         pdf.showPage()
         pdf.save()
 
-    def generate_complete_pdf(self, items: Iterable[Mapping[str, object]], transactions: Iterable[Mapping[str, object]], destination: Path) -> None:
+    def generate_complete_pdf(self, items: Iterable[Mapping[str, object]], transactions: Iterable[Mapping[str, object]], destination: Path, progress: Optional[ProgressCallback] = None) -> None:
+        items = _track(items, ITEM_SECTION, progress)
+        transactions = _track(transactions, TRANSACTION_SECTION, progress)
+        canvas, A4, cm, colors = _reportlab()
         pdf = canvas.Canvas(destination.as_posix(), pagesize=A4)
         width, height = A4
         pdf.setTitle("Laporan Lengkap Inventori")
@@ -131,32 +278,21 @@ class ReportService:
         pdf.showPage()
         pdf.save()
 
-    def generate_excel(self, items: Iterable[Mapping[str, object]], destination: Path) -> None:
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Stok Barang"
-        ws.append(["Kode", "Nama", "Kategori", "Stok", "Harga Beli", "Harga Jual", "Pemasok"])
-
-        for item in items:
-            ws.append(
-                [
-                    item["item_code"],
-                    item["item_name"],
-                    item.get("category", "-"),
-                    item["stock"],
-                    item["purchase_price"],
-                    item["selling_price"],
-                    item.get("supplier", "-"),
-                ]
-            )
-
-        for column_cells in ws.columns:
-            length = max(len(str(cell.value)) if cell.value else 0 for cell in column_cells)
-            ws.column_dimensions[column_cells[0].column_letter].width = length + 2
-
+    def generate_excel(self, items: Iterable[Mapping[str, object]], destination: Path, progress: Optional[ProgressCallback] = None) -> None:
+        items = _track(items, ITEM_SECTION, progress)
+        wb = _new_workbook()
+        self._write_sheet(
+            wb,
+            ITEM_SECTION,
+            ITEM_HEADERS,
+            (_item_row(item) for item in items),
+            number_formats={4: PRICE_FORMAT, 5: PRICE_FORMAT},
+        )
         wb.save(destination.as_posix())
 
-    def generate_transaction_pdf(self, transactions: Iterable[Mapping[str, object]], destination: Path) -> None:
+    def generate_transaction_pdf(self, transactions: Iterable[Mapping[str, object]], destination: Path, progress: Optional[ProgressCallback] = None) -> None:
+        transactions = _track(transactions, TRANSACTION_SECTION, progress)
+        canvas, A4, cm, colors = _reportlab()
         pdf = canvas.Canvas(destination.as_posix(), pagesize=A4)
         width, height = A4
         pdf.setTitle("Laporan Riwayat Transaksi")
@@ -197,66 +333,128 @@ class ReportService:
         pdf.showPage()
         pdf.save()
 
-    def generate_transaction_excel(self, transactions: Iterable[Mapping[str, object]], destination: Path) -> None:
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Riwayat Transaksi"
-        ws.append(["Tanggal", "Nama Barang", "Jenis Transaksi", "Quantity", "Catatan"])
-
-        for transaction in transactions:
-            ws.append([
-                transaction["transaction_date"],
-                transaction["item_name"],
-                transaction["transaction_type"],
-                transaction["quantity"],
-                transaction.get("notes", "-"),
-            ])
-
-        for column_cells in ws.columns:
-            length = max(len(str(cell.value)) if cell.value else 0 for cell in column_cells)
-            ws.column_dimensions[column_cells[0].column_letter].width = min(length + 2, 30)  # Max width 30
-
+    def generate_transaction_excel(self, transactions: Iterable[Mapping[str, object]], destination: Path, progress: Optional[ProgressCallback] = None) -> None:
+        transactions = _track(transactions, TRANSACTION_SECTION, progress)
+        wb = _new_workbook()
+        self._write_sheet(
+            wb,
+            TRANSACTION_SECTION,
+            TRANSACTION_HEADERS,
+            (_transaction_row(transaction) for transaction in transactions),
+            max_width=30,
+            number_formats={0: DATE_FORMAT},
+        )
         wb.save(destination.as_posix())
 
-    def generate_complete_excel(self, items: Iterable[Mapping[str, object]], transactions: Iterable[Mapping[str, object]], destination: Path) -> None:
-        wb = Workbook()
+    def generate_complete_excel(self, items: Iterable[Mapping[str, object]], transactions: Iterable[Mapping[str, object]], destination: Path, progress: Optional[ProgressCallback] = None) -> None:
+        items = _track(items, ITEM_SECTION, progress)
+        transactions = _track(transactions, TRANSACTION_SECTION, progress)
+        wb = _new_workbook()
 
         # Sheet 1: Stok Barang
-        ws1 = wb.active
-        ws1.title = "Stok Barang"
-        ws1.append(["Kode", "Nama", "Kategori", "Stok", "Harga Beli", "Harga Jual", "Pemasok"])
-
-        for item in items:
-            ws1.append([
-                item["item_code"],
-                item["item_name"],
-                item.get("category", "-"),
-                item["stock"],
-                item["purchase_price"],
-                item["selling_price"],
-                item.get("supplier", "-"),
-            ])
-
-        for column_cells in ws1.columns:
-            length = max(len(str(cell.value)) if cell.value else 0 for cell in column_cells)
-            ws1.column_dimensions[column_cells[0].column_letter].width = min(length + 2, 30)
+        self._write_sheet(
+            wb,
+            ITEM_SECTION,
+            ITEM_HEADERS,
+            (_item_row(item) for item in items),
+            max_width=30,
+            number_formats={4: PRICE_FORMAT, 5: PRICE_FORMAT},
+        )
 
         # Sheet 2: Riwayat Transaksi
-        ws2 = wb.create_sheet("Riwayat Transaksi")
-        ws2.append(["Tanggal", "Nama Barang", "Jenis Transaksi", "Quantity", "Catatan"])
-
-        for transaction in transactions:
-            ws2.append([
-                transaction["transaction_date"],
-                transaction["item_name"],
-                transaction["transaction_type"],
-                transaction["quantity"],
-                transaction.get("notes", "-"),
-            ])
-
-        for column_cells in ws2.columns:
-            length = max(len(str(cell.value)) if cell.value else 0 for cell in column_cells)
-            ws2.column_dimensions[column_cells[0].column_letter].width = min(length + 2, 30)
+        self._write_sheet(
+            wb,
+            TRANSACTION_SECTION,
+            TRANSACTION_HEADERS,
+            (_transaction_row(transaction) for transaction in transactions),
+            max_width=30,
+            number_formats={0: DATE_FORMAT},
+        )
 
         wb.save(destination.as_posix())
 
+    def generate_movement_pdf(
+        self,
+        months: Iterable[Mapping[str, object]],
+        categories: Iterable[Mapping[str, object]],
+        items: Iterable[Mapping[str, object]],
+        destination: Path,
+        period: str = "Semua periode",
+        progress: Optional[ProgressCallback] = None,
+    ) -> None:
+        """Laporan pergerakan dari rollup bulanan: per bulan, per kategori, lalu per barang."""
+
+        canvas, A4, cm, colors = _reportlab()
+        pdf = canvas.Canvas(destination.as_posix(), pagesize=A4)
+        width, height = A4
+        pdf.setTitle("Laporan Pergerakan Barang")
+
+        for rows, (section, keys, lead_headers, widths) in zip((months, categories, items), MOVEMENT_TABLES):
+            pdf.setFont("Helvetica-Bold", 16)
+            pdf.drawString(2 * cm, height - 2 * cm, f"Laporan {section}")
+            pdf.setFont("Helvetica", 10)
+            pdf.drawString(
+                2 * cm, height - 2.7 * cm, f"Periode: {period}    Tanggal Cetak: {datetime.now():%d-%m-%Y %H:%M}"
+            )
+
+            table_top = height - 3.5 * cm
+            col_widths = [w * cm for w in widths]
+            headers = lead_headers + MOVEMENT_TOTAL_HEADERS
+            pdf.setFillColor(colors.lightgrey)
+            pdf.rect(2 * cm, table_top, sum(col_widths), 0.7 * cm, fill=1, stroke=0)
+            pdf.setFillColor(colors.black)
+
+            x = 2 * cm
+            for idx, header in enumerate(headers):
+                pdf.drawString(x + 0.2 * cm, table_top + 0.2 * cm, header)
+                x += col_widths[idx]
+
+            y = table_top - 0.5 * cm
+            for row in _track(rows, section, progress):
+                if y < 3 * cm:
+                    pdf.showPage()
+                    y = height - 3 * cm
+                values = _movement_row(row, keys)
+                x = 2 * cm
+                for idx, value in enumerate(values):
+                    if idx < len(keys):
+                        text = str(value)
+                        # Potong teks yang lebih lebar dari kolomnya
+                        if len(text) > col_widths[idx] / (0.19 * cm):
+                            text = text[: int(col_widths[idx] / (0.19 * cm)) - 3] + "..."
+                        pdf.drawString(x + 0.2 * cm, y, text)
+                    else:
+                        pdf.drawRightString(x + col_widths[idx] - 0.2 * cm, y, _thousands(value))
+                    x += col_widths[idx]
+                y -= 0.5 * cm
+            pdf.showPage()
+
+        pdf.save()
+
+    def generate_movement_excel(
+        self,
+        months: Iterable[Mapping[str, object]],
+        categories: Iterable[Mapping[str, object]],
+        items: Iterable[Mapping[str, object]],
+        destination: Path,
+        period: str = "Semua periode",
+        progress: Optional[ProgressCallback] = None,
+    ) -> None:
+        """Versi Excel ``generate_movement_pdf``: satu sheet per tabel.
+
+        ``period`` hanya dipakai pada judul PDF; diterima di sini agar kedua
+        format bisa dipanggil dengan argumen yang sama.
+        """
+
+        wb = _new_workbook()
+        for rows, (section, keys, lead_headers, _) in zip((months, categories, items), MOVEMENT_TABLES):
+            value_columns = len(keys) + 1, len(keys) + 3
+            self._write_sheet(
+                wb,
+                section,
+                lead_headers + MOVEMENT_TOTAL_HEADERS,
+                (_movement_row(row, keys) for row in _track(rows, section, progress)),
+                max_width=30,
+                number_formats={idx: PRICE_FORMAT for idx in value_columns},
+            )
+        wb.save(destination.as_posix())
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+import pytest
+
+from models import Database
+
+
+@pytest.fixture()
+def database(tmp_path):
+    """Database baru (skema dan data awal lengkap) di direktori sementara."""
+
+    database = Database((tmp_path / "inventori.db").as_posix())
+    database.initialize()
+    yield database
+    database.close()
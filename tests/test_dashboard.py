@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import pytest
+
+from controllers.dashboard_controller import DashboardController
+from models import ItemModel, TransactionModel
+
+
+def test_slowest_moving_chart_includes_unmoved_items(database):
+    today = date.today()
+
+    def seed(conn):
+        conn.execute("DELETE FROM items")
+        ids = [
+            conn.execute("INSERT INTO items (item_code, item_name, stock) VALUES (?, ?, 10)", (code, code)).lastrowid
+            for code in ("A", "B", "C")
+        ]
+        conn.executemany(
+            "INSERT INTO transactions (transaction_date, item_id, quantity, transaction_type) VALUES (?, ?, ?, 'OUT')",
+            [
+                ((today - timedelta(days=2)).isoformat(), ids[0], 5),
+                ((today - timedelta(days=2)).isoformat(), ids[1], 1),
+                ((today - timedelta(days=60)).isoformat(), ids[2], 50),
+            ],
+        )
+
+    database.write(seed)
+    dashboard = DashboardController(ItemModel(database), TransactionModel(database))
+
+    slowest = dashboard.get_chart_items("Paling Lambat Bergerak (30 hari)", limit=3)
+    assert [(row["item_name"], row["moved"]) for row in slowest] == [("C", 0), ("B", 1), ("A", 5)]
+
+    busiest = dashboard.get_chart_items("Paling Banyak Bergerak (30 hari)", limit=1, days=90)
+    assert [(row["item_name"], row["moved"]) for row in busiest] == [("C", 50)]
+
+
+def test_unknown_ranking_is_rejected(database):
+    with pytest.raises(ValueError, match="movement"):
+        ItemModel(database).get_ranked("popularity")
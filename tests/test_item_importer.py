@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import csv
+
+import pytest
+
+from models.item_importer import ItemImporter, _number
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("15000", 15000.0),
+        ("15.000", 15000.0),
+        ("1.250.000", 1250000.0),
+        ("15.000,50", 15000.5),
+        ("12,5", 12.5),
+        ("0,250", 0.25),
+        ("1.5", 1.5),
+        ("Rp 15.000", 15000.0),
+        ("1,234,567", 1234567.0),
+        ("1,234.50", 1234.5),
+    ],
+)
+def test_number_reads_indonesian_format(text, expected):
+    assert _number(text, "Harga") == expected
+
+
+@pytest.mark.parametrize("text", ["15,000", "1.2.3", "lima"])
+def test_number_rejects_ambiguous_or_invalid(text):
+    with pytest.raises(ValueError):
+        _number(text, "Harga")
+
+
+def write_csv(path, rows):
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle, delimiter=";")
+        writer.writerow(["Kode", "Nama", "Stok", "Harga Beli", "Harga Jual"])
+        writer.writerows(rows)
+
+
+def test_import_counts_only_changed_rows_as_updated(database, tmp_path):
+    source = tmp_path / "barang.csv"
+    write_csv(source, [["IMP-1", "Gula", "5", "15.000", "17.500"], ["IMP-2", "Teh", "3", "4.000", "5.000"]])
+    importer = ItemImporter(database)
+    assert importer.import_file(source)["inserted"] == 2
+
+    write_csv(
+        source,
+        [["IMP-1", "Gula", "5", "15.000", "17.500"], ["IMP-2", "Teh", "3", "4.500", "5.000"], ["IMP-3", "Kopi", "1", "15,000", "1"]],
+    )
+    result = importer.import_file(source)
+    assert (result["inserted"], result["updated"], result["rejected"]) == (0, 1, 1)
+    with database.connection() as conn:
+        prices = dict(conn.execute("SELECT item_code, purchase_price FROM items WHERE item_code LIKE 'IMP-%'"))
+    assert prices == {"IMP-1": 15000.0, "IMP-2": 4500.0}
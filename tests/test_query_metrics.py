@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import gc
+
+from models import Database
+from models.query_metrics import QueryMetrics
+
+
+def test_abandoned_cursor_records_latency_without_slow_log(tmp_path):
+    slow_log = tmp_path / "slow.log"
+    metrics = QueryMetrics(slow_ms=0, slow_log=slow_log)
+    database = Database((tmp_path / "inventori.db").as_posix(), metrics=metrics)
+    database.initialize()
+    try:
+        metrics.reset()
+        with database.connection() as conn:
+            cursor = conn.execute("SELECT id FROM items ORDER BY id")
+            cursor.fetchone()
+            del cursor
+            gc.collect()
+        logged = slow_log.read_text(encoding="utf-8") if slow_log.exists() else ""
+        assert "ORDER BY id" not in logged
+
+        stats = [row for row in metrics.snapshot() if row["sql"] == "SELECT id FROM items ORDER BY id"]
+        assert stats and stats[0]["calls"] == 1 and stats[0]["rows"] == 1
+
+        with database.connection() as conn:
+            conn.execute("SELECT id FROM items ORDER BY id").fetchall()
+        assert "ORDER BY id" in slow_log.read_text(encoding="utf-8")
+    finally:
+        database.close()
+        metrics.close()
@@ -0,0 +1,79 @@
+"""Pastikan query utama tetap memakai indeks dari migrasi versi 1.
+
+Setiap pemeriksaan merekam SQL yang benar-benar dijalankan sebuah metode
+model (lewat ``set_trace_callback``) lalu menjalankan ``EXPLAIN QUERY PLAN``
+atas pernyataan tersebut.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, List
+
+from models import Database, ItemModel, StockSnapshotModel, TransactionModel
+
+
+def query_plan(database: Database, call: Callable[[], object]) -> List[str]:
+    """Baris ``detail`` rencana query untuk setiap SELECT yang dijalankan ``call``."""
+
+    statements: List[str] = []
+    with database.connection() as conn:
+        conn.set_trace_callback(statements.append)
+        try:
+            call()
+        finally:
+            conn.set_trace_callback(None)
+        plan = []
+        for sql in statements:
+            if sql.lstrip().upper().startswith("SELECT"):
+                plan.extend(row["detail"] for row in conn.execute("EXPLAIN QUERY PLAN " + sql))
+    return plan
+
+
+def uses_index(plan: List[str], index: str) -> bool:
+    return any(f"INDEX {index} " in f"{detail} " for detail in plan)
+
+
+def test_transaction_history_uses_date_index(database):
+    plan = query_plan(database, TransactionModel(database).get_all)
+    assert uses_index(plan, "idx_transactions_date"), plan
+
+
+def test_recent_transactions_use_date_index(database):
+    plan = query_plan(database, TransactionModel(database).get_recent)
+    assert uses_index(plan, "idx_transactions_date"), plan
+
+
+def test_low_stock_uses_stock_index(database):
+    plan = query_plan(database, ItemModel(database).get_stock_summary)
+    assert uses_index(plan, "idx_items_stock"), plan
+
+
+def test_item_list_uses_name_index(database):
+    plan = query_plan(database, ItemModel(database).get_all)
+    assert uses_index(plan, "idx_items_name"), plan
+
+
+def test_item_scoped_transactions_use_item_index(database):
+    # idx_transactions_item melayani pencarian transaksi per barang: putar
+    # ulang stok per tanggal dan ON DELETE CASCADE saat barang dihapus.
+    plan = query_plan(database, lambda: StockSnapshotModel(database).stock_as_of(1, "2000-01-01"))
+    assert uses_index(plan, "idx_transactions_item"), plan
+
+    with database.connection() as conn:
+        cascade = [row["detail"] for row in conn.execute("EXPLAIN QUERY PLAN DELETE FROM transactions WHERE item_id = 1")]
+    assert uses_index(cascade, "idx_transactions_item"), cascade
+
+
+def test_transaction_pages_use_date_index(database):
+    model = TransactionModel(database)
+    plan = query_plan(database, lambda: model.get_page(after=("2025-01-01", 10), with_total=False))
+    assert uses_index(plan, "idx_transactions_date"), plan
+    plan = query_plan(database, lambda: model.get_key_at(50))
+    assert uses_index(plan, "idx_transactions_date"), plan
+
+
+def test_movement_ranking_groups_transactions_by_date_index(database):
+    plan = query_plan(database, lambda: ItemModel(database).get_ranked("movement", limit=5, descending=True))
+    assert uses_index(plan, "idx_transactions_date_item"), plan
+    assert "SEARCH items USING INTEGER PRIMARY KEY (rowid=?)" in plan, plan
+    assert all(detail == "SCAN items USING INDEX idx_items_name" for detail in plan if "SCAN items" in detail), plan
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import pytest
+
+from controllers.report_controller import ExportCancelled, ReportController
+from reports import ReportService
+
+ITEMS = [
+    {"item_code": f"B{idx}", "item_name": f"Barang {idx}", "category": "-", "stock": idx,
+     "purchase_price": 1000.0, "selling_price": 1500.0, "supplier": "-"}
+    for idx in range(50)
+]
+TRANSACTIONS = [
+    {"id": idx, "transaction_date": "2025-11-30", "item_name": "Barang 1", "transaction_type": "IN",
+     "quantity": 1, "notes": ""}
+    for idx in range(50)
+]
+
+
+@pytest.fixture()
+def controller():
+    controller = ReportController(ReportService())
+    yield controller
+    controller.shutdown()
+
+
+def cancel_after_first_progress(section, rows):
+    raise ExportCancelled()
+
+
+@pytest.mark.parametrize("method, suffix", [("export_pdf", ".pdf"), ("export_excel", ".xlsx")])
+def test_cancelled_export_leaves_no_file(controller, tmp_path, method, suffix):
+    destination = tmp_path / f"laporan{suffix}"
+    with pytest.raises(ExportCancelled):
+        getattr(controller, method)(ITEMS, TRANSACTIONS, str(destination), progress=cancel_after_first_progress)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_failed_export_keeps_previous_report(controller, tmp_path):
+    destination = tmp_path / "laporan.xlsx"
+    success, _ = controller.export_excel(ITEMS, TRANSACTIONS, str(destination))
+    assert success
+    previous = destination.read_bytes()
+
+    def broken_rows():
+        yield ITEMS[0]
+        raise RuntimeError("koneksi putus")
+
+    success, message = controller.export_excel(broken_rows(), TRANSACTIONS, str(destination))
+    assert not success and "koneksi putus" in message
+    assert destination.read_bytes() == previous
+    assert [path.name for path in tmp_path.iterdir()] == ["laporan.xlsx"]
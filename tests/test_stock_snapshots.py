@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from models import StockSnapshotModel
+
+
+def add_item(database, code="BRG-T1", stock=0):
+    return database.write(
+        lambda conn: conn.execute(
+            "INSERT INTO items (item_code, item_name, stock) VALUES (?, ?, ?)", (code, code, stock)
+        ).lastrowid
+    )
+
+
+def post(database, item_id, when, quantity, kind="IN"):
+    delta = quantity if kind == "IN" else -quantity
+    database.write(
+        lambda conn: (
+            conn.execute(
+                "INSERT INTO transactions (transaction_date, item_id, quantity, transaction_type) VALUES (?, ?, ?, ?)",
+                (when, item_id, quantity, kind),
+            ),
+            conn.execute("UPDATE items SET stock = stock + ? WHERE id = ?", (delta, item_id)),
+        )
+    )
+
+
+def test_timed_transaction_counts_on_its_own_day(database):
+    snapshots = StockSnapshotModel(database)
+    item_id = add_item(database)
+    post(database, item_id, "2025-11-30 14:00", 5)
+    post(database, item_id, "2025-12-01 09:30", 2)
+
+    assert snapshots.stock_as_of(item_id, "2025-11-29") == 0
+    assert snapshots.stock_as_of(item_id, "2025-11-30") == 5
+    rows = {row["id"]: row["stock"] for row in snapshots.iter_stock_as_of("2025-11-30")}
+    assert rows[item_id] == 5
+
+
+def test_timed_backdated_transaction_corrects_same_day_snapshot(database):
+    snapshots = StockSnapshotModel(database)
+    item_id = add_item(database)
+    snapshots.take_snapshot("2025-11-30")
+    post(database, item_id, "2025-11-30 14:00", 5)
+    post(database, item_id, "2025-12-01 09:30", 2)
+
+    with database.connection() as conn:
+        stored = conn.execute(
+            "SELECT stock FROM stock_snapshots WHERE item_id = ? AND snapshot_date = '2025-11-30'", (item_id,)
+        ).fetchone()
+    assert stored is not None and stored[0] == 5
+    assert snapshots.stock_as_of(item_id, "2025-11-30") == 5
+    assert snapshots.stock_as_of(item_id, "2025-12-01") == 7
+
+
+def test_manual_stock_change_after_latest_snapshot_counts_today(database):
+    from datetime import date, timedelta
+
+    from models import TransactionModel
+
+    snapshots = StockSnapshotModel(database)
+    item_id = add_item(database, stock=30)
+    today = date.today()
+    posted = (today.replace(day=1) - timedelta(days=40)).isoformat()
+    TransactionModel(database).add_transaction(
+        {"transaction_date": posted, "item_id": item_id, "quantity": 5, "transaction_type": "IN"}
+    )
+    assert snapshots.ensure_month_end_snapshots(today)
+    database.write(lambda conn: conn.execute("UPDATE items SET stock = stock + 100 WHERE id = ?", (item_id,)))
+
+    assert snapshots.stock_as_of(item_id, today.isoformat()) == 135
+    rows = {row["id"]: row["stock"] for row in snapshots.iter_stock_as_of(today.isoformat())}
+    assert rows[item_id] == 135
+    last_closed = (today.replace(day=1) - timedelta(days=1)).isoformat()
+    assert snapshots.stock_as_of(item_id, last_closed) == 35
+
+
+def test_startup_closes_last_month_and_backfill_fills_the_rest(database):
+    from datetime import date
+
+    snapshots = StockSnapshotModel(database)
+    item_id = add_item(database, stock=3)
+    moves = [("2025-01-15", 10), ("2025-03-02 08:00", 4), ("2025-05-31 23:00", 6), ("2025-06-10", 1)]
+    for when, quantity in moves:
+        post(database, item_id, when, quantity)
+    today = date(2025, 7, 5)
+
+    assert snapshots.ensure_month_end_snapshots(today, months=1) == ["2025-06-30"]
+    created = snapshots.ensure_month_end_snapshots(today, chunk_months=2)
+    assert created == ["2025-01-31", "2025-02-28", "2025-03-31", "2025-04-30", "2025-05-31"]
+    assert snapshots.ensure_month_end_snapshots(today) == []
+
+    # Saldo dihitung mundur dari items.stock (3 + seluruh transaksi = 24).
+    expected = {"2025-01-31": 13, "2025-02-28": 13, "2025-03-31": 17, "2025-04-30": 17, "2025-05-31": 23, "2025-06-30": 24}
+    with database.connection() as conn:
+        stored = dict(conn.execute("SELECT snapshot_date, stock FROM stock_snapshots WHERE item_id = ?", (item_id,)))
+    assert stored == expected
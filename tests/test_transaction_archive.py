@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import pytest
+
+from models import StockSnapshotModel
+from models.transaction_archive import TransactionArchive
+
+
+@pytest.fixture()
+def item_id(database):
+    def seed(conn):
+        item_id = conn.execute(
+            "INSERT INTO items (item_code, item_name, stock) VALUES ('ARS-1', 'Barang Arsip', 8)"
+        ).lastrowid
+        conn.executemany(
+            "INSERT INTO transactions (transaction_date, item_id, quantity, transaction_type) VALUES (?, ?, ?, ?)",
+            [
+                ("2023-03-01", item_id, 10, "IN"),
+                ("2023-12-31 16:00", item_id, 4, "OUT"),
+                ("2024-02-10", item_id, 2, "IN"),
+            ],
+        )
+        return item_id
+
+    return database.write(seed)
+
+
+def test_archive_keeps_triggers_added_after_the_archiver(database, item_id, tmp_path):
+    database.write(
+        lambda conn: conn.execute(
+            "CREATE TRIGGER transactions_test_audit AFTER INSERT ON transactions BEGIN SELECT 1; END"
+        )
+    )
+    with database.connection() as conn:
+        before = dict(conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'transactions'"))
+
+    result = TransactionArchive(database, tmp_path / "arsip").archive_before("2024-01-01")
+
+    assert result["archived"] == 2 and result["years"] == [2023]
+    with database.connection() as conn:
+        after = dict(conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'transactions'"))
+        remaining = conn.execute("SELECT COUNT(*) FROM transactions WHERE item_id = ?", (item_id,)).fetchone()[0]
+    assert after == before
+    assert remaining == 1
+    snapshots = StockSnapshotModel(database)
+    assert snapshots.stock_as_of(item_id, "2023-12-31") == 6
+    assert snapshots.stock_as_of(item_id, "2023-06-30") == 10
+
+
+def test_attach_history_rejects_non_date_cutoff(database, item_id, tmp_path):
+    archive = TransactionArchive(database, tmp_path / "arsip")
+    archive.archive_before("2024-01-01")
+    database.write(lambda conn: conn.execute("UPDATE transaction_archives SET archived_before = '2024-01-01'' OR 1 --'"))
+
+    conn = database.get_connection()
+    try:
+        with pytest.raises(ValueError):
+            archive.attach_history(conn, "2023-01-01", "2023-12-31")
+    finally:
+        conn.close()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import pytest
+
+from models import TransactionModel
+
+
+def item_stock(database, item_id):
+    with database.connection() as conn:
+        return conn.execute("SELECT stock FROM items WHERE id = ?", (item_id,)).fetchone()[0]
+
+
+@pytest.fixture()
+def item_id(database):
+    return database.write(
+        lambda conn: conn.execute(
+            "INSERT INTO items (item_code, item_name, stock) VALUES ('BRG-T1', 'Barang Uji', 10)"
+        ).lastrowid
+    )
+
+
+@pytest.mark.parametrize(
+    "quantity, kind",
+    [(-5, "OUT"), (0, "OUT"), (-5, "IN"), (3, "RETUR")],
+)
+def test_add_transaction_rejects_invalid_input(database, item_id, quantity, kind):
+    model = TransactionModel(database)
+    with pytest.raises(ValueError):
+        model.add_transaction(
+            {"transaction_date": "2025-11-30", "item_id": item_id, "quantity": quantity, "transaction_type": kind}
+        )
+    assert item_stock(database, item_id) == 10
+    with database.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM transactions WHERE item_id = ?", (item_id,)).fetchone()[0] == 0
+
+
+def test_add_transaction_out_checks_stock(database, item_id):
+    model = TransactionModel(database)
+    model.add_transaction({"transaction_date": "2025-11-30", "item_id": item_id, "quantity": 4, "transaction_type": "OUT"})
+    assert item_stock(database, item_id) == 6
+    with pytest.raises(ValueError, match="Stok tidak mencukupi"):
+        model.add_transaction(
+            {"transaction_date": "2025-11-30", "item_id": item_id, "quantity": 7, "transaction_type": "OUT"}
+        )
+    assert item_stock(database, item_id) == 6
+
+
+def test_concurrent_sales_never_oversell(database, item_id):
+    """Beberapa "workstation" (Database terpisah pada file yang sama) menjual barang yang sama."""
+
+    import threading
+
+    from models import Database
+
+    threads, sales = 6, 5
+    accepted = []
+    failures = []
+    lock = threading.Lock()
+    gate = threading.Barrier(threads)
+
+    def seller():
+        station = Database(database.db_path.as_posix(), busy_timeout_ms=5000)
+        model = TransactionModel(station)
+        gate.wait()
+        try:
+            for _ in range(sales):
+                try:
+                    model.add_transaction(
+                        {"transaction_date": "2025-12-01", "item_id": item_id, "quantity": 1, "transaction_type": "OUT"}
+                    )
+                except ValueError as exc:
+                    with lock:
+                        failures.append(str(exc))
+                else:
+                    with lock:
+                        accepted.append(1)
+        finally:
+            station.close()
+
+    workers = [threading.Thread(target=seller) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert set(failures) <= {"Stok tidak mencukupi"}
+    assert item_stock(database, item_id) == 0
+    assert len(accepted) == 10
+    with database.connection() as conn:
+        posted = conn.execute(
+            "SELECT COUNT(*) FROM transactions WHERE item_id = ? AND transaction_type = 'OUT'", (item_id,)
+        ).fetchone()[0]
+    assert posted == 10
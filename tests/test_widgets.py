@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from views.widgets import _longest_increasing, reconcile_rows
+
+
+class RecordingTree:
+    """Pengganti ``ttk.Treeview`` datar dengan semantik urutan yang sama."""
+
+    def __init__(self) -> None:
+        self.children: list = []
+        self.values: dict = {}
+        self.calls: list = []
+
+    def get_children(self):
+        return tuple(self.children)
+
+    def delete(self, *iids):
+        self.calls.append("delete")
+        for iid in iids:
+            self.children.remove(iid)
+            del self.values[iid]
+
+    def detach(self, *iids):
+        self.calls.append("detach")
+        for iid in iids:
+            self.children.remove(iid)
+
+    def move(self, iid, parent, index):
+        self.calls.append("move")
+        if iid in self.children:
+            self.children.remove(iid)
+        self.children.insert(index, iid)
+
+    def insert(self, parent, index, iid, values):
+        self.calls.append("insert")
+        self.children.insert(index, iid)
+        self.values[iid] = values
+
+    def item(self, iid, values):
+        self.calls.append("item")
+        self.values[iid] = values
+
+
+def rows_for(ids):
+    return [(iid, (f"barang {iid}",)) for iid in ids]
+
+
+def test_longest_increasing():
+    assert [[3, 0, 1, 2][idx] for idx in _longest_increasing([3, 0, 1, 2])] == [0, 1, 2]
+    assert _longest_increasing([]) == []
+
+
+def test_insert_near_top_moves_nothing():
+    tree = RecordingTree()
+    reconcile_rows(tree, rows_for(range(1, 200)))
+    tree.calls.clear()
+    reconcile_rows(tree, rows_for([0, *range(1, 200)]))
+    assert tree.calls == ["insert"]
+
+
+def test_row_moved_to_bottom_is_the_only_move():
+    tree = RecordingTree()
+    reconcile_rows(tree, rows_for(range(200)))
+    tree.calls.clear()
+    reconcile_rows(tree, rows_for([*range(1, 200), 0]))
+    assert tree.calls == ["detach", "move"]
+    assert tree.children == [str(iid) for iid in [*range(1, 200), 0]]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_reorders_match_target(seed):
+    rng = random.Random(seed)
+    tree = RecordingTree()
+    reconcile_rows(tree, rows_for(rng.sample(range(60), 40)))
+    target = rng.sample(range(60), 40)
+    reconcile_rows(tree, [(iid, (f"barang {iid}", rng.random() < 0.2)) for iid in target])
+    assert tree.children == [str(iid) for iid in target]
+
+
+def test_window_loader_fetches_pages_around_scroll_position(database):
+    from types import SimpleNamespace
+
+    from models import TransactionModel
+    from views.widgets import VirtualTreeview
+
+    def seed(conn):
+        item_id = conn.execute("INSERT INTO items (item_code, item_name, stock) VALUES ('W-1', 'W', 0)").lastrowid
+        conn.executemany(
+            "INSERT INTO transactions (transaction_date, item_id, quantity, transaction_type) VALUES (?, ?, 1, 'IN')",
+            [(f"2025-01-{day % 28 + 1:02d}", item_id) for day in range(95)],
+        )
+
+    database.write(seed)
+    model = TransactionModel(database)
+    view = SimpleNamespace(
+        query={}, page_size=10, prefetch_pages=1, offset=42, visible_rows=lambda: 8,
+        fetch_page=lambda after, limit, with_total: model.get_page(after, limit, with_total),
+        key_at=lambda offset: model.get_key_at(offset),
+        row_key=lambda trx: (trx["transaction_date"], trx["id"]),
+    )
+    window = VirtualTreeview.window_loader(view)()
+
+    history = model.get_all()
+    assert window["total"] == len(history) >= 95
+    assert sorted(window["pages"]) == [3, 4, 5, 6]
+    for index, page in window["pages"].items():
+        assert [row["id"] for row in page] == [row["id"] for row in history[index * 10:(index + 1) * 10]]
+
+    view.offset = 10_000
+    window = VirtualTreeview.window_loader(view)()
+    assert list(window["pages"]) == [0] and window["total"] == len(history)
@@ -2,7 +2,6 @@
 
 from .validators import validate_required_fields
 from .formatters import format_currency
-from .charts import ChartBuilder
 from .security import hash_password, verify_password
 
 __all__ = [
@@ -13,3 +12,11 @@ __all__ = [
     "verify_password",
 ]
 
+
+def __getattr__(name: str):
+    # ChartBuilder menarik matplotlib (ratusan ms); diimpor saat pertama dipakai.
+    if name == "ChartBuilder":
+        from .charts import ChartBuilder
+
+        return ChartBuilder
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
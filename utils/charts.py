@@ -6,25 +6,88 @@ from matplotlib.figure import Figure
 
 
 class ChartBuilder:
-    """Menyediakan utilitas untuk membuat grafik stok barang."""
+    """Menyediakan utilitas untuk membuat grafik stok barang.
+
+    Axes dan batang grafik dibuat sekali lalu diperbarui di tempat; tata letak
+    (``tight_layout``) hanya dihitung ulang ketika jumlah batang berubah.
+    Grafik tren pergerakan memakai figure terpisah (``trend_figure``).
+    """
 
     def __init__(self) -> None:
         self.figure = Figure(figsize=(5, 3), dpi=100)
+        self._ax = None
+        self._bars = None
+        self.trend_figure = Figure(figsize=(5, 3), dpi=100)
+        self._trend_ax = None
+        self._trend_lines = None
+        self._trend_count = None
 
     def build_stock_chart(self, items: Iterable[Mapping[str, object]]) -> Figure:
         """Bangun grafik batang sederhana berdasarkan stok barang."""
 
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
+        items = list(items)
         names = [item["item_name"] for item in items]
         stocks = [item["stock"] for item in items]
 
-        ax.bar(names, stocks, color="#3f72af")
-        ax.set_title("Grafik Stok Barang")
-        ax.set_ylabel("Jumlah Stok")
-        ax.set_xlabel("Barang")
-        ax.tick_params(axis="x", rotation=45, labelsize=8)
-        ax.grid(axis="y", linestyle="--", linewidth=0.5, alpha=0.7)
-        self.figure.tight_layout()
+        if self._ax is None:
+            ax = self._ax = self.figure.add_subplot(111)
+            ax.set_title("Grafik Stok Barang")
+            ax.set_ylabel("Jumlah Stok")
+            ax.set_xlabel("Barang")
+            ax.grid(axis="y", linestyle="--", linewidth=0.5, alpha=0.7)
+            ax.set_axisbelow(True)
+        ax = self._ax
+
+        relayout = self._bars is None or len(self._bars) != len(stocks)
+        if relayout:
+            if self._bars is not None:
+                self._bars.remove()
+            positions = range(len(stocks))
+            self._bars = ax.bar(positions, stocks, color="#3f72af")
+            ax.set_xticks(list(positions))
+            ax.set_xlim(-0.6, max(len(stocks), 1) - 0.4)
+        else:
+            for bar, stock in zip(self._bars, stocks):
+                bar.set_height(stock)
+        ax.set_xticklabels(names, rotation=45, fontsize=8, ha="right")
+        ax.set_ylim(0, max(max(stocks, default=0) * 1.1, 1))
+
+        if relayout:
+            self.figure.tight_layout()
         return self.figure
 
+    def build_movement_chart(self, months: Iterable[Mapping[str, object]]) -> Figure:
+        """Bangun grafik garis nilai barang masuk dan keluar per bulan (dalam juta rupiah)."""
+
+        months = list(months)
+        labels = [str(row["month"]) for row in months]
+        incoming = [(row["in_value"] or 0) / 1e6 for row in months]
+        outgoing = [(row["out_value"] or 0) / 1e6 for row in months]
+        positions = list(range(len(months)))
+
+        if self._trend_ax is None:
+            ax = self._trend_ax = self.trend_figure.add_subplot(111)
+            ax.set_title("Tren Pergerakan Bulanan")
+            ax.set_ylabel("Nilai (juta Rp)")
+            ax.grid(axis="y", linestyle="--", linewidth=0.5, alpha=0.7)
+            ax.set_axisbelow(True)
+            ax.ticklabel_format(axis="y", style="plain")
+            self._trend_lines = (
+                ax.plot(positions, incoming, marker="o", color="#3f72af", label="Masuk")[0],
+                ax.plot(positions, outgoing, marker="o", color="#e07a5f", label="Keluar")[0],
+            )
+            ax.legend(fontsize=8)
+        ax = self._trend_ax
+
+        relayout = self._trend_count != len(positions)
+        self._trend_count = len(positions)
+        for line, values in zip(self._trend_lines, (incoming, outgoing)):
+            line.set_data(positions, values)
+        ax.set_xticks(positions)
+        ax.set_xticklabels(labels, rotation=45, fontsize=8, ha="right")
+        ax.set_xlim(-0.5, max(len(positions), 1) - 0.5)
+        ax.set_ylim(0, max(max(incoming + outgoing, default=0) * 1.1, 0.1))
+
+        if relayout:
+            self.trend_figure.tight_layout()
+        return self.trend_figure
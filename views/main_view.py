@@ -6,10 +6,11 @@ import tkinter as tk
 from datetime import datetime
 from tkinter import filedialog, messagebox, ttk
 
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
+from controllers.data_loader import DataLoader
 from utils.formatters import format_currency
 
+from .widgets import VirtualTreeview, reconcile_rows
+
 class MainView(tk.Frame):
     def __init__(
         self,
@@ -19,7 +20,9 @@ class MainView(tk.Frame):
         supplier_controller: "SupplierController",
         dashboard_controller: "DashboardController",
         report_controller: "ReportController",
-        chart_builder: "ChartBuilder",
+        chart_builder: "ChartBuilder | None" = None,
+        data_loader: "DataLoader | None" = None,
+        change_watcher: "ChangeWatcher | None" = None,
     ) -> None:
         super().__init__(master)
         self.master = master
@@ -29,6 +32,12 @@ class MainView(tk.Frame):
         self.dashboard_controller = dashboard_controller
         self.report_controller = report_controller
         self.chart_builder = chart_builder
+        self.data_loader = data_loader or DataLoader()
+        self.change_watcher = change_watcher
+        self._refresh_generation = 0
+        # Muatan ``check_changes`` yang sedang berjalan di ``DataLoader``.
+        self._changes_batch = None
+        self._changes_again = False
 
         self.item_vars = {
             "item_id": tk.IntVar(value=0),
@@ -40,6 +49,7 @@ class MainView(tk.Frame):
             "selling_price": tk.DoubleVar(value=0.0),
             "supplier": tk.StringVar(),
             "search": tk.StringVar(),
+            "as_of": tk.StringVar(),
         }
 
         self.supplier_vars = {
@@ -56,13 +66,21 @@ class MainView(tk.Frame):
             "notes": tk.StringVar(),
         }
 
-        self.categories_cache = []
-        self.suppliers_cache = []
-        self.items_cache = []
+        self.batch_vars = {
+            "item": tk.StringVar(),
+            "quantity": tk.IntVar(value=1),
+            "type": tk.StringVar(value="IN"),
+            "notes": tk.StringVar(),
+        }
+        self.batch_lines = []
+
+        self._item_options_version = None
 
         self._build_ui()
         self.refresh_all()
         self._apply_role_permissions()
+        if self.change_watcher is not None:
+            self.after(self.change_watcher.interval_ms, self._poll_changes)
 
     def _build_ui(self) -> None:
         self.master.title("Sistem Informasi Inventori Barang")
@@ -111,9 +129,11 @@ class MainView(tk.Frame):
 
         self.total_items_var = tk.StringVar(value="0 Barang")
         self.total_stock_var = tk.StringVar(value="0 Stok")
+        self.inventory_value_var = tk.StringVar(value=format_currency(0))
 
         ttk.Label(summary_frame, textvariable=self.total_items_var, font=("Segoe UI", 14)).pack(pady=8)
         ttk.Label(summary_frame, textvariable=self.total_stock_var, font=("Segoe UI", 14)).pack(pady=8)
+        ttk.Label(summary_frame, textvariable=self.inventory_value_var, font=("Segoe UI", 12)).pack(pady=8)
 
         low_stock_frame = ttk.LabelFrame(frame, text="Stok Rendah")
         low_stock_frame.grid(row=0, column=1, padx=12, pady=12, sticky="nsew")
@@ -127,13 +147,27 @@ class MainView(tk.Frame):
         self.low_stock_tree.pack(fill="both", expand=True, padx=6, pady=6)
 
         chart_frame = ttk.LabelFrame(frame, text="Grafik Stok")
-        chart_frame.grid(row=1, column=0, columnspan=2, padx=12, pady=12, sticky="nsew")
+        chart_frame.grid(row=1, column=0, padx=12, pady=12, sticky="nsew")
         chart_frame.columnconfigure(0, weight=1)
 
+        rankings = self.dashboard_controller.chart_rankings()
+        self.chart_ranking_var = tk.StringVar(value=rankings[0])
+        ranking_combo = ttk.Combobox(
+            chart_frame, textvariable=self.chart_ranking_var, values=rankings, state="readonly", width=32
+        )
+        ranking_combo.pack(anchor="e", padx=6, pady=(4, 0))
+        ranking_combo.bind("<<ComboboxSelected>>", lambda _: self.load_chart())
+
         self.chart_canvas = None
         self.chart_container = ttk.Frame(chart_frame)
         self.chart_container.pack(fill="both", expand=True)
 
+        trend_frame = ttk.LabelFrame(frame, text="Tren Pergerakan (12 bulan)")
+        trend_frame.grid(row=1, column=1, padx=12, pady=12, sticky="nsew")
+        self.trend_canvas = None
+        self.trend_container = ttk.Frame(trend_frame)
+        self.trend_container.pack(fill="both", expand=True)
+
         recent_frame = ttk.LabelFrame(frame, text="Transaksi Terbaru")
         recent_frame.grid(row=2, column=0, columnspan=2, padx=12, pady=12, sticky="nsew")
 
@@ -162,7 +196,15 @@ class MainView(tk.Frame):
 
         # Treeview
         columns = ("kode", "nama", "kategori", "stok", "harga_beli", "harga_jual", "pemasok")
-        self.items_tree = ttk.Treeview(frame, columns=columns, show="headings")
+        self.items_view = VirtualTreeview(
+            frame,
+            columns=columns,
+            fetch_page=self.item_controller.list_items_page,
+            key_at=self.item_controller.item_key_at,
+            row_values=self._item_row_values,
+            row_key=lambda item: (item["item_name"], item["id"]),
+        )
+        self.items_tree = self.items_view.tree
         for col in columns:
             self.items_tree.heading(col, text=col.replace("_", " ").title())
         self.items_tree.column("kode", width=100)
@@ -172,13 +214,9 @@ class MainView(tk.Frame):
         self.items_tree.column("harga_beli", width=100, anchor="e")
         self.items_tree.column("harga_jual", width=100, anchor="e")
         self.items_tree.column("pemasok", width=120)
-        self.items_tree.grid(row=1, column=0, sticky="nsew", padx=8, pady=4)
+        self.items_view.grid(row=1, column=0, sticky="nsew", padx=8, pady=4)
         self.items_tree.bind("<<TreeviewSelect>>", self.on_item_select)
 
-        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self.items_tree.yview)
-        self.items_tree.configure(yscroll=scrollbar.set)
-        scrollbar.grid(row=1, column=0, sticky="nse")
-
         # Form
         form_frame = ttk.LabelFrame(frame, text="Form Barang")
         form_frame.grid(row=0, column=1, rowspan=2, sticky="nsew", padx=8, pady=8)
@@ -222,6 +260,39 @@ class MainView(tk.Frame):
         self.btn_export_pdf.grid(row=0, column=0, padx=4)
         self.btn_export_excel = ttk.Button(report_frame, text="Export Excel", command=self.export_excel)
         self.btn_export_excel.grid(row=0, column=1, padx=4)
+        self.btn_import_items = ttk.Button(report_frame, text="Impor CSV/Excel", command=self.import_items)
+        self.btn_import_items.grid(row=0, column=2, padx=4)
+        ttk.Label(report_frame, text="Stok per Tanggal (YYYY-MM-DD, opsional)").grid(
+            row=1, column=0, columnspan=2, sticky="w", padx=4, pady=(6, 0)
+        )
+        ttk.Entry(report_frame, textvariable=self.item_vars["as_of"], width=12).grid(
+            row=1, column=2, sticky="ew", padx=4, pady=(6, 0)
+        )
+        self.btn_movement_pdf = ttk.Button(
+            report_frame, text="Pergerakan PDF", command=lambda: self.export_movement("pdf")
+        )
+        self.btn_movement_pdf.grid(row=2, column=0, padx=4, pady=(6, 0))
+        self.btn_movement_excel = ttk.Button(
+            report_frame, text="Pergerakan Excel", command=lambda: self.export_movement("excel")
+        )
+        self.btn_movement_excel.grid(row=2, column=1, padx=4, pady=(6, 0))
+
+        jobs_frame = ttk.LabelFrame(form_frame, text="Proses Ekspor")
+        jobs_frame.grid(row=9, column=0, columnspan=2, sticky="ew", padx=4, pady=4)
+        jobs_frame.columnconfigure(0, weight=1)
+        self.jobs_tree = ttk.Treeview(jobs_frame, columns=("laporan", "status"), show="headings", height=3)
+        self.jobs_tree.heading("laporan", text="Laporan")
+        self.jobs_tree.heading("status", text="Status")
+        self.jobs_tree.column("laporan", width=120)
+        self.jobs_tree.column("status", width=160)
+        self.jobs_tree.grid(row=0, column=0, columnspan=2, sticky="ew", padx=4, pady=4)
+        self.btn_job_cancel = ttk.Button(jobs_frame, text="Batalkan", command=self.cancel_export_job)
+        self.btn_job_cancel.grid(row=1, column=0, sticky="e", padx=4, pady=(0, 4))
+        ttk.Button(jobs_frame, text="Bersihkan", command=self.clear_export_jobs).grid(
+            row=1, column=1, sticky="e", padx=4, pady=(0, 4)
+        )
+        self._jobs_polling = False
+        self._notified_jobs = set()
 
     def _build_suppliers_tab(self) -> None:
         frame = self.suppliers_tab
@@ -270,6 +341,7 @@ class MainView(tk.Frame):
     def _build_transactions_tab(self) -> None:
         frame = self.transactions_tab
         frame.columnconfigure(0, weight=1)
+        frame.columnconfigure(1, weight=1)
         frame.rowconfigure(0, weight=1)
 
         form_frame = ttk.LabelFrame(frame, text="Form Transaksi")
@@ -296,112 +368,319 @@ class MainView(tk.Frame):
 
         ttk.Button(form_frame, text="Simpan Transaksi", command=self.save_transaction).grid(row=4, column=0, columnspan=2, pady=10)
 
+        batch_frame = ttk.LabelFrame(frame, text="Penerimaan / Pengeluaran Barang (Banyak Baris)")
+        batch_frame.grid(row=0, column=1, padx=12, pady=12, sticky="nsew")
+        batch_frame.columnconfigure(1, weight=1)
+
+        ttk.Label(batch_frame, text="Jenis").grid(row=0, column=0, sticky="w", pady=4, padx=4)
+        ttk.Combobox(
+            batch_frame,
+            textvariable=self.batch_vars["type"],
+            values=("IN", "OUT"),
+            state="readonly",
+        ).grid(row=0, column=1, columnspan=2, sticky="ew", pady=4, padx=4)
+
+        ttk.Label(batch_frame, text="Barang").grid(row=1, column=0, sticky="w", pady=4, padx=4)
+        self.batch_item_combo = ttk.Combobox(batch_frame, textvariable=self.batch_vars["item"], state="readonly")
+        self.batch_item_combo.grid(row=1, column=1, sticky="ew", pady=4, padx=4)
+        ttk.Entry(batch_frame, textvariable=self.batch_vars["quantity"], width=6).grid(row=1, column=2, pady=4, padx=4)
+        ttk.Button(batch_frame, text="Tambah Baris", command=self.add_batch_line).grid(row=1, column=3, pady=4, padx=4)
+
+        self.batch_tree = ttk.Treeview(batch_frame, columns=("barang", "jumlah"), show="headings", height=5)
+        self.batch_tree.heading("barang", text="Barang")
+        self.batch_tree.heading("jumlah", text="Jumlah")
+        self.batch_tree.column("jumlah", width=70, anchor="center")
+        self.batch_tree.grid(row=2, column=0, columnspan=4, sticky="nsew", pady=4, padx=4)
+
+        ttk.Label(batch_frame, text="Catatan").grid(row=3, column=0, sticky="w", pady=4, padx=4)
+        ttk.Entry(batch_frame, textvariable=self.batch_vars["notes"]).grid(row=3, column=1, columnspan=3, sticky="ew", pady=4, padx=4)
+
+        batch_buttons = ttk.Frame(batch_frame)
+        batch_buttons.grid(row=4, column=0, columnspan=4, pady=6)
+        ttk.Button(batch_buttons, text="Hapus Baris", command=self.remove_batch_line).grid(row=0, column=0, padx=4)
+        ttk.Button(batch_buttons, text="Posting Semua", command=self.post_batch).grid(row=0, column=1, padx=4)
+
         history_frame = ttk.LabelFrame(frame, text="Riwayat Transaksi")
-        history_frame.grid(row=1, column=0, padx=12, pady=12, sticky="nsew")
+        history_frame.grid(row=1, column=0, columnspan=2, padx=12, pady=12, sticky="nsew")
 
         columns = ("tanggal", "barang", "jenis", "jumlah")
-        self.transaction_tree = ttk.Treeview(history_frame, columns=columns, show="headings", height=8)
+        self.transactions_view = VirtualTreeview(
+            history_frame,
+            columns=columns,
+            fetch_page=self.item_controller.list_transactions_page,
+            key_at=self.item_controller.transaction_key_at,
+            row_values=self._transaction_row_values,
+            row_key=lambda trx: (trx["transaction_date"], trx["id"]),
+        )
+        self.transaction_tree = self.transactions_view.tree
+        self.transaction_tree.configure(height=8)
         for col in columns:
             self.transaction_tree.heading(col, text=col.title())
             self.transaction_tree.column(col, anchor="center")
-        self.transaction_tree.pack(fill="both", expand=True, padx=6, pady=6)
+        self.transactions_view.pack(fill="both", expand=True, padx=6, pady=6)
 
     # Event handlers
     def refresh_all(self) -> None:
-        self.load_categories()
-        self.load_suppliers()
-        self.load_items()
-        self.load_suppliers_list()
-        self.load_transactions()
-        self.load_dashboard()
+        """Muat ulang semua tab tanpa memblokir UI.
+
+        Seluruh query dijalankan bersamaan oleh ``DataLoader``; hasilnya
+        diterapkan ke widget sekaligus di thread Tk setelah semuanya selesai.
+        """
+
+        keyword = self.item_vars["search"].get()
+        ranking = self.chart_ranking_var.get()
+        tasks = {
+            "categories": self.item_controller.get_categories,
+            "suppliers": self.supplier_controller.list_suppliers,
+            "item_options": self.item_controller.item_options,
+            "items_page": lambda: self.item_controller.list_items_page(keyword, limit=self.items_view.page_size),
+            "transactions_page": lambda: self.item_controller.list_transactions_page(
+                limit=self.transactions_view.page_size
+            ),
+            "dashboard": lambda: self._fetch_dashboard(ranking),
+        }
+        self._refresh_generation += 1
+        generation = self._refresh_generation
+        if self.change_watcher is not None:
+            # Perubahan selama pemuatan akan terbaca lagi oleh watcher.
+            self.change_watcher.start()
+        batch = self.data_loader.submit(tasks)
+
+        def poll() -> None:
+            if not batch.done():
+                self.after(15, poll)
+                return
+            if generation != self._refresh_generation:
+                return  # sudah ada refresh yang lebih baru
+            try:
+                results = batch.results()
+            except Exception as exc:  # noqa: BLE001
+                messagebox.showerror("Gagal", f"Gagal memuat data: {exc}")
+                return
+            self._show_categories(results["categories"])
+            self._show_suppliers(results["suppliers"])
+            self._show_item_options(results["item_options"])
+            self.items_view.reload(first_page=results["items_page"], keyword=keyword)
+            self._show_suppliers_list(results["suppliers"])
+            self.transactions_view.reload(first_page=results["transactions_page"])
+            self._show_dashboard(results["dashboard"])
+
+        self.after(15, poll)
+
+    def _poll_changes(self) -> None:
+        try:
+            self.check_changes()
+        finally:
+            self.after(self.change_watcher.interval_ms, self._poll_changes)
+
+    def check_changes(self) -> None:
+        """Segarkan hanya tab dan halaman yang datanya berubah sejak pemeriksaan terakhir.
+
+        Handler simpan/hapus memanggil ini langsung setelah commit, sehingga
+        perubahan milik tampilan ini dimuat sekali dan posisi watcher sudah
+        melewatinya saat polling berikutnya. Query dijalankan ``DataLoader``;
+        daftar barang dan riwayat transaksi hanya dimuat ulang (sebatas
+        halaman di sekitar posisi gulir) bila urutannya berubah atau baris
+        yang berubah sedang ditampilkan.
+        """
+
+        if self.change_watcher is None:
+            self.refresh_all()
+            return
+        if self._changes_batch is not None:
+            self._changes_again = True  # periksa lagi setelah muatan ini diterapkan
+            return
+        try:
+            result = self.change_watcher.poll()
+        except Exception:  # noqa: BLE001
+            return  # database sibuk/terkunci; coba lagi pada polling berikutnya
+        if result is None:
+            return
+        changes = result["changes"]
+        overflow = result["overflow"]
+
+        tasks = {}
+        if "categories" in changes:
+            tasks["categories"] = self.item_controller.get_categories
+        if "suppliers" in changes:
+            keyword = self.supplier_vars["search"].get()
+            tasks["suppliers"] = self.supplier_controller.list_suppliers
+            if keyword:
+                tasks["suppliers_list"] = lambda: self.supplier_controller.list_suppliers(keyword)
+        items = changes.get("items")
+        transactions = changes.get("transactions")
+        if items is not None:
+            reordered = overflow or any(items.get(op) for op in ("I", "D", "M"))
+            if reordered or self.items_view.holds_any(items.get("U", ())):
+                tasks["items_window"] = self.items_view.window_loader()
+            known_version = self._item_options_version
+            tasks["item_options"] = lambda: self.item_controller.item_options(known_version)
+        # Ganti nama barang juga mengubah kolom barang di riwayat transaksi.
+        renamed = bool(items and items.get("M"))
+        if transactions is not None or renamed:
+            moved = transactions or {}
+            reordered = overflow or renamed or any(moved.get(op) for op in ("I", "D"))
+            if reordered or self.transactions_view.holds_any(moved.get("U", ())):
+                tasks["transactions_window"] = self.transactions_view.window_loader()
+        if items is not None or transactions is not None:
+            ranking = self.chart_ranking_var.get()
+            tasks["dashboard"] = lambda: self._fetch_dashboard(ranking)
+        if not tasks:
+            return
+
+        batch = self._changes_batch = self.data_loader.submit(tasks)
+
+        def poll() -> None:
+            if not batch.done():
+                self.after(15, poll)
+                return
+            self._changes_batch = None
+            try:
+                results = batch.results()
+            except Exception:  # noqa: BLE001
+                self.refresh_all()  # muat ulang penuh agar perubahan ini tidak terlewat
+                return
+            if "categories" in results:
+                self._show_categories(results["categories"])
+            if "suppliers" in results:
+                self._show_suppliers(results["suppliers"])
+                self._show_suppliers_list(results.get("suppliers_list", results["suppliers"]))
+            if "items_window" in results:
+                self.items_view.refresh(window=results["items_window"])
+            if "item_options" in results:
+                self._show_item_options(results["item_options"])
+            if "transactions_window" in results:
+                self.transactions_view.refresh(window=results["transactions_window"])
+            if "dashboard" in results:
+                self._show_dashboard(results["dashboard"])
+            if self._changes_again:
+                self._changes_again = False
+                self.check_changes()
+
+        self.after(15, poll)
 
     def load_dashboard(self) -> None:
+        self._show_dashboard(self._fetch_dashboard(self.chart_ranking_var.get()))
+
+    def load_chart(self) -> None:
+        self._show_chart(self.dashboard_controller.get_chart_items(self.chart_ranking_var.get()))
+
+    def _fetch_dashboard(self, ranking: str) -> dict:
+        # Dipanggil dari thread pekerja: jangan membaca variabel Tk di sini.
         data = self.dashboard_controller.get_dashboard_data()
+        data["chart_items"] = self.dashboard_controller.get_chart_items(ranking)
+        data["movement_trend"] = self.dashboard_controller.get_movement_trend()
+        return data
+
+    def _show_dashboard(self, data: dict) -> None:
         summary = data["summary"]
         self.total_items_var.set(f"Total Barang: {summary['total_items']}")
         self.total_stock_var.set(f"Total Stok: {summary['total_stock']}")
+        self.inventory_value_var.set(f"Nilai Persediaan: {format_currency(summary['inventory_value'])}")
+
+        reconcile_rows(
+            self.low_stock_tree,
+            ((item["id"], (item["item_name"], item["stock"])) for item in summary["low_stock_items"]),
+        )
+        reconcile_rows(
+            self.recent_tree,
+            (
+                (trx["id"], (trx["transaction_date"], trx["item_name"], trx["transaction_type"], trx["quantity"]))
+                for trx in data["recent_transactions"]
+            ),
+        )
+
+        self._show_chart(data["chart_items"])
+        self._show_trend(data["movement_trend"])
+
+    def _charts(self) -> "ChartBuilder":
+        # matplotlib baru diimpor saat grafik pertama kali digambar.
+        if self.chart_builder is None:
+            from utils.charts import ChartBuilder
 
-        for row in self.low_stock_tree.get_children():
-            self.low_stock_tree.delete(row)
-        for item in summary["low_stock_items"]:
-            self.low_stock_tree.insert("", "end", values=(item["item_name"], item["stock"]))
-
-        for row in self.recent_tree.get_children():
-            self.recent_tree.delete(row)
-        for trx in data["recent_transactions"]:
-            self.recent_tree.insert(
-                "",
-                "end",
-                values=(trx["transaction_date"], trx["item_name"], trx["transaction_type"], trx["quantity"]),
-            )
-
-        items = self.item_controller.list_items()
-        figure = self.chart_builder.build_stock_chart(items[:8])
-        if self.chart_canvas:
-            self.chart_canvas.get_tk_widget().destroy()
-        self.chart_canvas = FigureCanvasTkAgg(figure, master=self.chart_container)
-        self.chart_canvas.draw()
-        self.chart_canvas.get_tk_widget().pack(fill="both", expand=True)
-
-    def load_items(self, keyword: str = "") -> None:
-        records = self.item_controller.list_items(keyword)
-        if not keyword:
-            self.items_cache = records
-        for row in self.items_tree.get_children():
-            self.items_tree.delete(row)
-        for item in records:
-            self.items_tree.insert(
-                "",
-                "end",
-                iid=item["id"],
-                values=(
-                    item["item_code"],
-                    item["item_name"],
-                    item.get("category", "-"),
-                    item["stock"],
-                    format_currency(item["purchase_price"]),
-                    format_currency(item["selling_price"]),
-                    item.get("supplier", "-"),
-                ),
-            )
+            self.chart_builder = ChartBuilder()
+        return self.chart_builder
+
+    def _show_chart(self, items: list) -> None:
+        figure = self._charts().build_stock_chart(items)
+        if self.chart_canvas is None:
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+            self.chart_canvas = FigureCanvasTkAgg(figure, master=self.chart_container)
+            self.chart_canvas.draw()
+            self.chart_canvas.get_tk_widget().pack(fill="both", expand=True)
+        else:
+            self.chart_canvas.draw_idle()
+
+    def _show_trend(self, months: list) -> None:
+        figure = self._charts().build_movement_chart(months)
+        if self.trend_canvas is None:
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+            self.trend_canvas = FigureCanvasTkAgg(figure, master=self.trend_container)
+            self.trend_canvas.draw()
+            self.trend_canvas.get_tk_widget().pack(fill="both", expand=True)
+        else:
+            self.trend_canvas.draw_idle()
+
+    def load_items(self, keyword: str | None = None) -> None:
+        """Muat daftar barang per halaman; tanpa argumen posisi gulir dipertahankan."""
+
+        if keyword is None:
+            self.items_view.refresh()
+        else:
+            self.items_view.reload(keyword=keyword)
+
+    def _item_row_values(self, item: dict) -> tuple:
+        return (
+            item["item_code"],
+            item["item_name"],
+            item.get("category", "-"),
+            item["stock"],
+            format_currency(item["purchase_price"]),
+            format_currency(item["selling_price"]),
+            item.get("supplier", "-"),
+        )
 
     def load_suppliers_list(self, keyword: str = "") -> None:
-        records = self.supplier_controller.list_suppliers(keyword)
-        for row in self.suppliers_tree.get_children():
-            self.suppliers_tree.delete(row)
-        for supplier in records:
-            self.suppliers_tree.insert(
-                "",
-                "end",
-                iid=supplier["id"],
-                values=(supplier["supplier_name"], supplier.get("address", "-")),
-            )
+        self._show_suppliers_list(self.supplier_controller.list_suppliers(keyword))
+
+    def _show_suppliers_list(self, records: list) -> None:
+        reconcile_rows(
+            self.suppliers_tree,
+            ((supplier["id"], (supplier["supplier_name"], supplier.get("address", "-"))) for supplier in records),
+        )
 
     def load_transactions(self) -> None:
-        records = self.item_controller.get_all_transactions()
-        for row in self.transaction_tree.get_children():
-            self.transaction_tree.delete(row)
-        for trx in records:
-            self.transaction_tree.insert(
-                "",
-                "end",
-                values=(trx["transaction_date"], trx["item_name"], trx["transaction_type"], trx["quantity"]),
-            )
+        """Muat ulang riwayat transaksi pada posisi gulir saat ini."""
+
+        self.transactions_view.refresh()
+
+    def _transaction_row_values(self, trx: dict) -> tuple:
+        return trx["transaction_date"], trx["item_name"], trx["transaction_type"], trx["quantity"]
 
     def load_categories(self) -> None:
-        categories = self.item_controller.get_categories()
-        self.categories_cache = categories
+        self._show_categories(self.item_controller.get_categories())
+
+    def _show_categories(self, categories: list) -> None:
         self.category_combo["values"] = [cat["name"] for cat in categories]
 
     def load_suppliers(self) -> None:
-        suppliers = self.supplier_controller.list_suppliers()
-        self.suppliers_cache = suppliers
+        self._show_suppliers(self.supplier_controller.list_suppliers())
+
+    def _show_suppliers(self, suppliers: list) -> None:
         self.supplier_combo["values"] = [sup["supplier_name"] for sup in suppliers]
-        display_items = self.items_cache or self.item_controller.list_items()
-        self.transaction_item_combo["values"] = [
-            "{} - {}".format(item["item_code"], item["item_name"])
-            for item in display_items
-        ]
+
+    def load_item_options(self) -> None:
+        self._show_item_options(self.item_controller.item_options(self._item_options_version))
+
+    def _show_item_options(self, result: tuple) -> None:
+        version, options = result
+        if options is None:
+            return  # katalog barang tidak berubah
+        self._item_options_version = version
+        self.transaction_item_combo["values"] = options
+        self.batch_item_combo["values"] = options
 
     def search_items(self) -> None:
         keyword = self.item_vars["search"].get()
@@ -409,7 +688,7 @@ class MainView(tk.Frame):
 
     def reset_item_search(self) -> None:
         self.item_vars["search"].set("")
-        self.load_items()
+        self.load_items("")
 
     def search_suppliers(self) -> None:
         keyword = self.supplier_vars["search"].get()
@@ -434,10 +713,8 @@ class MainView(tk.Frame):
         self.item_vars["purchase_price"].set(data["purchase_price"])
         self.item_vars["selling_price"].set(data["selling_price"])
 
-        category = next((c for c in self.categories_cache if c["id"] == data.get("category_id")), None)
-        supplier = next((s for s in self.suppliers_cache if s["id"] == data.get("supplier_id")), None)
-        self.item_vars["category"].set(category["name"] if category else "")
-        self.item_vars["supplier"].set(supplier["supplier_name"] if supplier else "")
+        self.item_vars["category"].set(self.item_controller.category_name(data.get("category_id")))
+        self.item_vars["supplier"].set(self.supplier_controller.supplier_name(data.get("supplier_id")))
 
     def on_supplier_select(self, event) -> None:  # noqa: D401
         selection = self.suppliers_tree.selection()
@@ -472,9 +749,7 @@ class MainView(tk.Frame):
         if success:
             messagebox.showinfo("Informasi", message)
             self.clear_item_form()
-            self.load_items()
-            self.load_suppliers()
-            self.load_dashboard()
+            self.check_changes()
         else:
             messagebox.showerror("Gagal", message)
 
@@ -489,9 +764,7 @@ class MainView(tk.Frame):
         if success:
             messagebox.showinfo("Informasi", message)
             self.clear_item_form()
-            self.load_items()
-            self.load_suppliers()
-            self.load_dashboard()
+            self.check_changes()
         else:
             messagebox.showerror("Gagal", message)
 
@@ -504,6 +777,30 @@ class MainView(tk.Frame):
         self.item_vars["selling_price"].set(0.0)
         self.items_tree.selection_remove(self.items_tree.selection())
 
+    def import_items(self) -> None:
+        source = filedialog.askopenfilename(
+            filetypes=[("CSV / Excel", "*.csv *.xlsx"), ("CSV", "*.csv"), ("Excel", "*.xlsx")],
+            title="Impor Data Barang",
+        )
+        if not source:
+            return
+        self.btn_import_items.state(["disabled"])
+        batch = self.data_loader.submit({"import": lambda: self.item_controller.import_items(source)})
+
+        def poll() -> None:
+            if not batch.done():
+                self.after(100, poll)
+                return
+            self.btn_import_items.state(["!disabled"])
+            success, message = batch.results()["import"]
+            if success:
+                messagebox.showinfo("Informasi", message)
+                self.check_changes()
+            else:
+                messagebox.showerror("Gagal", message)
+
+        self.after(100, poll)
+
     def export_pdf(self) -> None:
         destination = filedialog.asksaveasfilename(
             defaultextension=".pdf",
@@ -512,15 +809,7 @@ class MainView(tk.Frame):
         )
         if not destination:
             return
-        success, message = self.report_controller.export_pdf(
-            self.item_controller.list_items(),
-            self.item_controller.get_all_transactions(),
-            destination
-        )
-        if success:
-            messagebox.showinfo("Sukses", message)
-        else:
-            messagebox.showerror("Gagal", message)
+        self._start_export("pdf", destination)
 
     def export_excel(self) -> None:
         destination = filedialog.asksaveasfilename(
@@ -530,16 +819,88 @@ class MainView(tk.Frame):
         )
         if not destination:
             return
-        success, message = self.report_controller.export_excel(
-            self.item_controller.list_items(),
-            self.item_controller.get_all_transactions(),
-            destination
+        self._start_export("excel", destination)
+
+    def export_movement(self, kind: str) -> None:
+        extension, label = (".pdf", "PDF") if kind == "pdf" else (".xlsx", "Excel")
+        destination = filedialog.asksaveasfilename(
+            defaultextension=extension,
+            filetypes=[(label, f"*{extension}")],
+            title=f"Simpan Laporan Pergerakan {label}",
         )
-        if success:
-            messagebox.showinfo("Sukses", message)
+        if not destination:
+            return
+        self.report_controller.submit_movement_export(
+            kind, self.dashboard_controller.get_movement_report(), destination
+        )
+        self._watch_export_jobs()
+
+    def _start_export(self, kind: str, destination: str) -> None:
+        # Generator belum dibaca di sini; query berjalan di thread pekerja.
+        as_of = self.item_vars["as_of"].get().strip()
+        if as_of:
+            try:
+                as_of = datetime.strptime(as_of, "%Y-%m-%d").strftime("%Y-%m-%d")
+            except ValueError:
+                messagebox.showwarning("Perhatian", "Format tanggal harus YYYY-MM-DD")
+                return
+            items = self.item_controller.iter_items_as_of(as_of)
         else:
-            messagebox.showerror("Gagal", message)
+            items = self.item_controller.iter_items()
+        self.report_controller.submit_export(
+            kind,
+            items,
+            self.item_controller.iter_transactions(),
+            destination,
+        )
+        self._watch_export_jobs()
+
+    def _watch_export_jobs(self) -> None:
+        self._render_export_jobs()
+        if not self._jobs_polling:
+            self._jobs_polling = True
+            self.after(200, self._poll_export_jobs)
+
+    def _poll_export_jobs(self) -> None:
+        jobs = self._render_export_jobs()
+        for job in jobs:
+            if job.finished and job.id not in self._notified_jobs:
+                self._notified_jobs.add(job.id)
+                if job.status == job.DONE:
+                    messagebox.showinfo("Sukses", job.message)
+                elif job.status == job.FAILED:
+                    messagebox.showerror("Gagal", job.message)
+        if any(not job.finished for job in jobs):
+            self.after(200, self._poll_export_jobs)
+        else:
+            self._jobs_polling = False
+
+    def _render_export_jobs(self) -> list:
+        jobs = self.report_controller.list_jobs()
+        current = {str(job.id) for job in jobs}
+        for iid in self.jobs_tree.get_children():
+            if iid not in current:
+                self.jobs_tree.delete(iid)
+        for job in jobs:
+            values = (job.label, job.progress_text())
+            if self.jobs_tree.exists(str(job.id)):
+                self.jobs_tree.item(str(job.id), values=values)
+            else:
+                self.jobs_tree.insert("", "end", iid=str(job.id), values=values)
+        return jobs
+
+    def cancel_export_job(self) -> None:
+        selection = self.jobs_tree.selection()
+        if not selection:
+            messagebox.showwarning("Perhatian", "Pilih proses ekspor terlebih dahulu")
+            return
+        for iid in selection:
+            self.report_controller.cancel(int(iid))
+        self._render_export_jobs()
 
+    def clear_export_jobs(self) -> None:
+        self.report_controller.clear_finished()
+        self._render_export_jobs()
 
     def save_supplier(self) -> None:
         payload = {
@@ -554,8 +915,7 @@ class MainView(tk.Frame):
         if success:
             messagebox.showinfo("Informasi", message)
             self.clear_supplier_form()
-            self.load_suppliers_list()
-            self.load_suppliers()
+            self.check_changes()
         else:
             messagebox.showerror("Gagal", message)
 
@@ -570,8 +930,7 @@ class MainView(tk.Frame):
         if success:
             messagebox.showinfo("Informasi", message)
             self.clear_supplier_form()
-            self.load_suppliers_list()
-            self.load_suppliers()
+            self.check_changes()
         else:
             messagebox.showerror("Gagal", message)
 
@@ -599,26 +958,68 @@ class MainView(tk.Frame):
             messagebox.showinfo("Informasi", message)
             self.transaction_vars["quantity"].set(1)
             self.transaction_vars["notes"].set("")
-            self.load_items()
-            self.load_transactions()
-            self.load_dashboard()
+            self.check_changes()
+        else:
+            messagebox.showerror("Gagal", message)
+
+    def add_batch_line(self) -> None:
+        raw_item = self.batch_vars["item"].get()
+        if not raw_item:
+            messagebox.showwarning("Perhatian", "Pilih barang terlebih dahulu")
+            return
+        quantity = self._safe_int(self.batch_vars["quantity"].get())
+        if quantity <= 0:
+            messagebox.showwarning("Perhatian", "Jumlah harus lebih dari 0")
+            return
+        self.batch_lines.append({"item_id": self._parse_item_from_combo(raw_item), "label": raw_item, "quantity": quantity})
+        self.batch_tree.insert("", "end", values=(raw_item, quantity))
+        self.batch_vars["quantity"].set(1)
+
+    def remove_batch_line(self) -> None:
+        selection = self.batch_tree.selection()
+        if not selection:
+            return
+        children = self.batch_tree.get_children()
+        for iid in sorted(selection, key=children.index, reverse=True):
+            del self.batch_lines[children.index(iid)]
+            self.batch_tree.delete(iid)
+
+    def post_batch(self) -> None:
+        if not self.batch_lines:
+            messagebox.showwarning("Perhatian", "Tambahkan baris barang terlebih dahulu")
+            return
+        transaction_date = datetime.now().strftime("%Y-%m-%d")
+        payloads = [
+            {
+                "transaction_date": transaction_date,
+                "item_id": line["item_id"],
+                "quantity": line["quantity"],
+                "transaction_type": self.batch_vars["type"].get(),
+                "notes": self.batch_vars["notes"].get(),
+            }
+            for line in self.batch_lines
+        ]
+        success, message = self.item_controller.record_transactions(payloads)
+        if success:
+            messagebox.showinfo("Informasi", message)
+            self.batch_lines.clear()
+            self.batch_tree.delete(*self.batch_tree.get_children())
+            self.batch_vars["notes"].set("")
+            self.check_changes()
         else:
             messagebox.showerror("Gagal", message)
 
     def _get_category_id(self, category_name: str) -> int | None:
-        match = next((c for c in self.categories_cache if c["name"] == category_name), None)
-        return match["id"] if match else None
+        return self.item_controller.category_id(category_name)
 
     def _get_supplier_id(self, supplier_name: str) -> int | None:
-        match = next((s for s in self.suppliers_cache if s["supplier_name"] == supplier_name), None)
-        return match["id"] if match else None
+        return self.supplier_controller.supplier_id(supplier_name)
 
     def _parse_item_from_combo(self, value: str) -> int:
-        code = value.split(" - ")[0]
-        for item in self.items_cache or self.item_controller.list_items():
-            if item["item_code"] == code:
-                return item["id"]
-        raise ValueError("Barang tidak ditemukan")
+        item_id = self.item_controller.item_id_for_code(value.split(" - ")[0])
+        if item_id is None:
+            raise ValueError("Barang tidak ditemukan")
+        return item_id
 
     def _safe_int(self, value) -> int:
         try:
@@ -644,6 +1045,10 @@ class MainView(tk.Frame):
             # Nonaktifkan ekspor
             self.btn_export_pdf.state(["disabled"])
             self.btn_export_excel.state(["disabled"])
+            self.btn_movement_pdf.state(["disabled"])
+            self.btn_movement_excel.state(["disabled"])
+            self.btn_import_items.state(["disabled"])
+            self.btn_job_cancel.state(["disabled"])
             # Sembunyikan tab pemasok (hanya admin)
             try:
                 index = self.notebook.index(self.suppliers_tab)
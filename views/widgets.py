@@ -0,0 +1,313 @@
+"""Widget Tkinter tambahan yang dipakai oleh view."""
+
+from __future__ import annotations
+
+import bisect
+import tkinter as tk
+from collections import OrderedDict
+from tkinter import ttk
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+def _longest_increasing(sequence: Sequence[int]) -> List[int]:
+    """Indeks subbarisan naik terpanjang dari ``sequence`` (O(n log n))."""
+
+    tails: List[int] = []  # nilai terakhir terkecil untuk tiap panjang
+    tail_index: List[int] = []
+    previous = [-1] * len(sequence)
+    for idx, value in enumerate(sequence):
+        length = bisect.bisect_left(tails, value)
+        if length == len(tails):
+            tails.append(value)
+            tail_index.append(idx)
+        else:
+            tails[length] = value
+            tail_index[length] = idx
+        previous[idx] = tail_index[length - 1] if length else -1
+    result: List[int] = []
+    idx = tail_index[-1] if tail_index else -1
+    while idx != -1:
+        result.append(idx)
+        idx = previous[idx]
+    result.reverse()
+    return result
+
+
+def reconcile_rows(tree: ttk.Treeview, rows: Iterable[Tuple[object, tuple]]) -> None:
+    """Samakan isi ``tree`` dengan ``rows`` memakai perubahan seminimal mungkin.
+
+    ``rows`` berisi pasangan ``(iid, values)`` berurutan, dengan ``iid``
+    diambil dari id database. Versi tiap baris dicatat sebagai hash dari
+    ``values``; hanya baris yang hilang, baru, berubah isi, atau berubah
+    posisi yang memicu panggilan delete/insert/item/move ke Tk. Baris yang
+    urutan relatifnya tetap (subbarisan naik terpanjang dari posisi barunya)
+    tidak dipindahkan, jadi satu baris yang berpindah hanya memicu satu
+    ``move`` walau posisi baris lain ikut bergeser.
+    """
+
+    fingerprints: Optional[Dict[str, int]] = getattr(tree, "_row_fingerprints", None)
+    if fingerprints is None:
+        fingerprints = tree._row_fingerprints = {}
+    rows = [(str(iid), tuple(values)) for iid, values in rows]
+    wanted = {iid for iid, _ in rows}
+
+    existing = tree.get_children()
+    stale = [iid for iid in existing if iid not in wanted]
+    if stale:
+        tree.delete(*stale)
+        for iid in stale:
+            fingerprints.pop(iid, None)
+
+    target = {iid: index for index, (iid, _) in enumerate(rows)}
+    current = [iid for iid in existing if iid in wanted]
+    keep = {current[idx] for idx in _longest_increasing([target[iid] for iid in current])}
+    # Lepas dulu baris yang harus pindah; sisanya sudah berurutan, jadi
+    # setiap baris yang dipasang kembali/baru cukup ditaruh di ``index``.
+    misplaced = [iid for iid in current if iid not in keep]
+    if misplaced:
+        tree.detach(*misplaced)
+    present = set(current)
+    for index, (iid, values) in enumerate(rows):
+        digest = hash(values)
+        if iid not in present:
+            tree.insert("", index, iid=iid, values=values)
+            fingerprints[iid] = digest
+            continue
+        if iid not in keep:
+            tree.move(iid, "", index)
+        if fingerprints.get(iid) != digest:
+            tree.item(iid, values=values)
+            fingerprints[iid] = digest
+
+
+class VirtualTreeview(ttk.Frame):
+    """Treeview yang hanya memuat baris yang sedang terlihat.
+
+    Data diambil per halaman lewat ``fetch_page(after=..., limit=...,
+    with_total=..., **query)`` yang memakai keyset pagination. Untuk melompat
+    ke tengah daftar (mis. menyeret scrollbar), kunci awal halaman dicari
+    lewat ``key_at(offset, **query)``. Hanya jendela yang terlihat ditambah
+    margin prefetch yang disimpan di memori.
+    """
+
+    def __init__(
+        self,
+        master: tk.Misc,
+        columns: Sequence[str],
+        fetch_page: Callable[..., dict],
+        key_at: Callable[..., object],
+        row_values: Callable[[dict], Iterable[object]],
+        row_key: Callable[[dict], object],
+        page_size: int = 100,
+        prefetch_pages: int = 1,
+        max_cached_pages: int = 8,
+    ) -> None:
+        super().__init__(master)
+        self.fetch_page = fetch_page
+        self.key_at = key_at
+        self.row_values = row_values
+        self.row_key = row_key
+        self.page_size = page_size
+        self.prefetch_pages = prefetch_pages
+        self.max_cached_pages = max(max_cached_pages, 2 * prefetch_pages + 2)
+
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+        self.tree = ttk.Treeview(self, columns=columns, show="headings")
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self.query: Dict[str, object] = {}
+        self.total = 0
+        self.offset = 0
+        self._pages: "OrderedDict[int, List[dict]]" = OrderedDict()
+
+        self.tree.bind("<Configure>", lambda _: self._render())
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda _: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda _: self.scroll(3))
+        self.tree.bind("<Prior>", lambda _: self.scroll(-self.visible_rows()))
+        self.tree.bind("<Next>", lambda _: self.scroll(self.visible_rows()))
+        self.tree.bind("<Up>", lambda _: self._step_selection(-1))
+        self.tree.bind("<Down>", lambda _: self._step_selection(1))
+
+    def reload(self, first_page: Optional[dict] = None, **query: object) -> None:
+        """Muat ulang dari awal dengan filter baru (mis. ``keyword``).
+
+        ``first_page`` boleh berisi hasil ``fetch_page`` halaman pertama yang
+        sudah diambil di thread lain agar tidak di-query ulang.
+        """
+
+        self.query = query
+        self._pages.clear()
+        self.offset = 0
+        if first_page is not None:
+            self.total = first_page["total"] or 0
+            self._pages[0] = first_page["items"]
+        else:
+            self._load_page(0, with_total=True)
+        self._render()
+
+    def refresh(self, window: Optional[dict] = None) -> None:
+        """Muat ulang data pada posisi gulir saat ini.
+
+        ``window`` boleh berisi hasil fungsi dari ``window_loader()`` yang
+        sudah dijalankan di thread lain, sehingga tidak ada query di thread UI.
+        """
+
+        self._pages.clear()
+        if window is not None:
+            self.total = window["total"]
+            self._pages.update(window["pages"])
+        else:
+            self._load_page(0, with_total=True)
+        self.offset = max(0, min(self.offset, self.total - self.visible_rows()))
+        self._render()
+
+    def window_loader(self) -> Callable[[], dict]:
+        """Fungsi tanpa akses Tk yang mengambil halaman di sekitar posisi gulir.
+
+        Dipanggil di thread UI; fungsi yang dikembalikan dijalankan di thread
+        pekerja (``DataLoader``) dan hasilnya diteruskan ke ``refresh()``.
+        Halaman prefetch ikut diambil agar ``_render`` tidak perlu query lagi.
+        """
+
+        query, size = dict(self.query), self.page_size
+        margin = self.prefetch_pages * size
+        first = max(0, self.offset - margin) // size
+        last = (self.offset + self.visible_rows() + margin) // size
+        fetch_page, key_at, row_key = self.fetch_page, self.key_at, self.row_key
+
+        def load() -> dict:
+            pages: Dict[int, List[dict]] = {}
+            total: Optional[int] = None
+            for index in range(first, last + 1):
+                if index == 0:
+                    after = None
+                elif pages.get(index - 1):
+                    after = row_key(pages[index - 1][-1])
+                else:
+                    after = key_at(index * size - 1, **query)
+                    if after is None:
+                        break
+                result = fetch_page(after=after, limit=size, with_total=total is None, **query)
+                if total is None:
+                    total = result["total"] or 0
+                pages[index] = result["items"]
+                if len(result["items"]) < size:
+                    break
+            if total is None:
+                # Daftar menyusut melewati posisi gulir; mulai dari awal.
+                result = fetch_page(after=None, limit=size, with_total=True, **query)
+                total = result["total"] or 0
+                pages[0] = result["items"]
+            return {"total": total, "pages": pages}
+
+        return load
+
+    def holds_any(self, ids: Iterable[object]) -> bool:
+        """Apakah salah satu ``ids`` ada di halaman yang sedang di-cache."""
+
+        wanted = set(ids)
+        return any(row["id"] in wanted for page in self._pages.values() for row in page)
+
+    def visible_rows(self) -> int:
+        height = self.tree.winfo_height()
+        if height <= 1:
+            return int(self.tree.cget("height"))
+        row_height = int(ttk.Style(self.tree).lookup("Treeview", "rowheight") or 20)
+        # Kurangi tinggi heading (kurang lebih satu baris).
+        return max(1, height // row_height - 1)
+
+    def scroll(self, rows: int) -> None:
+        self.scroll_to(self.offset + rows)
+
+    def scroll_to(self, offset: int) -> None:
+        offset = max(0, min(offset, self.total - self.visible_rows()))
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+
+    def _on_scrollbar(self, action: str, value: str, unit: str = "") -> None:
+        if action == "moveto":
+            self.scroll_to(int(float(value) * self.total))
+        elif action == "scroll":
+            step = self.visible_rows() if unit == "pages" else 1
+            self.scroll(int(value) * step)
+
+    def _on_mousewheel(self, event: tk.Event) -> str:
+        self.scroll(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def _step_selection(self, step: int) -> Optional[str]:
+        """Geser jendela ketika panah atas/bawah melewati tepi baris terlihat."""
+
+        children = self.tree.get_children()
+        focus = self.tree.focus()
+        if not children or focus not in children:
+            return None
+        position = children.index(focus) + step
+        if 0 <= position < len(children):
+            return None
+        self.scroll(step)
+        children = self.tree.get_children()
+        if children:
+            target = children[0] if step < 0 else children[-1]
+            self.tree.selection_set(target)
+            self.tree.focus(target)
+            self.tree.see(target)
+        return "break"
+
+    def _load_page(self, index: int, with_total: bool = False) -> List[dict]:
+        if index in self._pages:
+            self._pages.move_to_end(index)
+            return self._pages[index]
+
+        if index == 0:
+            after = None
+        elif index - 1 in self._pages and self._pages[index - 1]:
+            after = self.row_key(self._pages[index - 1][-1])
+        else:
+            after = self.key_at(index * self.page_size - 1, **self.query)
+        result = self.fetch_page(after=after, limit=self.page_size, with_total=with_total, **self.query)
+        if with_total:
+            self.total = result["total"] or 0
+        self._pages[index] = result["items"]
+        while len(self._pages) > self.max_cached_pages:
+            self._pages.popitem(last=False)
+        return result["items"]
+
+    def _rows(self, start: int, stop: int) -> List[dict]:
+        rows: List[dict] = []
+        first_page = start // self.page_size
+        last_page = max(first_page, (stop - 1) // self.page_size)
+        for index in range(first_page, last_page + 1):
+            page = self._load_page(index)
+            page_start = index * self.page_size
+            rows.extend(page[max(0, start - page_start): max(0, stop - page_start)])
+        return rows
+
+    def _prefetch(self, start: int, stop: int) -> None:
+        margin = self.prefetch_pages * self.page_size
+        last_page = (self.total - 1) // self.page_size if self.total else 0
+        for index in range(max(0, (start - margin) // self.page_size),
+                           min(last_page, (stop + margin) // self.page_size) + 1):
+            self._load_page(index)
+
+    def _render(self) -> None:
+        count = self.visible_rows()
+        start = self.offset
+        stop = min(self.total, start + count)
+        rows = self._rows(start, stop) if stop > start else []
+
+        # Baris yang tetap terlihat tidak dibuat ulang, agar seleksi
+        # pengguna tidak hilang saat menggulir.
+        reconcile_rows(self.tree, ((row["id"], self.row_values(row)) for row in rows))
+
+        if self.total:
+            self.scrollbar.set(start / self.total, stop / self.total)
+        else:
+            self.scrollbar.set(0, 1)
+        if stop > start:
+            self._prefetch(start, stop)